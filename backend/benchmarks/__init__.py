@@ -0,0 +1 @@
+"""Load tests and benchmarks of the backend."""
@@ -0,0 +1,352 @@
+"""In-process load test of the API routes, with JSON reports and run comparison."""
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+import argparse
+import asyncio
+import json
+import logging
+import math
+import random
+import sys
+import time
+
+import httpx
+
+from main import app
+
+# Default traffic mix: route name -> relative weight
+DEFAULT_MIX = "search=40,autocomplete=30,chat=10,viability=7,arguments=7,clauses=5,health=1"
+
+# Event loop lag sampling interval
+LAG_INTERVAL_SECONDS = 0.005
+
+# Metrics compared between runs: name -> whether higher is better
+COMPARED_METRICS = {
+    "rps": True,
+    "p50_ms": False,
+    "p95_ms": False,
+    "p99_ms": False,
+    "loop_lag_p99_ms": False,
+}
+
+SEARCH_QUERIES = [
+    "Section 103 BNS murder",
+    "punishment for murder",
+    "cheque bounce director liability",
+    "section 138 negotiable instruments",
+    "quashing FIR settlement",
+    "inherent powers of high court",
+    "culpable homicide not amounting to murder",
+    "vicarious liability of company officers",
+]
+AUTOCOMPLETE_PREFIXES = ["sec", "murder", "BNS", "138", "ni", "ipc", "cul", "bail"]
+CHAT_QUERIES = [
+    "What is the punishment for murder under BNS?",
+    "Tell me about inherent powers of high court",
+    "Is a director liable when a company cheque bounces?",
+    "Can an FIR be quashed after settlement?",
+]
+CASE_FACTS = [
+    "I am the wife of the business owner. I didn't sign the cheque and was not involved in the business.",
+    "The accused hit the victim once on the head with a stick during a sudden quarrel.",
+    "The parties settled the matrimonial dispute and want the FIR quashed.",
+]
+DRAFTING_NEEDS = [
+    "Draft prayer clause for quashing FIR based on settlement",
+    "vicarious liability of directors",
+    "grounds for anticipatory bail",
+]
+
+# Request factory: random generator -> (method, path, params, JSON body)
+Request = Tuple[str, str, Optional[Dict[str, Any]], Optional[Dict[str, Any]]]
+ROUTES: Dict[str, Callable[[random.Random], Request]] = {
+    "health": lambda rng: ("GET", "/health", None, None),
+    "search": lambda rng: ("POST", "/api/v1/search", None, {
+        "query": rng.choice(SEARCH_QUERIES),
+        "filters": rng.choice([None, {"doc_type": "statute"}, {"doc_type": "judgment"}]),
+        "top_k": 5,
+    }),
+    "autocomplete": lambda rng: ("GET", "/api/v1/autocomplete", {"q": rng.choice(AUTOCOMPLETE_PREFIXES)}, None),
+    "chat": lambda rng: ("POST", "/api/v1/chat", None, {
+        "session_id": f"load-{rng.randrange(100)}",
+        "query": rng.choice(CHAT_QUERIES),
+    }),
+    "viability": lambda rng: ("POST", "/api/v1/viability", None, {
+        "facts": rng.choice(CASE_FACTS),
+        "filters": rng.choice([None, {"court": "High Court"}]),
+    }),
+    "arguments": lambda rng: ("POST", "/api/v1/arguments", None, {"scenario": rng.choice(CASE_FACTS)}),
+    "clauses": lambda rng: ("POST", "/api/v1/clauses", None, {"need": rng.choice(DRAFTING_NEEDS)}),
+}
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    """
+    Parse a traffic mix like "search=3,chat=1".
+
+    Args:
+        mix: Comma-separated route=weight pairs
+
+    Returns:
+        Route name -> weight
+    """
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in ROUTES:
+            raise ValueError(f"Unknown route {name!r}; expected one of {', '.join(ROUTES)}")
+        weights[name] = float(weight or 1)
+    return weights
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of sorted values, 0 when empty."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(len(sorted_values) * fraction))
+    return sorted_values[rank - 1]
+
+
+class LoadTest:
+    """Drives the app in-process at a fixed concurrency and collects latencies."""
+
+    def __init__(
+        self,
+        mix: Dict[str, float],
+        concurrency: int,
+        duration_seconds: Optional[float] = None,
+        requests: Optional[int] = None,
+        warmup: int = 0,
+        seed: int = 0
+    ):
+        """
+        Configure a run.
+
+        Args:
+            mix: Route name -> relative weight
+            concurrency: Number of concurrent clients
+            duration_seconds: Run time, when no request count is given
+            requests: Total number of measured requests
+            warmup: Requests sent before measuring
+            seed: Seed of the traffic generators
+        """
+        self.mix = mix
+        self.concurrency = concurrency
+        self.duration_seconds = duration_seconds
+        self.requests = requests
+        self.warmup = warmup
+        self.seed = seed
+
+        # route -> latencies in seconds
+        self.latencies: Dict[str, List[float]] = {name: [] for name in mix}
+        self.errors: Counter = Counter()
+        # route -> lag samples of the windows in which a request of the route ran
+        self.route_lag: Dict[str, List[float]] = {name: [] for name in mix}
+        self.loop_lag: List[float] = []
+        self._in_flight: Counter = Counter()
+        # Routes with a request in flight since the last lag sample
+        self._ran: Set[str] = set()
+        self._issued = 0
+
+    async def run(self) -> Dict[str, Any]:
+        """Run the load test and build the report."""
+        await app.router.startup()
+        try:
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://loadtest") as client:
+                if self.warmup:
+                    await self._warm_up(client)
+
+                start = time.perf_counter()
+                deadline = start + self.duration_seconds if self.duration_seconds else None
+                sampler = asyncio.create_task(self._sample_lag())
+                await asyncio.gather(*(
+                    self._client(client, worker, deadline)
+                    for worker in range(self.concurrency)
+                ))
+                elapsed = time.perf_counter() - start
+                sampler.cancel()
+        finally:
+            await app.router.shutdown()
+        return self._report(elapsed)
+
+    async def _warm_up(self, client: httpx.AsyncClient) -> None:
+        """Send unmeasured requests, a few of every route."""
+        rng = random.Random(self.seed - 1)
+        names = list(self.mix)
+        for position in range(self.warmup):
+            method, path, params, body = ROUTES[names[position % len(names)]](rng)
+            await client.request(method, path, params=params, json=body)
+
+    async def _client(self, client: httpx.AsyncClient, worker: int, deadline: Optional[float]) -> None:
+        """Send requests back to back until the run ends."""
+        rng = random.Random(self.seed * 1_000_003 + worker)
+        names = list(self.mix)
+        weights = list(self.mix.values())
+
+        while True:
+            if deadline is not None and time.perf_counter() >= deadline:
+                return
+            if self.requests is not None:
+                if self._issued >= self.requests:
+                    return
+                self._issued += 1
+
+            name = rng.choices(names, weights)[0]
+            method, path, params, body = ROUTES[name](rng)
+            self._in_flight[name] += 1
+            self._ran.add(name)
+            start = time.perf_counter_ns()
+            try:
+                response = await client.request(method, path, params=params, json=body)
+                if response.status_code >= 400:
+                    self.errors[name] += 1
+            except Exception:
+                self.errors[name] += 1
+            finally:
+                self._in_flight[name] -= 1
+            self.latencies[name].append((time.perf_counter_ns() - start) / 1e9)
+            # In-process requests that never wait do not yield to other tasks;
+            # yield as a network round trip would
+            await asyncio.sleep(0)
+
+    async def _sample_lag(self) -> None:
+        """Measure how late the event loop wakes a sleeping task."""
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(LAG_INTERVAL_SECONDS)
+            lag = max(0.0, time.perf_counter() - start - LAG_INTERVAL_SECONDS)
+            self.loop_lag.append(lag)
+            for name in self._ran:
+                self.route_lag[name].append(lag)
+            self._ran = {name for name, count in self._in_flight.items() if count}
+
+    def _report(self, elapsed: float) -> Dict[str, Any]:
+        """Summarize the collected samples."""
+        routes = {}
+        for name, latencies in self.latencies.items():
+            latencies = sorted(latencies)
+            lag = sorted(self.route_lag[name])
+            routes[name] = {
+                "requests": len(latencies),
+                "errors": self.errors[name],
+                "rps": len(latencies) / elapsed if elapsed else 0.0,
+                "p50_ms": percentile(latencies, 0.50) * 1000,
+                "p95_ms": percentile(latencies, 0.95) * 1000,
+                "p99_ms": percentile(latencies, 0.99) * 1000,
+                "max_ms": (latencies[-1] if latencies else 0.0) * 1000,
+                "loop_lag_p50_ms": percentile(lag, 0.50) * 1000,
+                "loop_lag_p99_ms": percentile(lag, 0.99) * 1000,
+            }
+
+        all_latencies = sorted(latency for latencies in self.latencies.values() for latency in latencies)
+        loop_lag = sorted(self.loop_lag)
+        return {
+            "config": {
+                "mix": self.mix,
+                "concurrency": self.concurrency,
+                "duration_seconds": self.duration_seconds,
+                "requests": self.requests,
+                "warmup": self.warmup,
+                "seed": self.seed,
+            },
+            "elapsed_seconds": elapsed,
+            "total": {
+                "requests": len(all_latencies),
+                "errors": sum(self.errors.values()),
+                "rps": len(all_latencies) / elapsed if elapsed else 0.0,
+                "p50_ms": percentile(all_latencies, 0.50) * 1000,
+                "p95_ms": percentile(all_latencies, 0.95) * 1000,
+                "p99_ms": percentile(all_latencies, 0.99) * 1000,
+                "loop_lag_p50_ms": percentile(loop_lag, 0.50) * 1000,
+                "loop_lag_p99_ms": percentile(loop_lag, 0.99) * 1000,
+            },
+            "routes": routes,
+        }
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float) -> List[str]:
+    """
+    Compare two reports.
+
+    Args:
+        baseline: Report of the reference run
+        current: Report of the run under test
+        threshold: Relative change counted as a regression, e.g. 0.1 for 10%
+
+    Returns:
+        Descriptions of the regressions found
+    """
+    regressions = []
+    sections = [("total", baseline["total"], current["total"])] + [
+        (name, baseline["routes"][name], current["routes"][name])
+        for name in current["routes"]
+        if name in baseline["routes"]
+    ]
+
+    print(f"{'route':<14} {'metric':<16} {'baseline':>10} {'current':>10} {'change':>8}")
+    for name, before, after in sections:
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            old, new = before.get(metric, 0.0), after.get(metric, 0.0)
+            change = (new - old) / old if old else 0.0
+            worse = -change if higher_is_better else change
+            flag = ""
+            if worse > threshold:
+                flag = "  REGRESSION"
+                regressions.append(f"{name} {metric}: {old:.2f} -> {new:.2f} ({change:+.1%})")
+            print(f"{name:<14} {metric:<16} {old:>10.2f} {new:>10.2f} {change:>+8.1%}{flag}")
+    return regressions
+
+
+def main() -> None:
+    """Parse arguments and run or compare load tests."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run a load test")
+    run_parser.add_argument("--mix", default=DEFAULT_MIX, help="route=weight pairs (default: %(default)s)")
+    run_parser.add_argument("--concurrency", type=int, default=16, help="concurrent clients")
+    run_parser.add_argument("--duration", type=float, default=10.0, help="seconds to run")
+    run_parser.add_argument("--requests", type=int, help="measured requests; overrides --duration")
+    run_parser.add_argument("--warmup", type=int, default=50, help="unmeasured requests sent first")
+    run_parser.add_argument("--seed", type=int, default=0, help="traffic generator seed")
+    run_parser.add_argument("--output", help="write the JSON report here instead of stdout")
+
+    compare_parser = commands.add_parser("compare", help="compare two JSON reports")
+    compare_parser.add_argument("baseline", help="report of the reference run")
+    compare_parser.add_argument("current", help="report of the run under test")
+    compare_parser.add_argument("--threshold", type=float, default=0.10, help="relative change failing the comparison")
+
+    args = parser.parse_args()
+    # One log line per request would dominate the run
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    if args.command == "compare":
+        with open(args.baseline, encoding="utf-8") as baseline_file, open(args.current, encoding="utf-8") as current_file:
+            regressions = compare(json.load(baseline_file), json.load(current_file), args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) above {args.threshold:.0%}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        return
+
+    load_test = LoadTest(
+        parse_mix(args.mix),
+        concurrency=args.concurrency,
+        duration_seconds=None if args.requests else args.duration,
+        requests=args.requests,
+        warmup=args.warmup,
+        seed=args.seed
+    )
+    report = json.dumps(asyncio.run(load_test.run()), indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            output.write(report + "\n")
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    main()
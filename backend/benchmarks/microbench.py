@@ -0,0 +1,326 @@
+"""Microbenchmarks of the search hot path, with JSON baselines and run comparison."""
+from itertools import cycle
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+import argparse
+import fnmatch
+import gc
+import json
+import logging
+import statistics
+import sys
+import time
+import tracemalloc
+
+from benchmarks.synthetic_corpus import generate_records, parse_count
+from config import settings
+from models.schemas import SearchFilters
+from services.autocomplete_index import AutocompleteIndex
+from services.cache import LRUCache
+from services.corpus_store import CorpusStore
+from services.inverted_index import tokenize
+from services.mock_retriever import MockRetriever
+
+logger = logging.getLogger(__name__)
+
+# Query shapes: name -> (query, filters)
+QUERY_SHAPES: Dict[str, Tuple[str, Optional[SearchFilters]]] = {
+    "single_term": ("murder", None),
+    "phrase": ("imprisonment of either description", None),
+    "section_id": ("section 138 NI Act", None),
+    "heavy_filters": (
+        "bail custody arrest",
+        SearchFilters(doc_type="judgment", court="high court", case_type="criminal"),
+    ),
+}
+FILTER_SHAPES: Dict[str, SearchFilters] = {
+    "doc_type": SearchFilters(doc_type="statute"),
+    "substring": SearchFilters(court="high court"),
+    "heavy": SearchFilters(doc_type="judgment", court="high court", case_type="criminal"),
+}
+AUTOCOMPLETE_SHAPES: Dict[str, str] = {
+    "prefix": "sec",
+    "section": "section 13",
+    "word_prefix": "punish",
+    "infix": "ishment",
+}
+
+# Documents cycled through by per-document benchmarks
+SAMPLE_DOCUMENTS = 1000
+
+# Metrics compared between runs
+COMPARED_METRICS = ("ns_per_op", "alloc_peak_bytes")
+# Peak allocation changes below this many bytes are noise
+ALLOC_NOISE_BYTES = 1024
+
+Benchmark = Callable[[], Any]
+
+
+def build_fixture(count: int, seed: int) -> Tuple[MockRetriever, AutocompleteIndex]:
+    """
+    Index a synthetic corpus.
+
+    Args:
+        count: Number of chunks
+        seed: Corpus seed
+
+    Returns:
+        Retriever without result caching, and an autocomplete index over
+        the corpus' sections and acts
+    """
+    suggestions: Dict[str, None] = {}
+
+    def collect(records: Iterable[Dict]) -> Iterator[Dict]:
+        for record in records:
+            metadata = record["metadata"]
+            if metadata["doc_type"] == "statute":
+                short_name = record["text_for_embedding"][1:record["text_for_embedding"].index("]")]
+                title = record["raw_content"].split(". ", 2)[1]
+                suggestions[f"Section {metadata['section_id']} - {title} ({short_name})"] = None
+                suggestions[metadata["act_name"]] = None
+            yield record
+
+    store = CorpusStore.from_records(collect(generate_records(count, seed)), validate=False)
+    retriever = MockRetriever(store)
+    # Every search must run the ranking pipeline rather than hit the cache
+    retriever.result_cache = LRUCache(max_size=0)
+    return retriever, AutocompleteIndex(list(suggestions))
+
+
+def benchmarks_for(retriever: MockRetriever, autocomplete: AutocompleteIndex) -> Dict[str, Benchmark]:
+    """
+    Build the benchmarks of one corpus.
+
+    Args:
+        retriever: Retriever over the corpus
+        autocomplete: Autocomplete index over the corpus
+
+    Returns:
+        Benchmark name -> operation
+    """
+    snapshot = retriever.snapshot
+    benchmarks: Dict[str, Benchmark] = {}
+
+    for shape, (query, filters) in QUERY_SHAPES.items():
+        benchmarks[f"search/{shape}"] = lambda query=query, filters=filters: retriever.search(query, filters, 5)
+
+    for shape, filters in FILTER_SHAPES.items():
+        benchmarks[f"filters/{shape}"] = lambda filters=filters: snapshot.resolve(filters)
+
+    for shape, (query, filters) in QUERY_SHAPES.items():
+        query_lower = " ".join(query.lower().split())
+        terms = tokenize(query_lower)
+        candidates = snapshot.candidates(terms)
+        allowed = snapshot.resolve(filters)
+        if allowed is not None:
+            candidates &= allowed
+        doc_ids = cycle(sorted(candidates)[:SAMPLE_DOCUMENTS] or [0])
+        # One candidate document scored per operation
+        benchmarks[f"keyword_score/{shape}"] = (
+            lambda doc_ids=doc_ids, query_lower=query_lower, terms=terms:
+            retriever._calculate_mock_score(snapshot, next(doc_ids), query_lower, terms)
+        )
+        if snapshot.sparse is not None:
+            mask = snapshot.mask(allowed)
+            benchmarks[f"keyword_top_k/{shape}"] = (
+                lambda query_lower=query_lower, terms=terms, mask=mask:
+                snapshot.sparse.keyword_top_k(query_lower, terms, mask, settings.vector_search_top_k)
+            )
+
+    for shape, query in AUTOCOMPLETE_SHAPES.items():
+        benchmarks[f"autocomplete/{shape}"] = lambda query=query: autocomplete.suggest(query, limit=10)
+
+    doc_ids = cycle(range(min(len(snapshot), SAMPLE_DOCUMENTS)))
+    benchmarks["materialize/search_result"] = lambda: retriever._materialize(snapshot, next(doc_ids), 0.5)
+
+    return benchmarks
+
+
+def measure(operation: Benchmark, min_time: float = 0.2, repeat: int = 5) -> Dict[str, float]:
+    """
+    Time an operation and measure its allocations.
+
+    The loop count is doubled until one timing takes min_time, like timeit's
+    autorange. Timings run with the garbage collector off; allocations are
+    traced separately, so tracing does not slow the timed loops.
+
+    Args:
+        operation: Operation to benchmark
+        min_time: Minimum duration of one timing in seconds
+        repeat: Number of timings
+
+    Returns:
+        Best and median ns/op, loop count, and the peak and retained bytes
+        allocated per operation
+    """
+    operation()
+
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        loops = 1
+        while True:
+            elapsed = _time_loops(operation, loops)
+            if elapsed >= min_time * 1e9:
+                break
+            loops *= 2
+        timings = [elapsed / loops] + [_time_loops(operation, loops) / loops for _ in range(repeat - 1)]
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    tracemalloc.start()
+    try:
+        operation()
+        start_bytes, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        operation()
+        end_bytes, peak_bytes = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "ns_per_op": min(timings),
+        "ns_per_op_median": statistics.median(timings),
+        "loops": loops,
+        "alloc_peak_bytes": peak_bytes - start_bytes,
+        "alloc_retained_bytes": end_bytes - start_bytes,
+    }
+
+
+def _time_loops(operation: Benchmark, loops: int) -> int:
+    """Run an operation loops times and return the elapsed nanoseconds."""
+    start = time.perf_counter_ns()
+    for _ in range(loops):
+        operation()
+    return time.perf_counter_ns() - start
+
+
+def run(
+    sizes: List[int],
+    seed: int = 0,
+    pattern: str = "*",
+    min_time: float = 0.2,
+    repeat: int = 5
+) -> Dict[str, Any]:
+    """
+    Run the benchmarks matching a pattern at every corpus size.
+
+    Args:
+        sizes: Corpus sizes in chunks
+        seed: Corpus seed
+        pattern: Glob over benchmark names such as "search/*"
+        min_time: Minimum duration of one timing in seconds
+        repeat: Number of timings per benchmark
+
+    Returns:
+        Report with the configuration and, per "name@size", the measurements
+    """
+    results: Dict[str, Dict[str, float]] = {}
+    for size in sizes:
+        start = time.perf_counter()
+        retriever, autocomplete = build_fixture(size, seed)
+        logger.info(f"Indexed {size} chunks in {time.perf_counter() - start:.1f}s")
+
+        for name, operation in benchmarks_for(retriever, autocomplete).items():
+            if not fnmatch.fnmatchcase(name, pattern):
+                continue
+            key = f"{name}@{_format_size(size)}"
+            results[key] = measure(operation, min_time, repeat)
+            logger.info(f"{key:<40} {results[key]['ns_per_op']:>14,.0f} ns/op")
+
+    return {
+        "config": {
+            "sizes": sizes,
+            "seed": seed,
+            "pattern": pattern,
+            "min_time": min_time,
+            "repeat": repeat,
+            "scoring_mode": settings.scoring_mode,
+            "vector_index_mode": settings.vector_index_mode,
+            "python": sys.version.split()[0],
+        },
+        "benchmarks": results,
+    }
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float) -> List[str]:
+    """
+    Compare two reports.
+
+    Args:
+        baseline: Report of the reference run
+        current: Report of the run under test
+        threshold: Relative change counted as a regression, e.g. 0.1 for 10%
+
+    Returns:
+        Descriptions of the regressions found
+    """
+    regressions = []
+    print(f"{'benchmark':<40} {'metric':<17} {'baseline':>14} {'current':>14} {'change':>8}")
+    for name, after in current["benchmarks"].items():
+        before = baseline["benchmarks"].get(name)
+        if before is None:
+            continue
+        for metric in COMPARED_METRICS:
+            old, new = before.get(metric, 0.0), after.get(metric, 0.0)
+            change = (new - old) / old if old else 0.0
+            flag = ""
+            noise = metric == "alloc_peak_bytes" and abs(new - old) < ALLOC_NOISE_BYTES
+            if change > threshold and not noise:
+                flag = "  REGRESSION"
+                regressions.append(f"{name} {metric}: {old:,.0f} -> {new:,.0f} ({change:+.1%})")
+            print(f"{name:<40} {metric:<17} {old:>14,.0f} {new:>14,.0f} {change:>+8.1%}{flag}")
+    return regressions
+
+
+def _format_size(size: int) -> str:
+    """Format a corpus size like parse_count accepts it, e.g. 10k."""
+    for suffix, multiplier in (("m", 1_000_000), ("k", 1_000)):
+        if size >= multiplier and size % multiplier == 0:
+            return f"{size // multiplier}{suffix}"
+    return str(size)
+
+
+def main() -> None:
+    """Parse arguments and run or compare microbenchmarks."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run the microbenchmarks")
+    run_parser.add_argument("--sizes", default="10k", help="comma-separated corpus sizes (default: %(default)s)")
+    run_parser.add_argument("--seed", type=int, default=0, help="synthetic corpus seed")
+    run_parser.add_argument("--filter", default="*", help="glob over benchmark names, e.g. 'search/*'")
+    run_parser.add_argument("--min-time", type=float, default=0.2, help="minimum seconds per timing")
+    run_parser.add_argument("--repeat", type=int, default=5, help="timings per benchmark")
+    run_parser.add_argument("--output", help="write the JSON report here instead of stdout")
+
+    compare_parser = commands.add_parser("compare", help="compare two JSON reports")
+    compare_parser.add_argument("baseline", help="report of the reference run")
+    compare_parser.add_argument("current", help="report of the run under test")
+    compare_parser.add_argument("--threshold", type=float, default=0.10, help="relative change failing the comparison")
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    if args.command == "compare":
+        with open(args.baseline, encoding="utf-8") as baseline_file, open(args.current, encoding="utf-8") as current_file:
+            regressions = compare(json.load(baseline_file), json.load(current_file), args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) above {args.threshold:.0%}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        return
+
+    sizes = [parse_count(size) for size in args.sizes.split(",")]
+    report = run(sizes, seed=args.seed, pattern=args.filter, min_time=args.min_time, repeat=max(1, args.repeat))
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            output_file.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,511 @@
+"""Seeded synthetic statutes and judgments for scale benchmarks."""
+from itertools import product
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+import argparse
+import json
+import logging
+import random
+import time
+
+import numpy as np
+
+from build_corpus import build_corpus
+from services.ingestion import statute_id_prefix
+
+logger = logging.getLogger(__name__)
+
+# Real acts the corpus starts with: (act name, short name, category, number of sections)
+ACTS: List[Tuple[str, str, str, int]] = [
+    ("Bharatiya Nyaya Sanhita, 2023", "BNS", "Criminal", 358),
+    ("Bharatiya Nagarik Suraksha Sanhita, 2023", "BNSS", "Procedural", 531),
+    ("Bharatiya Sakshya Adhiniyam, 2023", "BSA", "Evidence", 170),
+    ("Indian Penal Code, 1860", "IPC", "Criminal", 511),
+    ("Code of Criminal Procedure, 1973", "CrPC", "Procedural", 484),
+    ("Code of Civil Procedure, 1908", "CPC", "Procedural", 158),
+    ("Negotiable Instruments Act, 1881", "NI Act", "Commercial", 147),
+    ("Indian Contract Act, 1872", "ICA", "Commercial", 238),
+    ("Companies Act, 2013", "Companies Act", "Corporate", 470),
+    ("Arbitration and Conciliation Act, 1996", "Arbitration Act", "Commercial", 87),
+    ("Consumer Protection Act, 2019", "CPA", "Consumer", 107),
+    ("Hindu Marriage Act, 1955", "HMA", "Family", 30),
+    ("Specific Relief Act, 1963", "SRA", "Civil", 44),
+    ("Transfer of Property Act, 1882", "TPA", "Property", 137),
+    ("Limitation Act, 1963", "Limitation Act", "Civil", 32),
+    ("Information Technology Act, 2000", "IT Act", "Cyber", 94),
+    ("Narcotic Drugs and Psychotropic Substances Act, 1985", "NDPS Act", "Criminal", 83),
+    ("Protection of Children from Sexual Offences Act, 2012", "POCSO Act", "Criminal", 46),
+]
+
+# Parts of generated act names once the real acts are used up
+ACT_SUBJECTS = [
+    "Coastal Shipping", "Inland Waterways", "Warehousing", "Seeds", "Mines and Minerals",
+    "Electricity", "Forest Conservation", "Wildlife Protection", "Food Safety", "Legal Metrology",
+    "Public Premises", "Street Vendors", "Building Workers", "Plantation Labour", "Cinematograph",
+    "Copyright", "Trade Marks", "Patents", "Insolvency", "Payment Systems", "Micro Enterprises",
+    "Rent Control", "Stamp Duty", "Registration", "Motor Vehicles", "Railways", "Juvenile Justice",
+    "Dowry Prohibition", "Domestic Violence", "Senior Citizens", "Disaster Management", "Water Pollution",
+    "Air Pollution", "Biological Diversity", "Land Acquisition", "Cooperative Societies", "Trusts",
+    "Partnership", "Sale of Goods", "Carriage by Road",
+]
+ACT_KINDS = ["Act", "Regulation Act", "Protection Act", "Control Act", "Development Act", "Prevention Act"]
+SUBJECT_CATEGORIES = ["Civil", "Commercial", "Criminal", "Regulatory", "Labour", "Environmental", "Property"]
+
+# Courts weighted by how often their judgments are reported
+COURTS: List[Tuple[str, int]] = [
+    ("Supreme Court of India", 12),
+    ("Delhi High Court", 10), ("Bombay High Court", 10), ("Madras High Court", 9),
+    ("Allahabad High Court", 9), ("Calcutta High Court", 7), ("Gujarat High Court", 7),
+    ("Karnataka High Court", 7), ("Kerala High Court", 6), ("Punjab and Haryana High Court", 6),
+    ("Rajasthan High Court", 5), ("Madhya Pradesh High Court", 5), ("Patna High Court", 4),
+    ("Orissa High Court", 3), ("Telangana High Court", 3), ("Gauhati High Court", 2),
+    ("National Company Law Appellate Tribunal", 2), ("National Consumer Disputes Redressal Commission", 2),
+]
+CASE_TYPES: List[Tuple[str, int]] = [
+    ("Criminal", 40), ("Civil", 25), ("Commercial", 12), ("Family", 8),
+    ("Constitutional", 6), ("Tax", 5), ("Labour", 4),
+]
+# Values extract_outcome produces
+OUTCOMES: List[Tuple[str, int]] = [("Dismissed", 50), ("Allowed", 35), ("Partially Allowed", 15)]
+
+FIRST_NAMES = [
+    "Rajesh", "Sunita", "Amit", "Priti", "Mohan", "Kavita", "Suresh", "Anjali", "Ravi", "Meena",
+    "Vijay", "Pooja", "Arjun", "Lakshmi", "Gian", "Farhan", "Harpreet", "Joseph", "Ayesha", "Sagar",
+]
+SURNAMES = [
+    "Sharma", "Verma", "Patel", "Singh", "Kumar", "Reddy", "Nair", "Iyer", "Gupta", "Das",
+    "Bhojnagarwala", "Rabari", "Khan", "Mehta", "Joshi", "Chatterjee", "Menon", "Pillai", "Yadav", "Rao",
+]
+STATES = [
+    "Gujarat", "Punjab", "Maharashtra", "Uttar Pradesh", "Kerala", "Karnataka", "Tamil Nadu",
+    "Rajasthan", "Bihar", "West Bengal", "Madhya Pradesh", "Delhi",
+]
+COMPANY_SUFFIXES = ["Pvt. Ltd.", "Ltd.", "Industries", "Finance Ltd.", "Traders", "Infrastructure Ltd."]
+
+# Most frequent words of legal text, most frequent first. "Provided",
+# "Illustration" and "Explanation" are left out so that has_proviso and
+# has_illustration stay exact.
+FUNCTION_WORDS = [
+    "the", "of", "and", "to", "in", "or", "a", "by", "shall", "be", "any", "such", "for", "with",
+    "is", "that", "as", "on", "which", "under", "this", "may", "has", "not", "person", "was", "an",
+    "from", "been", "it", "at", "who", "his", "court", "section", "other", "no", "if", "where",
+]
+LEGAL_TERMS = [
+    "accused", "offence", "punishment", "imprisonment", "fine", "term", "years", "extend", "liable",
+    "act", "whoever", "government", "order", "appeal", "evidence", "witness", "petition", "case",
+    "trial", "judgment", "proceedings", "high", "magistrate", "police", "officer", "complaint",
+    "cheque", "company", "director", "murder", "death", "life", "hurt", "property", "contract",
+    "agreement", "notice", "payment", "amount", "bail", "custody", "arrest", "warrant", "summons",
+    "charge", "conviction", "acquittal", "sentence", "prosecution", "defence", "intention",
+    "knowledge", "cause", "injury", "grievous", "culpable", "homicide", "cheating", "dishonestly",
+    "fraudulently", "theft", "robbery", "dacoity", "criminal", "breach", "trust", "forgery",
+    "document", "public", "servant", "authority", "jurisdiction", "inherent", "powers", "quash",
+    "quashing", "settlement", "compromise", "dispute", "parties", "plaintiff", "defendant",
+    "appellant", "respondent", "petitioner", "decree", "suit", "relief", "injunction", "damages",
+    "compensation", "limitation", "period", "delay", "condonation", "arbitration", "award",
+    "tribunal", "consumer", "deficiency", "service", "marriage", "divorce", "maintenance", "custody",
+    "guardian", "minor", "child", "woman", "dowry", "cruelty", "possession", "title", "transfer",
+    "lease", "mortgage", "sale", "deed", "registration", "stamp", "tax", "assessment", "penalty",
+    "liability", "vicarious", "negligence", "reasonable", "doubt", "burden", "proof", "presumption",
+    "admissibility", "confession", "statement", "recorded", "investigation", "report", "chargesheet",
+    "cognizance", "committal", "sessions", "revision", "review", "writ", "mandamus", "certiorari",
+    "fundamental", "rights", "article", "constitution", "equality", "liberty", "procedure",
+    "established", "law", "natural", "justice", "hearing", "opportunity", "cross", "examination",
+    "dishonour", "insufficiency", "funds", "drawer", "payee", "holder", "instrument", "debt",
+    "enforceable", "consideration", "void", "voidable", "coercion", "undue", "influence",
+    "misrepresentation", "specific", "performance", "mesne", "profits", "eviction", "tenant",
+    "landlord", "rent", "premises", "employer", "workman", "wages", "retrenchment", "industrial",
+    "narcotic", "substance", "recovery", "seizure", "search", "electronic", "record", "computer",
+]
+
+# Syllables of the generated long tail of rare words
+SYLLABLES = [
+    "ka", "ra", "ta", "na", "ma", "sa", "pa", "la", "va", "da", "ja", "ha", "ri", "ti", "ni", "mi",
+    "si", "vi", "di", "ru", "tu", "nu", "mu", "su", "ro", "to", "no", "mo", "so", "dra", "sha", "tra",
+]
+
+SECTION_HEADINGS = [
+    "Punishment for", "Definition of", "Power of", "Procedure for", "Effect of", "Liability for",
+    "Duty of", "Penalty for", "Appeal against", "Exemption from", "Limitation for", "Offences by",
+]
+CHAPTER_HEADINGS = ["Of", "Of Offences Relating to", "Provisions as to", "Of Procedure for", "General Provisions on"]
+ROMAN_NUMERALS = [("M", 1000), ("CM", 900), ("D", 500), ("CD", 400), ("C", 100), ("XC", 90),
+                  ("L", 50), ("XL", 40), ("X", 10), ("IX", 9), ("V", 5), ("IV", 4), ("I", 1)]
+
+# Zipf exponent of word ranks; about 1 for natural language
+ZIPF_EXPONENT = 1.2
+# Word ranks drawn from the random generator at a time
+WORD_BLOCK_SIZE = 1 << 16
+
+SCALES = {"k": 1_000, "m": 1_000_000}
+
+
+class WordSampler:
+    """
+    Draws words with Zipfian frequencies from a fixed vocabulary.
+
+    The vocabulary is function words, then legal terms, then generated
+    rare words, so a few words dominate every text and most of the
+    vocabulary occurs only a handful of times, as in real legal text.
+    """
+
+    def __init__(self, rng: np.random.Generator, vocabulary_size: int = 50_000):
+        """
+        Build the vocabulary.
+
+        Args:
+            rng: Random generator shared with the caller
+            vocabulary_size: Number of distinct words
+        """
+        self.rng = rng
+        words = list(dict.fromkeys(FUNCTION_WORDS + LEGAL_TERMS))
+        head = len(words)
+        self.legal_words = words[len(FUNCTION_WORDS):]
+        seen = set(words)
+        for length in range(2, 5):
+            if len(words) >= vocabulary_size:
+                break
+            for syllables in product(SYLLABLES, repeat=length):
+                word = "".join(syllables)
+                if word not in seen:
+                    seen.add(word)
+                    words.append(word)
+                    if len(words) >= vocabulary_size:
+                        break
+        # Shuffle the rare words so ranks do not follow syllable order
+        tail = words[head:]
+        rng.shuffle(tail)
+        self.words = np.array(words[:head] + tail, dtype=object)
+
+        weights = 1.0 / np.arange(1, len(self.words) + 1) ** ZIPF_EXPONENT
+        self._cumulative = np.cumsum(weights / weights.sum())
+        self._block: List[str] = []
+        self._position = 0
+
+    def draw(self, count: int) -> List[str]:
+        """Draw count words."""
+        drawn: List[str] = []
+        while len(drawn) < count:
+            if self._position >= len(self._block):
+                ranks = np.searchsorted(self._cumulative, self.rng.random(WORD_BLOCK_SIZE), side="right")
+                self._block = self.words[np.minimum(ranks, len(self.words) - 1)].tolist()
+                self._position = 0
+            taken = self._block[self._position:self._position + count - len(drawn)]
+            self._position += len(taken)
+            drawn.extend(taken)
+        return drawn
+
+    def sentence(self, random_source: random.Random, min_words: int = 8, max_words: int = 24) -> str:
+        """Draw a capitalized sentence."""
+        words = self.draw(random_source.randint(min_words, max_words))
+        return " ".join(words).capitalize() + "."
+
+
+class SyntheticCorpus:
+    """
+    Deterministic generator of statute and judgment chunk records.
+
+    The same seed, size and options always produce the same records in
+    the same order. Statutes come first, act by act and section by
+    section, followed by judgments split into paragraph chunks; judgments
+    cite sections that exist in the corpus, popular sections most often.
+    """
+
+    def __init__(self, seed: int = 0, judgment_share: float = 0.7, vocabulary_size: int = 50_000):
+        """
+        Initialize the generator.
+
+        Args:
+            seed: Random seed
+            judgment_share: Fraction of chunks that are judgment chunks
+            vocabulary_size: Number of distinct words in generated text
+        """
+        if not 0 <= judgment_share <= 1:
+            raise ValueError("judgment_share must be between 0 and 1")
+        self.seed = seed
+        self.judgment_share = judgment_share
+        self.vocabulary_size = vocabulary_size
+
+    def records(self, count: int) -> Iterator[Dict]:
+        """
+        Generate chunk records.
+
+        Args:
+            count: Number of chunks
+
+        Yields:
+            LegalChunk/JudgmentChunk records
+        """
+        random_source = random.Random(self.seed)
+        sampler = WordSampler(np.random.default_rng(self.seed), self.vocabulary_size)
+        judgment_count = round(count * self.judgment_share)
+        statute_count = count - judgment_count
+
+        # (short name, section id) of every generated section, for citations
+        sections: List[Tuple[str, str]] = []
+        yield from self._statutes(statute_count, random_source, sampler, sections)
+        if not sections:
+            sections = [(short_name, "1") for _, short_name, _, _ in ACTS]
+        yield from self._judgments(judgment_count, random_source, sampler, sections)
+
+    def _statutes(
+        self,
+        count: int,
+        random_source: random.Random,
+        sampler: WordSampler,
+        sections: List[Tuple[str, str]]
+    ) -> Iterator[Dict]:
+        """Generate statute sections, one chunk each."""
+        generated = 0
+        for act_name, short_name, category, section_count in self._acts(random_source):
+            chapter_number = 0
+            chapter: Optional[str] = None
+            chapter_left = 0
+            section_ids = _section_ids(section_count, random_source)
+            for section_id in section_ids:
+                if generated >= count:
+                    return
+                if not chapter_left:
+                    chapter_number += 1
+                    chapter_left = random_source.randint(8, 40)
+                    chapter = f"{_roman(chapter_number)} - {self._chapter_title(random_source, sampler)}"
+                chapter_left -= 1
+
+                sections.append((short_name, section_id))
+                yield self._section(act_name, short_name, category, chapter_number, chapter, section_id,
+                                    random_source, sampler)
+                generated += 1
+            if generated >= count:
+                return
+
+    def _acts(self, random_source: random.Random) -> Iterator[Tuple[str, str, str, int]]:
+        """List the real acts, then endless generated ones with unique names and short names."""
+        yield from ACTS
+        short_names = {short_name for _, short_name, _, _ in ACTS}
+        # Chunk ids are built from the full act name, so it must be unique too
+        id_prefixes = {statute_id_prefix(act_name) for act_name, _, _, _ in ACTS}
+        serial = 0
+        while True:
+            serial += 1
+            subject = random_source.choice(ACT_SUBJECTS)
+            kind = random_source.choice(ACT_KINDS)
+            year = random_source.randint(1950, 2024)
+            act_name = f"{subject} {kind}, {year}"
+            if statute_id_prefix(act_name) in id_prefixes:
+                act_name = f"{subject} {kind} (No. {serial}), {year}"
+            id_prefixes.add(statute_id_prefix(act_name))
+            short_name = "".join(word[0] for word in f"{subject} {kind}".split() if word[:1].isupper())
+            short_name = f"{short_name} {year}"
+            if short_name in short_names:
+                short_name = f"{short_name}-{serial}"
+            short_names.add(short_name)
+            yield act_name, short_name, random_source.choice(SUBJECT_CATEGORIES), random_source.randint(20, 400)
+
+    def _chapter_title(self, random_source: random.Random, sampler: WordSampler) -> str:
+        """Draw a chapter title such as "Of Offences Relating to Cheque"."""
+        topic = " ".join(random_source.sample(sampler.legal_words, random_source.randint(1, 3)))
+        return f"{random_source.choice(CHAPTER_HEADINGS)} {topic.title()}"
+
+    def _section(
+        self,
+        act_name: str,
+        short_name: str,
+        category: str,
+        chapter_number: int,
+        chapter: Optional[str],
+        section_id: str,
+        random_source: random.Random,
+        sampler: WordSampler
+    ) -> Dict:
+        """Build the chunk record of one section, like ingestion.chunk_statute does."""
+        topic = " ".join(random_source.sample(sampler.legal_words, random_source.randint(1, 3)))
+        title = f"{random_source.choice(SECTION_HEADINGS)} {topic}"
+
+        sentences = [sampler.sentence(random_source) for _ in range(random_source.randint(1, 5))]
+        if category == "Criminal" and random_source.random() < 0.6:
+            sentences.insert(0, (
+                f"Whoever commits {topic} shall be punished with imprisonment of either description "
+                f"for a term which may extend to {random_source.randint(1, 14)} years, and shall also be liable to fine."
+            ))
+        has_illustration = random_source.random() < 0.15
+        if has_illustration:
+            sentences.append(f"Illustration. {sampler.sentence(random_source)}")
+        has_proviso = random_source.random() < 0.25
+        if has_proviso:
+            sentences.append(f"Provided that {sampler.sentence(random_source).lower()}")
+        body = " ".join(sentences)
+
+        chapter_id = _roman(chapter_number)
+        return {
+            "id": f"{statute_id_prefix(act_name)}_Sec_{section_id}",
+            "text_for_embedding": f"[{short_name}] > Chapter {chapter_id} > Section {section_id} - {title} : {body}",
+            "raw_content": f"{section_id}. {title}. {body}",
+            "metadata": {
+                "doc_type": "statute",
+                "act_name": act_name,
+                "category": category,
+                "chapter": chapter,
+                "section_id": section_id,
+                "chunk_type": "Section",
+                "has_illustration": has_illustration,
+                "has_proviso": has_proviso,
+            },
+        }
+
+    def _judgments(
+        self,
+        count: int,
+        random_source: random.Random,
+        sampler: WordSampler,
+        sections: Sequence[Tuple[str, str]]
+    ) -> Iterator[Dict]:
+        """Generate judgments split into paragraph chunks, like ingestion.chunk_judgment does."""
+        courts, court_weights = zip(*COURTS)
+        case_types, case_type_weights = zip(*CASE_TYPES)
+        outcomes, outcome_weights = zip(*OUTCOMES)
+        # Citations favour a few landmark sections
+        citation_weights = list(np.cumsum(1.0 / np.arange(1, len(sections) + 1) ** ZIPF_EXPONENT))
+        cited_order = list(sections)
+        random_source.shuffle(cited_order)
+
+        generated = 0
+        serial = 0
+        while generated < count:
+            serial += 1
+            citations = {
+                cited_order[index]
+                for index in random_source.choices(range(len(cited_order)), cum_weights=citation_weights,
+                                                   k=random_source.randint(1, 4))
+            }
+            acts_cited = [f"{short_name} Section {section_id}" for short_name, section_id in sorted(citations)]
+            metadata = {
+                "doc_type": "judgment",
+                "title": self._case_title(random_source),
+                "court": random_source.choices(courts, weights=court_weights)[0],
+                "case_type": random_source.choices(case_types, weights=case_type_weights)[0],
+                "outcome": random_source.choices(outcomes, weights=outcome_weights)[0],
+                "acts_cited": acts_cited,
+                "doc_url": f"https://indiankanoon.org/doc/{1_000_000 + serial}",
+            }
+
+            # Paragraph counts are skewed: most judgments are short, a few are long
+            paragraphs = min(1 + int(random_source.expovariate(1 / 4)), 40, count - generated)
+            for position in range(1, paragraphs + 1):
+                sentences = [sampler.sentence(random_source) for _ in range(random_source.randint(3, 8))]
+                if random_source.random() < 0.4:
+                    short_name, section_id = random_source.choice(sorted(citations))
+                    sentences.insert(
+                        random_source.randint(0, len(sentences)),
+                        f"Reliance was placed on Section {section_id} of the {short_name}."
+                    )
+                if position == paragraphs:
+                    sentences.append(f"The {random_source.choice(['appeal', 'petition', 'application'])} "
+                                     f"is accordingly {metadata['outcome'].lower()}.")
+                content = " ".join(sentences)
+                yield {
+                    "id": f"synthetic_judgment_{serial}_p{position}",
+                    "text_for_embedding": f"{metadata['title']} - {content}",
+                    "raw_content": content,
+                    "metadata": dict(metadata, acts_cited=list(acts_cited)),
+                }
+            generated += paragraphs
+
+    def _case_title(self, random_source: random.Random) -> str:
+        """Draw a cause title such as "Priti Sharma vs State of Gujarat"."""
+        petitioner = self._party(random_source)
+        if random_source.random() < 0.45:
+            respondent = f"State of {random_source.choice(STATES)}"
+        else:
+            respondent = self._party(random_source)
+        return f"{petitioner} vs {respondent}"
+
+    def _party(self, random_source: random.Random) -> str:
+        """Draw a person or company name."""
+        if random_source.random() < 0.2:
+            return f"{random_source.choice(SURNAMES)} {random_source.choice(COMPANY_SUFFIXES)}"
+        return f"{random_source.choice(FIRST_NAMES)} {random_source.choice(SURNAMES)}"
+
+
+def generate_records(
+    count: int,
+    seed: int = 0,
+    judgment_share: float = 0.7,
+    vocabulary_size: int = 50_000
+) -> Iterator[Dict]:
+    """
+    Generate synthetic chunk records.
+
+    Args:
+        count: Number of chunks
+        seed: Random seed
+        judgment_share: Fraction of chunks that are judgment chunks
+        vocabulary_size: Number of distinct words in generated text
+
+    Yields:
+        LegalChunk/JudgmentChunk records
+    """
+    return SyntheticCorpus(seed, judgment_share, vocabulary_size).records(count)
+
+
+def parse_count(value: str) -> int:
+    """Parse a chunk count such as "10000", "100k" or "1m"."""
+    value = value.strip().lower().replace("_", "")
+    multiplier = SCALES.get(value[-1:], 1)
+    digits = value[:-1] if value[-1:] in SCALES else value
+    try:
+        count = int(float(digits) * multiplier)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid chunk count: {value!r}")
+    if count < 0:
+        raise argparse.ArgumentTypeError(f"Invalid chunk count: {value!r}")
+    return count
+
+
+def _section_ids(section_count: int, random_source: random.Random) -> Iterator[str]:
+    """Number sections from 1, with the occasional inserted section such as 138A."""
+    for number in range(1, section_count + 1):
+        yield str(number)
+        if random_source.random() < 0.03:
+            for letter in "ABC"[:random_source.randint(1, 3)]:
+                yield f"{number}{letter}"
+
+
+def _roman(number: int) -> str:
+    """Format a chapter number as a Roman numeral."""
+    numeral = ""
+    for symbol, value in ROMAN_NUMERALS:
+        while number >= value:
+            numeral += symbol
+            number -= value
+    return numeral
+
+
+def main() -> None:
+    """Parse arguments and write a synthetic corpus."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("output", help="corpus file to write, or a .jsonl file with --jsonl")
+    parser.add_argument("--chunks", type=parse_count, default=10_000, help="number of chunks, e.g. 10k, 100k, 1m")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    parser.add_argument("--judgment-share", type=float, default=0.7, help="fraction of judgment chunks")
+    parser.add_argument("--vocabulary", type=int, default=50_000, help="distinct words in generated text")
+    parser.add_argument("--jsonl", action="store_true", help="write JSONL chunk records instead of a corpus file")
+    parser.add_argument("--no-embeddings", action="store_true", help="do not store embeddings")
+    parser.add_argument("--no-validate", action="store_true", help="skip schema validation")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    records = generate_records(args.chunks, args.seed, args.judgment_share, args.vocabulary)
+
+    start_time = time.time()
+    if args.jsonl:
+        count = 0
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            for record in records:
+                output_file.write(json.dumps(record) + "\n")
+                count += 1
+    else:
+        count = build_corpus(records, args.output, embed=not args.no_embeddings, validate=not args.no_validate)
+    logger.info(f"Wrote {count} synthetic chunks to {args.output} in {time.time() - start_time:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
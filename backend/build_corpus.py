@@ -0,0 +1,97 @@
+"""Build a memory-mapped corpus file from chunk records."""
+from typing import Dict, Iterable, Iterator, List
+import argparse
+import json
+import logging
+import time
+
+from config import settings
+from services.corpus_file import CorpusWriter
+from services.corpus_store import validate_record
+from services.mock_data import MOCK_LEGAL_CHUNKS, MOCK_JUDGMENT_CHUNKS
+from services.vector_index import HashingEmbedder
+
+logger = logging.getLogger(__name__)
+
+# Records embedded per batch
+EMBED_BATCH_SIZE = 1024
+
+
+def read_records(paths: List[str]) -> Iterator[Dict]:
+    """
+    Stream chunk records from JSONL files.
+
+    Args:
+        paths: JSONL files with one LegalChunk/JudgmentChunk per line
+
+    Yields:
+        Chunk records
+    """
+    for path in paths:
+        with open(path, encoding="utf-8") as records_file:
+            for line in records_file:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def build_corpus(
+    records: Iterable[Dict],
+    output: str,
+    embed: bool = True,
+    validate: bool = True
+) -> int:
+    """
+    Write records to a corpus file.
+
+    Args:
+        records: Chunk records
+        output: Destination corpus file
+        embed: Whether to precompute and store embeddings
+        validate: Whether to validate each record against the schema
+
+    Returns:
+        Number of chunks written
+    """
+    embedder = HashingEmbedder(dim=settings.embedding_dim) if embed else None
+    writer = CorpusWriter(output, embedding_dim=embedder.dim if embedder else 0)
+    batch: List[Dict] = []
+
+    def flush() -> None:
+        vectors = embedder.embed_batch([record["text_for_embedding"] for record in batch]) if embedder else None
+        for position, record in enumerate(batch):
+            writer.add(record, None if vectors is None else vectors[position])
+        batch.clear()
+
+    for record in records:
+        batch.append(validate_record(record) if validate else record)
+        if len(batch) >= EMBED_BATCH_SIZE:
+            flush()
+    flush()
+
+    writer.write()
+    return len(writer)
+
+
+def main() -> None:
+    """Parse arguments and build the corpus file."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("output", help="corpus file to write")
+    parser.add_argument(
+        "inputs",
+        nargs="*",
+        help="JSONL chunk files; the built-in mock chunks when omitted"
+    )
+    parser.add_argument("--no-embeddings", action="store_true", help="do not store embeddings")
+    parser.add_argument("--no-validate", action="store_true", help="skip schema validation")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    records = read_records(args.inputs) if args.inputs else iter(MOCK_LEGAL_CHUNKS + MOCK_JUDGMENT_CHUNKS)
+
+    start_time = time.time()
+    count = build_corpus(records, args.output, embed=not args.no_embeddings, validate=not args.no_validate)
+    logger.info(f"Wrote {count} chunks to {args.output} in {time.time() - start_time:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
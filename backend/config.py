@@ -23,19 +23,68 @@ class Settings(BaseSettings):
     # Mock Data Settings
     use_mock_data: bool = Field(default=True, alias="USE_MOCK_DATA")
     
+    # Corpus File (empty uses the built-in mock chunks)
+    corpus_path: str = Field(default="", alias="CORPUS_PATH")
+    
+    # Ingestion
+    ingest_workers: int = Field(default=0, alias="INGEST_WORKERS")
+    ingest_batch_size: int = Field(default=64, alias="INGEST_BATCH_SIZE")
+    judgment_chunk_size: int = Field(default=1000, alias="JUDGMENT_CHUNK_SIZE")
+    judgment_chunk_overlap: int = Field(default=200, alias="JUDGMENT_CHUNK_OVERLAP")
+    
     # Search Parameters
     vector_search_top_k: int = Field(default=20, alias="VECTOR_SEARCH_TOP_K")
     bm25_top_k: int = Field(default=20, alias="BM25_TOP_K")
     hybrid_vector_weight: float = Field(default=0.6, alias="HYBRID_VECTOR_WEIGHT")
     hybrid_bm25_weight: float = Field(default=0.4, alias="HYBRID_BM25_WEIGHT")
     rerank_top_k: int = Field(default=5, alias="RERANK_TOP_K")
+    rerank_mode: str = Field(default="local", alias="RERANK_MODE")
+    rerank_candidates: int = Field(default=20, alias="RERANK_CANDIDATES")
+    rerank_batch_size: int = Field(default=16, alias="RERANK_BATCH_SIZE")
+    rerank_budget_ms: int = Field(default=50, alias="RERANK_BUDGET_MS")
+    scoring_mode: str = Field(default="numpy", alias="SCORING_MODE")
+    
+    # Search Result and Rerank Score Caches
+    search_cache_size: int = Field(default=1024, alias="SEARCH_CACHE_SIZE")
+    search_cache_ttl_seconds: int = Field(default=300, alias="SEARCH_CACHE_TTL_SECONDS")
+    rerank_cache_size: int = Field(default=4096, alias="RERANK_CACHE_SIZE")
+    rerank_cache_ttl_seconds: int = Field(default=600, alias="RERANK_CACHE_TTL_SECONDS")
+    
+    # Vector Index
+    vector_index_mode: str = Field(default="exact", alias="VECTOR_INDEX_MODE")
+    embedding_dim: int = Field(default=512, alias="EMBEDDING_DIM")
+    vector_min_similarity: float = Field(default=0.1, alias="VECTOR_MIN_SIMILARITY")
+    ivf_nlist: int = Field(default=64, alias="IVF_NLIST")
+    ivf_nprobe: int = Field(default=8, alias="IVF_NPROBE")
+    
+    # Incremental Index Updates
+    index_max_segments: int = Field(default=8, alias="INDEX_MAX_SEGMENTS")
+    
+    # Metrics
+    metrics_enabled: bool = Field(default=True, alias="METRICS_ENABLED")
     
     # LLM Parameters
     llm_temperature: float = Field(default=0.0, alias="LLM_TEMPERATURE")
     llm_max_tokens: int = Field(default=2000, alias="LLM_MAX_TOKENS")
+    llm_mock_latency_ms: int = Field(default=150, alias="LLM_MOCK_LATENCY_MS")
+    
+    # Context Assembly
+    context_budget_ratio: float = Field(default=0.5, alias="CONTEXT_BUDGET_RATIO")
+    
+    # LLM Response Cache
+    llm_cache_size: int = Field(default=512, alias="LLM_CACHE_SIZE")
+    llm_cache_ttl_seconds: int = Field(default=600, alias="LLM_CACHE_TTL_SECONDS")
+    llm_cache_include_history: bool = Field(default=False, alias="LLM_CACHE_INCLUDE_HISTORY")
     
     # Chatbot Memory
     chatbot_max_history: int = Field(default=10, alias="CHATBOT_MAX_HISTORY")
+    session_max_sessions: int = Field(default=10000, alias="SESSION_MAX_SESSIONS")
+    session_ttl_seconds: int = Field(default=3600, alias="SESSION_TTL_SECONDS")
+    session_max_bytes: int = Field(default=65536, alias="SESSION_MAX_BYTES")
+    session_store_backend: str = Field(default="memory", alias="SESSION_STORE_BACKEND")
+    session_store_path: str = Field(default="sessions.db", alias="SESSION_STORE_PATH")
+    session_flush_interval_ms: int = Field(default=50, alias="SESSION_FLUSH_INTERVAL_MS")
+    session_flush_batch_size: int = Field(default=64, alias="SESSION_FLUSH_BATCH_SIZE")
     
     @property
     def allowed_origins_list(self) -> List[str]:
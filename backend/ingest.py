@@ -0,0 +1,39 @@
+"""Ingest statutes and judgments into a memory-mapped corpus file."""
+import argparse
+import logging
+
+from config import settings
+from services.ingestion import ingest
+
+
+def main() -> None:
+    """Parse arguments and run the ingestion pipeline."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("output", help="corpus file to write")
+    parser.add_argument("inputs", nargs="+", help="JSONL/text files or directories")
+    parser.add_argument(
+        "--doc-type",
+        choices=["statute", "judgment"],
+        default="statute",
+        help="document type of plain text files"
+    )
+    parser.add_argument("--workers", type=int, default=settings.ingest_workers, help="worker processes; 0 uses every CPU")
+    parser.add_argument("--batch-size", type=int, default=settings.ingest_batch_size, help="documents per worker task")
+    parser.add_argument("--no-embeddings", action="store_true", help="do not store embeddings")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    ingest(
+        args.inputs,
+        args.output,
+        workers=args.workers,
+        batch_size=args.batch_size,
+        chunk_size=settings.judgment_chunk_size,
+        chunk_overlap=settings.judgment_chunk_overlap,
+        embedding_dim=0 if args.no_embeddings else settings.embedding_dim,
+        default_doc_type=args.doc_type
+    )
+
+
+if __name__ == "__main__":
+    main()
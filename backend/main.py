@@ -14,11 +14,16 @@ from routes import (
     viability_router,
     arguments_router,
     clauses_router,
+    index_router,
+    metrics_router,
 )
+from services.mock_llm import mock_llm
 from middleware import (
     validation_exception_handler,
     http_exception_handler,
     general_exception_handler,
+    MetricsMiddleware,
+    TimedJSONResponse,
 )
 
 # Configure logging
@@ -35,7 +40,9 @@ app = FastAPI(
     description="AI-powered legal research and petition drafting platform for Indian laws",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    # Times JSON rendering as the serialization stage
+    default_response_class=TimedJSONResponse
 )
 
 # Configure CORS
@@ -47,6 +54,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Record request latency per route
+app.add_middleware(MetricsMiddleware, routes=app.routes)
+
 # Register exception handlers
 app.add_exception_handler(RequestValidationError, validation_exception_handler)
 app.add_exception_handler(StarletteHTTPException, http_exception_handler)
@@ -60,6 +70,8 @@ app.include_router(chat_router, tags=["Chat"])
 app.include_router(viability_router, tags=["Viability Predictor"])
 app.include_router(arguments_router, tags=["Argument Miner"])
 app.include_router(clauses_router, tags=["Clause Search"])
+app.include_router(index_router, tags=["Index"])
+app.include_router(metrics_router, tags=["Metrics"])
 
 
 @app.on_event("startup")
@@ -75,6 +87,7 @@ async def startup_event():
 async def shutdown_event():
     """Shutdown event handler."""
     logger.info("Shutting down Legal Assistant API...")
+    await mock_llm.close()
 
 
 if __name__ == "__main__":
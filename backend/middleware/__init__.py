@@ -4,9 +4,12 @@ from .error_handler import (
     http_exception_handler,
     general_exception_handler,
 )
+from .metrics import MetricsMiddleware, TimedJSONResponse
 
 __all__ = [
     "validation_exception_handler",
     "http_exception_handler",
     "general_exception_handler",
+    "MetricsMiddleware",
+    "TimedJSONResponse",
 ]
@@ -0,0 +1,87 @@
+"""Request latency middleware and timed JSON responses."""
+from typing import Any, Dict, List
+import time
+from fastapi.responses import JSONResponse
+from starlette.routing import BaseRoute, Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from services.metrics import metrics, REQUEST_METRIC
+
+# Route label of requests matching no route, so unknown paths share one series
+UNMATCHED_ROUTE = "unmatched"
+
+
+class MetricsMiddleware:
+    """
+    Records the latency of every HTTP request per method, route and status.
+
+    The clock stops when the last response body chunk is sent, so streamed
+    responses are timed to their end. Requests are labelled with the route
+    template rather than the raw path to keep the number of series bounded.
+    """
+
+    def __init__(self, app: ASGIApp, routes: List[BaseRoute]):
+        """
+        Wrap an application.
+
+        Args:
+            app: Next ASGI application
+            routes: Application routes, used to resolve route templates
+        """
+        self.app = app
+        self.routes = routes
+        # path -> route template, for matched paths only
+        self._templates: Dict[str, str] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Time an HTTP request."""
+        if scope["type"] != "http" or not metrics.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter_ns()
+        status_code = 500
+
+        async def timed_send(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                self._observe(scope, status_code, start)
+
+        try:
+            await self.app(scope, receive, timed_send)
+        except Exception:
+            self._observe(scope, status_code, start)
+            raise
+
+    def _observe(self, scope: Scope, status_code: int, start: int) -> None:
+        """Record the request duration."""
+        metrics.observe(
+            REQUEST_METRIC,
+            (time.perf_counter_ns() - start) / 1e9,
+            method=scope["method"],
+            route=self._route(scope),
+            status=str(status_code)
+        )
+
+    def _route(self, scope: Scope) -> str:
+        """Resolve the route template of a request."""
+        path = scope["path"]
+        template = self._templates.get(path)
+        if template is None:
+            for route in self.routes:
+                match, _ = route.matches(scope)
+                if match != Match.NONE:
+                    template = self._templates[path] = getattr(route, "path", path)
+                    break
+        return template or UNMATCHED_ROUTE
+
+
+class TimedJSONResponse(JSONResponse):
+    """JSON response timing its rendering as the serialization stage."""
+
+    def render(self, content: Any) -> bytes:
+        """Render content to JSON bytes."""
+        with metrics.span("serialization"):
+            return super().render(content)
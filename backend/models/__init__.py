@@ -10,6 +10,8 @@ from .schemas import (
     SearchRequest,
     SearchResult,
     SearchResponse,
+    BatchSearchRequest,
+    BatchSearchResponse,
     # Autocomplete
     AutocompleteResponse,
     # Chat
@@ -29,8 +31,16 @@ from .schemas import (
     ClausesRequest,
     ClauseResult,
     ClausesResponse,
+    # Index updates
+    IndexChunksRequest,
+    DeleteChunksRequest,
+    IndexStatsResponse,
+    IndexUpdateResponse,
     # Health
     HealthResponse,
+    SessionStatsResponse,
+    CacheStats,
+    CacheStatsResponse,
 )
 
 __all__ = [
@@ -41,6 +51,8 @@ __all__ = [
     "SearchRequest",
     "SearchResult",
     "SearchResponse",
+    "BatchSearchRequest",
+    "BatchSearchResponse",
     "AutocompleteResponse",
     "ChatRequest",
     "SourceReference",
@@ -55,5 +67,12 @@ __all__ = [
     "ClausesRequest",
     "ClauseResult",
     "ClausesResponse",
+    "IndexChunksRequest",
+    "DeleteChunksRequest",
+    "IndexStatsResponse",
+    "IndexUpdateResponse",
     "HealthResponse",
+    "SessionStatsResponse",
+    "CacheStats",
+    "CacheStatsResponse",
 ]
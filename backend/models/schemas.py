@@ -65,6 +65,7 @@ class SearchRequest(BaseModel):
     query: str = Field(..., min_length=1, description="Search query")
     filters: Optional[SearchFilters] = None
     top_k: int = Field(default=5, ge=1, le=50, description="Number of results")
+    rerank: bool = Field(default=False, description="Rerank the first-stage results")
 
 
 class SearchResult(BaseModel):
@@ -73,6 +74,8 @@ class SearchResult(BaseModel):
     content: str
     metadata: Metadata
     score: float = Field(..., ge=0.0, le=1.0)
+    # LLM token count of content, counted on ingest; used for prompt budgeting only
+    token_count: Optional[int] = Field(default=None, exclude=True)
 
 
 class SearchResponse(BaseModel):
@@ -82,6 +85,18 @@ class SearchResponse(BaseModel):
     query_time_ms: int
 
 
+class BatchSearchRequest(BaseModel):
+    """Batch search request payload."""
+    queries: List[SearchRequest] = Field(..., min_length=1, max_length=100, description="Searches to run")
+
+
+class BatchSearchResponse(BaseModel):
+    """Batch search response payload, one response per query in order."""
+    responses: List[SearchResponse]
+    total: int
+    query_time_ms: int
+
+
 # ============================================================================
 # Autocomplete Models
 # ============================================================================
@@ -99,6 +114,7 @@ class ChatRequest(BaseModel):
     """Chat request payload."""
     session_id: str = Field(..., description="Unique session identifier")
     query: str = Field(..., min_length=1, description="User query")
+    bypass_cache: bool = Field(default=False, description="Skip the response cache")
 
 
 class SourceReference(BaseModel):
@@ -198,6 +214,35 @@ class ClausesResponse(BaseModel):
     clauses: List[ClauseResult]
 
 
+# ============================================================================
+# Index Update Models
+# ============================================================================
+
+class IndexChunksRequest(BaseModel):
+    """Chunks to add to the search index, replacing chunks with the same id."""
+    chunks: List[LegalChunk] = Field(..., min_length=1)
+
+
+class DeleteChunksRequest(BaseModel):
+    """Ids of chunks to remove from the search index."""
+    ids: List[str] = Field(..., min_length=1)
+
+
+class IndexStatsResponse(BaseModel):
+    """Live search index snapshot counters."""
+    documents: int
+    deleted: int
+    segments: int
+    generation: int
+
+
+class IndexUpdateResponse(BaseModel):
+    """Result of an index update."""
+    indexed: int = 0
+    deleted: int = 0
+    index: IndexStatsResponse
+
+
 # ============================================================================
 # Health Check Models
 # ============================================================================
@@ -208,3 +253,39 @@ class HealthResponse(BaseModel):
     service: str
     version: str
     timestamp: datetime
+
+
+class SessionStatsResponse(BaseModel):
+    """Chat session store usage counters."""
+    sessions: int
+    messages: int
+    bytes: int
+    lru_evictions: int
+    ttl_evictions: int
+    trimmed_messages: int
+
+
+class CacheStats(BaseModel):
+    """Usage counters of one cache."""
+    size: int
+    max_size: int
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    hit_rate: float
+
+
+class CoalescingStats(BaseModel):
+    """Counters of one single-flight group of in-flight computations."""
+    in_flight: int
+    started: int
+    coalesced: int
+    coalesced_rate: float
+
+
+class CacheStatsResponse(BaseModel):
+    """Usage counters of every cache, keyed by cache name."""
+    caches: Dict[str, CacheStats]
+    # Requests that joined an identical computation already in flight
+    coalescing: Dict[str, CoalescingStats] = Field(default_factory=dict)
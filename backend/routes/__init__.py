@@ -6,6 +6,8 @@ from .chat import router as chat_router
 from .viability import router as viability_router
 from .arguments import router as arguments_router
 from .clauses import router as clauses_router
+from .index import router as index_router
+from .metrics import router as metrics_router
 
 __all__ = [
     "health_router",
@@ -15,4 +17,6 @@ __all__ = [
     "viability_router",
     "arguments_router",
     "clauses_router",
+    "index_router",
+    "metrics_router",
 ]
@@ -25,7 +25,7 @@ async def extract_arguments(request: ArgumentsRequest):
     # Search for relevant judgments
     search_filters = SearchFilters(doc_type="judgment")
     
-    results, _ = mock_retriever.search(
+    results, _ = await mock_retriever.search_async(
         query=request.scenario,
         filters=search_filters,
         top_k=5
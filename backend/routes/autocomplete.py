@@ -1,7 +1,8 @@
 """Autocomplete endpoint for suggestions."""
 from fastapi import APIRouter, Query
 from models.schemas import AutocompleteResponse
-from services.mock_data import AUTOCOMPLETE_DATA
+from services.autocomplete_index import autocomplete_index
+from services.metrics import metrics
 
 router = APIRouter(prefix="/api/v1")
 
@@ -17,15 +18,8 @@ async def autocomplete(q: str = Query(..., min_length=1, description="Query stri
     Returns:
         List of matching suggestions
     """
-    q_lower = q.lower()
-    
-    # Filter suggestions that match the query
-    suggestions = [
-        suggestion for suggestion in AUTOCOMPLETE_DATA
-        if q_lower in suggestion.lower()
-    ]
-    
-    # Limit to top 10
-    suggestions = suggestions[:10]
+    # Top 10 suggestions ranked by the prebuilt index
+    with metrics.span("autocomplete"):
+        suggestions = autocomplete_index.suggest(q, limit=10)
     
     return AutocompleteResponse(suggestions=suggestions)
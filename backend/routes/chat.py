@@ -1,12 +1,37 @@
 """Chat endpoint for RAG-based conversational Q&A."""
+from typing import AsyncIterator
+import json
 from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
 from models.schemas import ChatRequest, ChatResponse
+from config import settings
 from services.mock_retriever import mock_retriever
 from services.mock_llm import mock_llm
+from services.context_builder import PromptContext, context_builder
+from services.metrics import metrics
 
 router = APIRouter(prefix="/api/v1")
 
 
+async def _build_context(query: str) -> PromptContext:
+    """Retrieve passages for a query and pack them into the prompt budget."""
+    # Retrieve relevant chunks, reranked down to the chunks given to the LLM
+    results, _ = await mock_retriever.search_async(
+        query=query,
+        filters=None,
+        top_k=settings.rerank_top_k,
+        rerank=True
+    )
+    
+    with metrics.span("context"):
+        return context_builder.build(query, results)
+
+
+def _sse_event(event: str, data: object) -> str:
+    """Format a Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
 @router.post("/chat", response_model=ChatResponse)
 async def chat(request: ChatRequest):
     """
@@ -18,28 +43,14 @@ async def chat(request: ChatRequest):
     Returns:
         Answer with source citations
     """
-    # Retrieve relevant chunks
-    results, _ = mock_retriever.search(
-        query=request.query,
-        filters=None,
-        top_k=5
-    )
+    context = await _build_context(request.query)
     
-    # Convert to dict format for LLM
-    chunks = [
-        {
-            "content": result.content,
-            "metadata": result.metadata.model_dump(),
-            "score": result.score
-        }
-        for result in results
-    ]
-    
-    # Generate response using mock LLM
-    answer, sources = mock_llm.generate_chat_response(
+    # Generate response using mock LLM without blocking the event loop
+    answer, sources = await mock_llm.generate(
         query=request.query,
         session_id=request.session_id,
-        retrieved_chunks=chunks
+        context=context,
+        use_cache=not request.bypass_cache
     )
     
     return ChatResponse(
@@ -47,3 +58,44 @@ async def chat(request: ChatRequest):
         sources=sources,
         session_id=request.session_id
     )
+
+
+@router.post("/chat/stream")
+async def chat_stream(request: ChatRequest):
+    """
+    RAG-based conversational legal Q&A streamed as Server-Sent Events.
+    
+    Emits a `sources` event first, then one `token` event per answer
+    fragment, then a `done` event.
+    
+    Args:
+        request: Chat request with session_id and query
+        
+    Returns:
+        Event stream of sources and answer tokens
+    """
+    context = await _build_context(request.query)
+    sources = mock_llm.create_sources(context)
+    
+    async def event_stream() -> AsyncIterator[str]:
+        yield _sse_event("sources", [source.model_dump() for source in sources])
+        
+        async for token in mock_llm.stream(
+            query=request.query,
+            session_id=request.session_id,
+            context=context,
+            use_cache=not request.bypass_cache
+        ):
+            yield _sse_event("token", {"text": token})
+        
+        yield _sse_event("done", {"session_id": request.session_id})
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            # Stop reverse proxies from buffering the stream
+            "X-Accel-Buffering": "no"
+        }
+    )
@@ -1,7 +1,10 @@
 """Health check endpoint."""
 from fastapi import APIRouter
+from starlette.concurrency import run_in_threadpool
 from datetime import datetime
-from models.schemas import HealthResponse
+from models.schemas import HealthResponse, SessionStatsResponse, CacheStatsResponse, IndexStatsResponse
+from services.mock_llm import mock_llm
+from services.mock_retriever import mock_retriever
 
 router = APIRouter()
 
@@ -15,3 +18,32 @@ async def health_check():
         version="1.0.0",
         timestamp=datetime.utcnow()
     )
+
+
+@router.get("/health/sessions", response_model=SessionStatsResponse)
+async def session_stats():
+    """Chat session store memory usage and eviction counters."""
+    # A shared session store queries its database
+    return SessionStatsResponse(**await run_in_threadpool(mock_llm.sessions.stats))
+
+
+@router.get("/health/cache", response_model=CacheStatsResponse)
+async def cache_stats():
+    """Cache sizes, hit/miss counters and in-flight request coalescing."""
+    caches = {
+        "search": mock_retriever.result_cache.stats(),
+        "llm_response": mock_llm.response_cache.stats(),
+    }
+    if mock_retriever.rerank_stage is not None:
+        caches["rerank"] = mock_retriever.rerank_stage.score_cache.stats()
+    coalescing = {
+        "search": mock_retriever.in_flight.stats(),
+        "llm_response": mock_llm.in_flight.stats(),
+    }
+    return CacheStatsResponse(caches=caches, coalescing=coalescing)
+
+
+@router.get("/health/index", response_model=IndexStatsResponse)
+async def index_stats():
+    """Search index document, segment and update counters."""
+    return IndexStatsResponse(**mock_retriever.index_stats())
@@ -0,0 +1,61 @@
+"""Index update endpoints for adding, replacing and deleting chunks."""
+from fastapi import APIRouter
+from starlette.concurrency import run_in_threadpool
+from models.schemas import (
+    IndexChunksRequest,
+    DeleteChunksRequest,
+    IndexStatsResponse,
+    IndexUpdateResponse,
+)
+from services.mock_retriever import mock_retriever
+
+router = APIRouter(prefix="/api/v1/index")
+
+
+@router.post("/chunks", response_model=IndexUpdateResponse)
+async def upsert_chunks(request: IndexChunksRequest):
+    """
+    Add chunks to the search index, replacing chunks with the same id.
+    
+    Indexing runs in a worker thread; searches keep serving the previous
+    snapshot until the new one is swapped in.
+    
+    Args:
+        request: Chunks to index
+        
+    Returns:
+        Number of indexed chunks and the new index counters
+    """
+    indexed = await run_in_threadpool(
+        mock_retriever.upsert_chunks,
+        [chunk.model_dump() for chunk in request.chunks]
+    )
+    return IndexUpdateResponse(
+        indexed=indexed,
+        index=IndexStatsResponse(**mock_retriever.index_stats())
+    )
+
+
+@router.post("/chunks/delete", response_model=IndexUpdateResponse)
+async def delete_chunks(request: DeleteChunksRequest):
+    """
+    Delete chunks from the search index.
+    
+    Args:
+        request: Ids of the chunks to delete
+        
+    Returns:
+        Number of deleted chunks and the new index counters
+    """
+    deleted = await run_in_threadpool(mock_retriever.delete_chunks, request.ids)
+    return IndexUpdateResponse(
+        deleted=deleted,
+        index=IndexStatsResponse(**mock_retriever.index_stats())
+    )
+
+
+@router.post("/reload", response_model=IndexStatsResponse)
+async def reload_index():
+    """Rebuild the index from the configured corpus and swap it in."""
+    await run_in_threadpool(mock_retriever.reload)
+    return IndexStatsResponse(**mock_retriever.index_stats())
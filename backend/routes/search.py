@@ -1,6 +1,8 @@
 """Search endpoint for hybrid search."""
 from fastapi import APIRouter
-from models.schemas import SearchRequest, SearchResponse
+from starlette.concurrency import run_in_threadpool
+import time
+from models.schemas import SearchRequest, SearchResponse, BatchSearchRequest, BatchSearchResponse
 from services.mock_retriever import mock_retriever
 
 router = APIRouter(prefix="/api/v1")
@@ -17,10 +19,11 @@ async def search(request: SearchRequest):
     Returns:
         Search results with relevance scores
     """
-    results, query_time = mock_retriever.search(
+    results, query_time = await mock_retriever.search_async(
         query=request.query,
         filters=request.filters,
-        top_k=request.top_k
+        top_k=request.top_k,
+        rerank=request.rerank
     )
     
     return SearchResponse(
@@ -28,3 +31,42 @@ async def search(request: SearchRequest):
         total=len(results),
         query_time_ms=query_time
     )
+
+
+@router.post("/search/batch", response_model=BatchSearchResponse)
+async def search_batch(request: BatchSearchRequest):
+    """
+    Perform several hybrid searches in one request.
+    
+    The searches share one index snapshot, filter resolution, postings of
+    common terms and batched vector search, so a batch is cheaper than the
+    same number of single searches.
+    
+    Args:
+        request: Batch of search requests
+        
+    Returns:
+        One search response per query, in request order
+    """
+    start_time = time.perf_counter_ns()
+    # Up to a hundred searches must not hold up the event loop
+    outcomes = await run_in_threadpool(
+        mock_retriever.search_many,
+        [(search.query, search.filters, search.top_k) for search in request.queries],
+        rerank=[search.rerank for search in request.queries]
+    )
+    
+    responses = [
+        SearchResponse(
+            results=results,
+            total=len(results),
+            query_time_ms=query_time
+        )
+        for results, query_time in outcomes
+    ]
+    
+    return BatchSearchResponse(
+        responses=responses,
+        total=len(responses),
+        query_time_ms=round((time.perf_counter_ns() - start_time) / 1e6)
+    )
@@ -31,7 +31,7 @@ async def predict_viability(request: ViabilityRequest):
         if request.filters.case_type:
             search_filters.case_type = request.filters.case_type
     
-    results, _ = mock_retriever.search(
+    results, _ = await mock_retriever.search_async(
         query=request.facts,
         filters=search_filters,
         top_k=10
@@ -6,7 +6,9 @@ from .mock_data import (
     get_all_legal_chunks,
     get_all_judgment_chunks,
     get_all_chunks,
+    get_corpus_store,
 )
+from .corpus_store import CorpusStore
 from .mock_retriever import mock_retriever
 from .mock_llm import mock_llm
 
@@ -17,6 +19,8 @@ __all__ = [
     "get_all_legal_chunks",
     "get_all_judgment_chunks",
     "get_all_chunks",
+    "get_corpus_store",
+    "CorpusStore",
     "mock_retriever",
     "mock_llm",
 ]
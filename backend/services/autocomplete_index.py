@@ -0,0 +1,208 @@
+"""Prefix and infix index for ranked autocomplete suggestions."""
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+from bisect import bisect_left
+import heapq
+from services.mock_data import AUTOCOMPLETE_DATA
+
+
+class _RangeMin:
+    """Segment tree answering argmin queries over a static list of values."""
+
+    def __init__(self, values: List[int]):
+        """Build the tree bottom-up in O(n)."""
+        self.values = values
+        size = 1
+        while size < max(len(values), 1):
+            size *= 2
+        self.size = size
+
+        # Leaves hold positions; -1 marks padding
+        self.tree = [-1] * (2 * size)
+        self.tree[size:size + len(values)] = range(len(values))
+        for node in range(size - 1, 0, -1):
+            self.tree[node] = self._better(self.tree[2 * node], self.tree[2 * node + 1])
+
+    def _better(self, left: int, right: int) -> int:
+        """Pick the position holding the smaller value."""
+        if left < 0:
+            return right
+        if right < 0:
+            return left
+        return left if self.values[left] <= self.values[right] else right
+
+    def argmin(self, lo: int, hi: int) -> int:
+        """Get the position of the smallest value in [lo, hi)."""
+        best = -1
+        lo += self.size
+        hi += self.size
+        while lo < hi:
+            if lo & 1:
+                best = self._better(best, self.tree[lo])
+                lo += 1
+            if hi & 1:
+                hi -= 1
+                best = self._better(best, self.tree[hi])
+            lo //= 2
+            hi //= 2
+        return best
+
+
+class AutocompleteIndex:
+    """
+    Autocomplete index built once over a static suggestion list.
+
+    Every word start of every suggestion is stored as a key in a sorted
+    array, so a prefix resolves to a contiguous range by bisection. A
+    segment tree over the suggestion ranks yields the best suggestions of
+    that range without scanning it. Queries that are not a word prefix fall
+    back to a character n-gram index for infix matches; substrings shorter
+    than an n-gram are indexed too, so one or two characters from the
+    middle of a word still match.
+    """
+
+    def __init__(
+        self,
+        entries: Sequence[str],
+        weights: Optional[Sequence[float]] = None,
+        ngram: int = 3
+    ):
+        """
+        Build the index.
+
+        Args:
+            entries: Suggestion strings
+            weights: Popularity of each suggestion; defaults to list order
+            ngram: Length of the character n-grams used for infix matches
+        """
+        self.entries = list(entries)
+        self.ngram = ngram
+        self._entries_lower = [entry.lower() for entry in self.entries]
+
+        if weights is None:
+            # Earlier suggestions are the more popular ones
+            weights = [len(self.entries) - position for position in range(len(self.entries))]
+
+        # rank 0 is the most popular suggestion
+        order = sorted(range(len(self.entries)), key=lambda i: (-weights[i], i))
+        self._ranks = [0] * len(self.entries)
+        for rank, entry_id in enumerate(order):
+            self._ranks[entry_id] = rank
+
+        self._build_prefix_index()
+        self._build_ngram_index(order)
+
+    def _build_prefix_index(self) -> None:
+        """Build the sorted word-start keys and their rank tree."""
+        entry_count = len(self.entries)
+        keys: List[Tuple[str, int, int]] = []
+
+        for entry_id, text in enumerate(self._entries_lower):
+            for start in self._word_starts(text):
+                # Whole-string prefixes outrank matches on later words
+                value = self._ranks[entry_id] + (0 if start == 0 else entry_count)
+                keys.append((text[start:], value, entry_id))
+
+        keys.sort()
+        self._keys = [key for key, _, _ in keys]
+        self._key_entries = [entry_id for _, _, entry_id in keys]
+        self._key_tree = _RangeMin([value for _, value, _ in keys])
+
+    def _build_ngram_index(self, order: List[int]) -> None:
+        """Build n-gram and shorter substring postings, each sorted by suggestion rank."""
+        self._ngrams: Dict[str, List[int]] = {}
+        for entry_id in order:
+            text = self._entries_lower[entry_id]
+            grams: Set[str] = set()
+            for length in range(1, self.ngram + 1):
+                grams |= self._grams(text, length)
+            for gram in grams:
+                self._ngrams.setdefault(gram, []).append(entry_id)
+
+    @staticmethod
+    def _word_starts(text: str) -> List[int]:
+        """Get positions where a word begins."""
+        return [
+            position for position, char in enumerate(text)
+            if char.isalnum() and (position == 0 or not text[position - 1].isalnum())
+        ]
+
+    def _grams(self, text: str, n: Optional[int] = None) -> Set[str]:
+        """Get the distinct character n-grams of a text."""
+        n = n or self.ngram
+        return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+    def _prefix_matches(self, query: str, limit: int, seen: Set[int]) -> List[int]:
+        """Get the best suggestions having a word starting with the query."""
+        lo = bisect_left(self._keys, query)
+        hi = bisect_left(self._keys, query + "\uffff")
+        if lo >= hi:
+            return []
+
+        values = self._key_tree.values
+        best = self._key_tree.argmin(lo, hi)
+        heap = [(values[best], best, lo, hi)]
+        matches: List[int] = []
+
+        # Pop ranges in rank order, splitting around each pick
+        while heap and len(matches) < limit:
+            _, position, lo, hi = heapq.heappop(heap)
+            entry_id = self._key_entries[position]
+            if entry_id not in seen:
+                seen.add(entry_id)
+                matches.append(entry_id)
+            if lo < position:
+                left = self._key_tree.argmin(lo, position)
+                heapq.heappush(heap, (values[left], left, lo, position))
+            if position + 1 < hi:
+                right = self._key_tree.argmin(position + 1, hi)
+                heapq.heappush(heap, (values[right], right, position + 1, hi))
+
+        return matches
+
+    def _infix_matches(self, query: str, limit: int, seen: Set[int]) -> List[int]:
+        """Get the best suggestions containing the query anywhere."""
+        # A query shorter than an n-gram is a key of its own
+        grams = self._grams(query) if len(query) >= self.ngram else {query}
+        postings = [self._ngrams.get(gram) for gram in grams]
+        if not postings or any(not doc_ids for doc_ids in postings):
+            return []
+
+        # Walk the rarest n-gram's postings in rank order and verify
+        postings.sort(key=len)
+        matches: List[int] = []
+        for entry_id in postings[0]:
+            if entry_id in seen or query not in self._entries_lower[entry_id]:
+                continue
+            seen.add(entry_id)
+            matches.append(entry_id)
+            if len(matches) >= limit:
+                break
+        return matches
+
+    def suggest(self, query: str, limit: int = 10) -> List[str]:
+        """
+        Get ranked suggestions for a query.
+
+        Suggestions starting with the query come first, then suggestions
+        with a later word starting with it, then infix matches; each group
+        is ordered by popularity.
+
+        Args:
+            query: Partial user input
+            limit: Maximum number of suggestions
+
+        Returns:
+            List of suggestion strings
+        """
+        query = query.lower()
+        seen: Set[int] = set()
+
+        matches = self._prefix_matches(query, limit, seen)
+        if len(matches) < limit and query:
+            matches += self._infix_matches(query, limit - len(matches), seen)
+
+        return [self.entries[entry_id] for entry_id in matches]
+
+
+# Global autocomplete index instance
+autocomplete_index = AutocompleteIndex(AUTOCOMPLETE_DATA)
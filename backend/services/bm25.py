@@ -0,0 +1,255 @@
+"""In-process BM25 ranking over inverted index fields."""
+from typing import Dict, Iterable, List, Optional, Sequence, Set
+import heapq
+import math
+from services.inverted_index import InvertedIndex
+
+# Relative slack on pruning thresholds, covering float summation order
+PRUNING_TOLERANCE = 1e-9
+
+
+class BM25Field:
+    """BM25 statistics for one field indexed across one or more segments."""
+
+    def __init__(self, indexes: Sequence[InvertedIndex], weight: float, k1: float, b: float):
+        """
+        Aggregate collection statistics over the segment indexes of a field.
+
+        Document counts and lengths are summed across segments so scores do
+        not depend on how documents are split into segments.
+
+        Args:
+            indexes: Inverted indexes of the field, one per segment
+            weight: Contribution of this field to the final score
+            k1: Term frequency saturation parameter
+            b: Length normalization parameter
+        """
+        self.indexes = list(indexes)
+        self.weight = weight
+        self.k1 = k1
+
+        self.doc_count = sum(index.doc_count for index in self.indexes)
+        total_length = sum(index.total_length for index in self.indexes)
+        avg_length = total_length / self.doc_count if self.doc_count else 0.0
+
+        self.avg_length = avg_length
+        self.b = b
+
+        # term -> inverse document frequency, filled in as terms are queried
+        self._idf: Dict[str, float] = {}
+        # Per index: doc_id -> k1 * (1 - b + b * dl / avgdl), built on first use
+        self._length_norms: List[Optional[Dict[int, float]]] = [None] * len(self.indexes)
+        # term -> highest contribution of the term to any document
+        self._max_scores: Dict[str, float] = {}
+
+    def idf(self, term: str) -> Optional[float]:
+        """Get the inverse document frequency of a term, or None if unindexed."""
+        idf = self._idf.get(term)
+        if idf is None:
+            doc_freq = sum(index.doc_freq(term) for index in self.indexes)
+            if not doc_freq:
+                return None
+            idf = math.log(1 + (self.doc_count - doc_freq + 0.5) / (doc_freq + 0.5))
+            self._idf[term] = idf
+        return idf
+
+    def length_norms(self, position: int) -> Dict[int, float]:
+        """Get the per-document denominator terms of the index at a position."""
+        norms = self._length_norms[position]
+        if norms is None:
+            k1, b, avg_length = self.k1, self.b, self.avg_length
+            norms = {
+                doc_id: k1 * (1 - b + b * (length / avg_length if avg_length else 0.0))
+                for doc_id, length in self.indexes[position].doc_lengths.items()
+            }
+            self._length_norms[position] = norms
+        return norms
+
+    def max_score(self, term: str) -> float:
+        """Get the highest contribution of a term to any document, 0 if unindexed."""
+        max_score = self._max_scores.get(term)
+        if max_score is None:
+            max_score = 0.0
+            idf = self.idf(term)
+            if idf is not None:
+                term_weight = self.weight * idf * (self.k1 + 1)
+                for position, index in enumerate(self.indexes):
+                    length_norms = self.length_norms(position)
+                    for doc_id, tf in index.get_postings(term).items():
+                        max_score = max(max_score, term_weight * tf / (tf + length_norms[doc_id]))
+            self._max_scores[term] = max_score
+        return max_score
+
+
+class BM25Scorer:
+    """Okapi BM25 scorer summing weighted per-field scores."""
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        """
+        Initialize an empty scorer.
+
+        Args:
+            k1: Term frequency saturation parameter
+            b: Length normalization parameter
+        """
+        self.k1 = k1
+        self.b = b
+        self.fields: Dict[str, BM25Field] = {}
+
+    def add_field(self, name: str, indexes: Sequence[InvertedIndex], weight: float = 1.0) -> None:
+        """Register a field indexed by one inverted index per segment."""
+        self.fields[name] = BM25Field(indexes, weight, self.k1, self.b)
+
+    def score(
+        self,
+        query_terms: Iterable[str],
+        allowed_ids: Optional[Set[int]] = None
+    ) -> Dict[int, float]:
+        """
+        Score documents against the query.
+
+        Only the postings of the query terms are visited, so the cost is
+        proportional to the matched postings rather than the corpus size.
+
+        Args:
+            query_terms: Tokenized query
+            allowed_ids: Optional set of document ids to restrict scoring to
+
+        Returns:
+            Mapping of document id to BM25 score
+        """
+        scores: Dict[int, float] = {}
+        for term in set(query_terms):
+            self._accumulate(term, scores, allowed_ids)
+        return scores
+
+    def top_k(
+        self,
+        query_terms: Iterable[str],
+        top_k: int,
+        allowed_ids: Optional[Set[int]] = None
+    ) -> Dict[int, float]:
+        """
+        Get the top_k documents by BM25 score, pruning with MaxScore.
+
+        Terms are visited from the highest to the lowest score upper bound.
+        Once the remaining terms together cannot lift an unseen document to
+        the current k-th best score, they only update documents already
+        seen, and documents that can no longer reach the top k are dropped.
+        The survivors are rescored in query term order, so the scores equal
+        those of score().
+
+        Args:
+            query_terms: Tokenized query
+            top_k: Number of documents to keep
+            allowed_ids: Optional set of document ids to restrict scoring to
+
+        Returns:
+            Mapping of document id to BM25 score, best first
+        """
+        terms = list(set(query_terms))
+        if top_k <= 0 or not terms:
+            return {}
+        bounds = {term: sum(field.max_score(term) for field in self.fields.values()) for term in terms}
+        order = sorted(terms, key=lambda term: -bounds[term])
+        # Upper bound of the terms after each position
+        remaining = [0.0] * len(order)
+        for position in range(len(order) - 2, -1, -1):
+            remaining[position] = remaining[position + 1] + bounds[order[position + 1]]
+
+        scores: Dict[int, float] = {}
+        essential = True
+        for position, term in enumerate(order):
+            if essential:
+                self._accumulate(term, scores, allowed_ids)
+            else:
+                self._update(term, scores)
+            if len(scores) < top_k or position == len(order) - 1:
+                continue
+            cutoff = heapq.nlargest(top_k, scores.values())[-1] * (1 - PRUNING_TOLERANCE)
+            if essential and remaining[position] < cutoff:
+                essential = False
+            if not essential:
+                scores = {
+                    doc_id: score for doc_id, score in scores.items()
+                    if score + remaining[position] >= cutoff
+                }
+
+        if order == terms and essential:
+            return top_scores(scores, top_k)
+
+        # Summation order differed, so rescore every document near the cutoff
+        if len(scores) > top_k:
+            cutoff = heapq.nlargest(top_k, scores.values())[-1] * (1 - PRUNING_TOLERANCE)
+            scores = {doc_id: score for doc_id, score in scores.items() if score >= cutoff}
+        return top_scores(self._score_documents(scores, terms), top_k)
+
+    def _accumulate(
+        self,
+        term: str,
+        scores: Dict[int, float],
+        allowed_ids: Optional[Set[int]]
+    ) -> Dict[int, float]:
+        """Add the contributions of one term over every field to scores."""
+        for field in self.fields.values():
+            idf = field.idf(term)
+            if idf is None:
+                continue
+            term_weight = field.weight * idf * (field.k1 + 1)
+            for position, index in enumerate(field.indexes):
+                length_norms = field.length_norms(position)
+                for doc_id, tf in index.get_postings(term).items():
+                    if allowed_ids is not None and doc_id not in allowed_ids:
+                        continue
+                    term_score = term_weight * tf / (tf + length_norms[doc_id])
+                    scores[doc_id] = scores.get(doc_id, 0.0) + term_score
+        return scores
+
+    def _update(self, term: str, scores: Dict[int, float]) -> None:
+        """Add the contributions of one term to the documents already in scores."""
+        for field in self.fields.values():
+            idf = field.idf(term)
+            if idf is None:
+                continue
+            term_weight = field.weight * idf * (field.k1 + 1)
+            for position, index in enumerate(field.indexes):
+                postings = index.get_postings(term)
+                length_norms = field.length_norms(position)
+                # Walk whichever side is shorter
+                if len(postings) < len(scores):
+                    matched = [doc_id for doc_id in postings if doc_id in scores]
+                else:
+                    matched = [doc_id for doc_id in scores if doc_id in postings]
+                for doc_id in matched:
+                    tf = postings[doc_id]
+                    scores[doc_id] += term_weight * tf / (tf + length_norms[doc_id])
+
+    def _score_documents(self, doc_ids: Iterable[int], terms: List[str]) -> Dict[int, float]:
+        """Score documents, summing contributions in the same order as score()."""
+        contributions = []
+        for term in terms:
+            for field in self.fields.values():
+                idf = field.idf(term)
+                if idf is None:
+                    continue
+                term_weight = field.weight * idf * (field.k1 + 1)
+                for position, index in enumerate(field.indexes):
+                    postings = index.get_postings(term)
+                    if postings:
+                        contributions.append((term_weight, postings, field.length_norms(position)))
+
+        scores = {}
+        for doc_id in doc_ids:
+            score = 0.0
+            for term_weight, postings, length_norms in contributions:
+                tf = postings.get(doc_id)
+                if tf:
+                    score += term_weight * tf / (tf + length_norms[doc_id])
+            scores[doc_id] = score
+        return scores
+
+
+def top_scores(scores: Dict[int, float], top_k: int) -> Dict[int, float]:
+    """Keep the top_k highest scores, breaking ties by document id."""
+    # A bounded heap instead of sorting every score
+    return dict(heapq.nsmallest(top_k, scores.items(), key=lambda item: (-item[1], item[0])))
@@ -0,0 +1,136 @@
+"""Assembly of retrieved passages into a token-budgeted LLM context."""
+from typing import List
+from config import settings
+from models.schemas import SearchResult
+from services.token_counter import count_tokens, truncate_to_tokens
+
+# Shortest text shared by two chunks that counts as chunking overlap
+MIN_OVERLAP_CHARS = 40
+
+
+class PromptContext:
+    """Passages selected for a prompt, best first."""
+
+    def __init__(self, passages: List[SearchResult], token_count: int, budget: int, dropped: int = 0):
+        """
+        Initialize the context.
+
+        Args:
+            passages: Selected passages, possibly trimmed or truncated
+            token_count: Tokens the passages and their headings take up
+            budget: Token budget the passages were packed into
+            dropped: Retrieved passages left out as duplicates or for lack of room
+        """
+        self.passages = passages
+        self.token_count = token_count
+        self.budget = budget
+        self.dropped = dropped
+
+
+class ContextBuilder:
+    """
+    Packs retrieved passages into the token budget of a prompt.
+
+    Passages are considered best first. Duplicates and passages contained
+    in an already selected one are dropped, and text a passage shares with
+    a selected neighbouring chunk (the overlap judgments are chunked with)
+    is trimmed. A passage that does not fit is skipped so that lower ranked
+    passages that do fit can still be used; when not even the best passage
+    fits, it is truncated to the budget.
+    """
+
+    def __init__(self, max_tokens: int):
+        """
+        Initialize the builder.
+
+        Args:
+            max_tokens: Tokens available for the query and passages
+        """
+        self.max_tokens = max_tokens
+
+    def build(self, query: str, results: List[SearchResult]) -> PromptContext:
+        """
+        Select and trim passages for a prompt.
+
+        Args:
+            query: User query, which shares the budget
+            results: Retrieved passages, best first
+
+        Returns:
+            Prompt context
+        """
+        budget = max(0, self.max_tokens - count_tokens(query))
+        passages: List[SearchResult] = []
+        # Untrimmed texts of the selected passages; trimmed ones end mid-sentence
+        # and would match overlaps that are not there
+        selected_texts: List[str] = []
+        used = 0
+
+        for result in results:
+            content = result.content
+            if any(content in text for text in selected_texts):
+                continue
+            for text in selected_texts:
+                content = _trim_overlap(text, content)
+            if not content:
+                continue
+
+            # Token counts come from ingest unless the content was trimmed
+            if content == result.content and result.token_count is not None:
+                token_count = result.token_count
+            else:
+                token_count = count_tokens(content)
+            heading_tokens = count_tokens(_passage_heading(result))
+
+            if used + heading_tokens + token_count > budget:
+                if passages or budget <= heading_tokens:
+                    continue
+                content = truncate_to_tokens(content, budget - heading_tokens)
+                token_count = count_tokens(content)
+
+            selected_texts.append(result.content)
+            if content != result.content or token_count != result.token_count:
+                result = result.model_copy(update={"content": content, "token_count": token_count})
+            passages.append(result)
+            used += heading_tokens + token_count
+
+        return PromptContext(passages, used, budget, dropped=len(results) - len(passages))
+
+
+def _passage_heading(result: SearchResult) -> str:
+    """Citation line of a passage: its act and section, or the judgment title."""
+    metadata = result.metadata
+    if metadata.doc_type == "statute":
+        parts = [metadata.act_name, f"Section {metadata.section_id}" if metadata.section_id else None]
+    else:
+        parts = [metadata.title, metadata.court]
+    return " - ".join(part for part in parts if part) or result.id
+
+
+def _trim_overlap(selected: str, text: str) -> str:
+    """Remove the text a passage shares with the start or end of a selected one."""
+    if len(text) < MIN_OVERLAP_CHARS:
+        return text
+
+    # The passage starts where the selected one ends
+    head = text[:MIN_OVERLAP_CHARS]
+    position = selected.find(head)
+    while position != -1:
+        if text.startswith(selected[position:]):
+            return text[len(selected) - position:].strip()
+        position = selected.find(head, position + 1)
+
+    # The passage ends where the selected one starts
+    tail = text[-MIN_OVERLAP_CHARS:]
+    position = selected.find(tail)
+    while position != -1:
+        end = position + MIN_OVERLAP_CHARS
+        if text.endswith(selected[:end]):
+            return text[:len(text) - end].strip()
+        position = selected.find(tail, position + 1)
+
+    return text
+
+
+# Global context builder instance, leaving the rest of LLM_MAX_TOKENS to the answer
+context_builder = ContextBuilder(int(settings.llm_max_tokens * settings.context_budget_ratio))
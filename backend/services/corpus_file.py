@@ -0,0 +1,304 @@
+"""Binary corpus file format loaded through mmap."""
+from array import array
+from typing import Any, BinaryIO, Dict, List, Mapping, Optional, Sequence, Tuple
+import mmap
+import os
+import shutil
+import struct
+import sys
+import tempfile
+from collections import Counter
+import numpy as np
+from services.corpus_store import (
+    CorpusStore,
+    CorpusStoreBuilder,
+    MappedStringTable,
+    SortedStringTable,
+    STRING_COLUMNS,
+    FLAG_COLUMNS,
+    LIST_COLUMNS,
+    TEXT_FIELDS,
+)
+from services.inverted_index import INDEXED_FIELDS, tokenize
+
+
+# File layout (little-endian):
+#   header    magic, format version, embedding dim, chunk count, string count
+#   sections  (offset, length) of every section in SECTIONS order
+#   data      sections, each aligned to SECTION_ALIGNMENT bytes
+MAGIC = b"LGLCORP\x00"
+FORMAT_VERSION = 3
+HEADER = struct.Struct("<8sIIQQ")
+SECTION_ENTRY = struct.Struct("<QQ")
+SECTION_ALIGNMENT = 64
+
+# Section names and array typecodes; changing them requires a new FORMAT_VERSION
+SECTIONS: List[Tuple[str, str]] = (
+    [
+        ("text_offsets", "q"),
+        ("text", "B"),
+        ("string_offsets", "q"),
+        ("string_data", "B"),
+    ]
+    + [(f"column:{column}", "i") for column in STRING_COLUMNS]
+    + [(f"flag:{column}", "b") for column in FLAG_COLUMNS]
+    + [(f"list_offsets:{column}", "q") for column in LIST_COLUMNS]
+    + [(f"list_codes:{column}", "i") for column in LIST_COLUMNS]
+    + [("token_counts", "i"), ("embeddings", "f")]
+    # Postings of every indexed field in CSR layout: terms sorted by UTF-8
+    # bytes, the start of each term's run, then per posting the chunk and
+    # term frequency, and per chunk the number of tokens
+    + [
+        (f"postings:{field}:{part}", typecode)
+        for field in INDEXED_FIELDS
+        for part, typecode in (
+            ("term_offsets", "q"),
+            ("term_data", "B"),
+            ("offsets", "q"),
+            ("doc_ids", "i"),
+            ("tfs", "i"),
+            ("lengths", "i"),
+        )
+    ]
+)
+
+# NumPy dtypes of the postings arrays
+POSTINGS_DTYPES = {"offsets": "<i8", "doc_ids": "<i4", "tfs": "<i4", "lengths": "<i4"}
+
+
+class CorpusWriter(CorpusStoreBuilder):
+    """
+    Streaming writer for corpus files.
+
+    Texts and embeddings are spooled to temporary files as chunks are added,
+    so only the fixed-width metadata columns and postings are held in
+    memory. Chunks are tokenized as they are added and the postings are
+    sorted by term when the file is written, so loading the file needs no
+    tokenization. The file is written next to its final path and moved into
+    place atomically.
+    """
+
+    def __init__(self, path: str, embedding_dim: int = 0):
+        """
+        Initialize the writer.
+
+        Args:
+            path: Destination corpus file
+            embedding_dim: Dimension of per-chunk embeddings; 0 stores none
+        """
+        super().__init__(text_sink=tempfile.TemporaryFile())
+        self.path = path
+        self.embedding_dim = embedding_dim
+        self._embedding_sink = tempfile.TemporaryFile() if embedding_dim else None
+        # Per indexed field: term -> id in first-seen order, then per posting
+        # the term id, chunk and term frequency, and per chunk its length
+        self._terms: Dict[str, Dict[str, int]] = {field: {} for field in INDEXED_FIELDS}
+        self._postings: Dict[str, Dict[str, array]] = {
+            field: {"term_ids": array("i"), "doc_ids": array("i"), "tfs": array("i"), "lengths": array("i")}
+            for field in INDEXED_FIELDS
+        }
+
+    def add(self, record: Mapping[str, Any], embedding: Optional[Sequence[float]] = None) -> int:
+        """
+        Append a chunk.
+
+        Args:
+            record: Chunk shaped like LegalChunk/JudgmentChunk
+            embedding: Chunk embedding, required when embedding_dim is set
+
+        Returns:
+            Position of the chunk in the corpus
+        """
+        if self._embedding_sink is not None:
+            if embedding is None or len(embedding) != self.embedding_dim:
+                raise ValueError(f"Expected an embedding of dimension {self.embedding_dim}")
+            self._embedding_sink.write(np.asarray(embedding, dtype="<f4").tobytes())
+        doc_id = super().add(record)
+        for field, source in INDEXED_FIELDS.items():
+            text = record[source] if source in TEXT_FIELDS else record["metadata"].get(source) or ""
+            self._add_postings(field, doc_id, tokenize(text))
+        return doc_id
+
+    def _add_postings(self, field: str, doc_id: int, tokens: List[str]) -> None:
+        """Append the postings of one chunk's tokens in a field."""
+        terms = self._terms[field]
+        postings = self._postings[field]
+        for term, tf in Counter(tokens).items():
+            term_id = terms.setdefault(term, len(terms))
+            postings["term_ids"].append(term_id)
+            postings["doc_ids"].append(doc_id)
+            postings["tfs"].append(tf)
+        postings["lengths"].append(len(tokens))
+
+    def build(self) -> CorpusStore:
+        """Write the corpus file and open it."""
+        self.write()
+        return open_corpus(self.path)
+
+    def write(self) -> None:
+        """Write the corpus file and release the temporary files."""
+        strings = self._strings.strings
+        string_offsets = array("q", [0])
+        for value in strings:
+            string_offsets.append(string_offsets[-1] + len(value.encode("utf-8")))
+
+        sections: Dict[str, Any] = {
+            "text_offsets": self._text_offsets,
+            "text": self._text_sink,
+            "string_offsets": string_offsets,
+            "string_data": "".join(strings).encode("utf-8"),
+            "token_counts": self._token_counts,
+            "embeddings": self._embedding_sink,
+        }
+        for column in STRING_COLUMNS:
+            sections[f"column:{column}"] = self._string_columns[column]
+        for column in FLAG_COLUMNS:
+            sections[f"flag:{column}"] = self._flag_columns[column]
+        for column in LIST_COLUMNS:
+            sections[f"list_offsets:{column}"] = self._list_offsets[column]
+            sections[f"list_codes:{column}"] = self._list_codes[column]
+        for field in INDEXED_FIELDS:
+            for part, data in self._sorted_postings(field).items():
+                sections[f"postings:{field}:{part}"] = data
+
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "wb") as output:
+            output.write(HEADER.pack(MAGIC, FORMAT_VERSION, self.embedding_dim, len(self), len(strings)))
+            table_position = output.tell()
+            output.write(b"\0" * SECTION_ENTRY.size * len(SECTIONS))
+
+            entries = []
+            for name, _ in SECTIONS:
+                _pad(output)
+                start = output.tell()
+                _write_section(output, sections[name])
+                entries.append((start, output.tell() - start))
+
+            output.seek(table_position)
+            for start, length in entries:
+                output.write(SECTION_ENTRY.pack(start, length))
+        os.replace(temp_path, self.path)
+
+        self._text_sink.close()
+        if self._embedding_sink is not None:
+            self._embedding_sink.close()
+
+    def _sorted_postings(self, field: str) -> Dict[str, Any]:
+        """
+        Sort the postings of a field by term into CSR arrays.
+
+        Postings were appended in chunk order, so a stable sort by term keeps
+        every term's run sorted by chunk.
+
+        Args:
+            field: Indexed field
+
+        Returns:
+            Section part -> data
+        """
+        terms = sorted(self._terms[field], key=lambda term: term.encode("utf-8"))
+        ranks = np.empty(len(terms), dtype=np.int64)
+        ranks[[self._terms[field][term] for term in terms]] = np.arange(len(terms))
+
+        postings = self._postings[field]
+        term_ranks = ranks[np.frombuffer(postings["term_ids"], dtype=np.int32)]
+        order = np.argsort(term_ranks, kind="stable")
+        offsets = np.zeros(len(terms) + 1, dtype="<i8")
+        np.cumsum(np.bincount(term_ranks, minlength=len(terms)), out=offsets[1:])
+
+        term_offsets = array("q", [0])
+        for term in terms:
+            term_offsets.append(term_offsets[-1] + len(term.encode("utf-8")))
+        return {
+            "term_offsets": term_offsets,
+            "term_data": "".join(terms).encode("utf-8"),
+            "offsets": offsets,
+            "doc_ids": np.frombuffer(postings["doc_ids"], dtype=np.int32)[order].astype("<i4"),
+            "tfs": np.frombuffer(postings["tfs"], dtype=np.int32)[order].astype("<i4"),
+            "lengths": postings["lengths"],
+        }
+
+
+def open_corpus(path: str) -> CorpusStore:
+    """
+    Open a corpus file as a store backed by a read-only memory map.
+
+    Column accessors read straight from the mapped pages, so opening is
+    constant time and worker processes mapping the same file share memory.
+    The stored postings are exposed as arrays over the same pages in
+    store.postings.
+
+    Args:
+        path: Corpus file written by CorpusWriter
+
+    Returns:
+        Corpus store
+    """
+    if sys.byteorder != "little":
+        raise ValueError("Corpus files can only be mapped on little-endian hosts")
+
+    with open(path, "rb") as corpus_file:
+        mapped = mmap.mmap(corpus_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    buffer = memoryview(mapped)
+    magic, version, embedding_dim, chunk_count, _ = HEADER.unpack_from(buffer, 0)
+    if magic != MAGIC:
+        raise ValueError(f"Not a corpus file: {path}")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported corpus format version {version}: {path}")
+
+    sections = {}
+    for position, (name, typecode) in enumerate(SECTIONS):
+        start, length = SECTION_ENTRY.unpack_from(buffer, HEADER.size + position * SECTION_ENTRY.size)
+        sections[name] = buffer[start:start + length].cast(typecode)
+
+    embeddings = None
+    if embedding_dim:
+        embeddings = np.frombuffer(sections["embeddings"], dtype=np.float32).reshape(chunk_count, embedding_dim)
+
+    store = CorpusStore(
+        sections["text"],
+        sections["text_offsets"],
+        MappedStringTable(sections["string_offsets"], sections["string_data"]),
+        {column: sections[f"column:{column}"] for column in STRING_COLUMNS},
+        {column: sections[f"flag:{column}"] for column in FLAG_COLUMNS},
+        {column: sections[f"list_offsets:{column}"] for column in LIST_COLUMNS},
+        {column: sections[f"list_codes:{column}"] for column in LIST_COLUMNS},
+        sections["token_counts"],
+        embeddings=embeddings
+    )
+    store.mapping = mapped
+    store.postings = {
+        field: {
+            "terms": SortedStringTable(
+                sections[f"postings:{field}:term_offsets"],
+                sections[f"postings:{field}:term_data"]
+            ),
+            **{
+                part: np.frombuffer(sections[f"postings:{field}:{part}"], dtype=dtype)
+                for part, dtype in POSTINGS_DTYPES.items()
+            },
+        }
+        for field in INDEXED_FIELDS
+    }
+    return store
+
+
+def _pad(output: BinaryIO) -> None:
+    """Pad the output to the next section boundary."""
+    remainder = output.tell() % SECTION_ALIGNMENT
+    if remainder:
+        output.write(b"\0" * (SECTION_ALIGNMENT - remainder))
+
+
+def _write_section(output: BinaryIO, data: Any) -> None:
+    """Write an array, bytes or spooled temporary file."""
+    if data is None:
+        return
+    if isinstance(data, (bytes, bytearray, np.ndarray)):
+        output.write(data)
+    elif isinstance(data, array):
+        data.tofile(output)
+    else:
+        data.seek(0)
+        shutil.copyfileobj(data, output)
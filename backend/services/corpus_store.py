@@ -0,0 +1,367 @@
+"""Compact columnar store for corpus chunks."""
+from array import array
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Union
+import io
+import numpy as np
+from models.schemas import LegalChunk, JudgmentChunk, Metadata
+from services.token_counter import count_tokens
+
+
+# Text fields stored in the shared UTF-8 buffer, in per-chunk order
+TEXT_FIELDS = ("id", "text_for_embedding", "raw_content")
+
+# Optional string metadata stored as codes into an interned string table
+STRING_COLUMNS = (
+    "doc_type",
+    "act_name",
+    "section_id",
+    "chapter",
+    "category",
+    "chunk_type",
+    "title",
+    "court",
+    "case_type",
+    "outcome",
+    "doc_url",
+)
+
+# Optional boolean metadata stored as -1 (None), 0 or 1
+FLAG_COLUMNS = ("has_illustration", "has_proviso")
+
+# Optional list metadata stored as code ranges
+LIST_COLUMNS = ("acts_cited",)
+
+# Code for a missing value
+NULL = -1
+
+
+class StringTable:
+    """Interned strings addressed by integer codes."""
+
+    def __init__(self, strings: Optional[List[str]] = None):
+        """Initialize the table, optionally from existing strings."""
+        self.strings: List[str] = list(strings or [])
+        self._codes: Dict[str, int] = {value: code for code, value in enumerate(self.strings)}
+
+    def __len__(self) -> int:
+        """Number of distinct strings."""
+        return len(self.strings)
+
+    def intern(self, value: Optional[str]) -> int:
+        """Get the code of a string, adding it if new."""
+        if value is None:
+            return NULL
+        code = self._codes.get(value)
+        if code is None:
+            code = len(self.strings)
+            self.strings.append(value)
+            self._codes[value] = code
+        return code
+
+    def lookup(self, code: int) -> Optional[str]:
+        """Get the string of a code."""
+        return None if code == NULL else self.strings[code]
+
+
+class MappedStringTable:
+    """Read-only string table decoding strings from a shared buffer on access."""
+
+    def __init__(self, offsets: Sequence[int], data: memoryview):
+        """
+        Wrap a string table stored as offsets into a UTF-8 buffer.
+
+        Args:
+            offsets: Start offset of every string plus the final end offset
+            data: Concatenated UTF-8 strings
+        """
+        self._offsets = offsets
+        self._data = data
+
+    def __len__(self) -> int:
+        """Number of distinct strings."""
+        return len(self._offsets) - 1
+
+    def lookup(self, code: int) -> Optional[str]:
+        """Get the string of a code."""
+        if code == NULL:
+            return None
+        return str(self._data[self._offsets[code]:self._offsets[code + 1]], "utf-8")
+
+
+class SortedStringTable(MappedStringTable):
+    """Mapped string table sorted by UTF-8 bytes, looked up by binary search."""
+
+    def get(self, value: str, default: Optional[int] = None) -> Optional[int]:
+        """Get the code of a string, or default if absent."""
+        encoded = value.encode("utf-8")
+        low, high = 0, len(self)
+        while low < high:
+            middle = (low + high) // 2
+            if self._data[self._offsets[middle]:self._offsets[middle + 1]].tobytes() < encoded:
+                low = middle + 1
+            else:
+                high = middle
+        if low < len(self) and self._data[self._offsets[low]:self._offsets[low + 1]].tobytes() == encoded:
+            return low
+        return default
+
+
+class TextColumn(Sequence):
+    """Read-only sequence view decoding one text field on access."""
+
+    def __init__(self, store: "CorpusStore", field: str):
+        """Create a view over a text field of the store."""
+        self._store = store
+        self._field = field
+
+    def __len__(self) -> int:
+        """Number of chunks."""
+        return len(self._store)
+
+    def __getitem__(self, doc_id: int) -> str:
+        """Decode the field of one chunk."""
+        return self._store.get_text(doc_id, self._field)
+
+
+class CorpusStore:
+    """
+    Chunks stored column-wise instead of as one Pydantic model per chunk.
+
+    All texts live in a single UTF-8 buffer addressed by offsets, and
+    metadata lives in array-backed columns of interned string codes. Models
+    are only materialized for the chunks a request actually returns. The
+    columns may be arrays built in memory or views into a memory-mapped
+    corpus file (see services.corpus_file).
+    """
+
+    def __init__(
+        self,
+        text_buffer: Union[bytes, bytearray, memoryview],
+        text_offsets: Sequence[int],
+        strings: Union[StringTable, MappedStringTable],
+        string_columns: Dict[str, Sequence[int]],
+        flag_columns: Dict[str, Sequence[int]],
+        list_offsets: Dict[str, Sequence[int]],
+        list_codes: Dict[str, Sequence[int]],
+        token_counts: Sequence[int],
+        embeddings: Optional[Any] = None
+    ):
+        """
+        Wrap prebuilt columns; use CorpusStoreBuilder to create a store.
+
+        Args:
+            text_buffer: Concatenated UTF-8 texts
+            text_offsets: Start offsets of every text plus the final end offset
+            strings: Interned metadata strings
+            string_columns: Column name -> string codes per chunk
+            flag_columns: Column name -> -1/0/1 per chunk
+            list_offsets: Column name -> start of each chunk's codes plus end
+            list_codes: Column name -> concatenated string codes
+            token_counts: LLM token count of each chunk's raw content
+            embeddings: Optional precomputed (n, dim) float32 matrix
+        """
+        self._text_buffer = memoryview(text_buffer)
+        self._text_offsets = text_offsets
+        self.strings = strings
+        self._string_columns = string_columns
+        self._flag_columns = flag_columns
+        self._list_offsets = list_offsets
+        self._list_codes = list_codes
+        self._token_counts = token_counts
+        self.embeddings = embeddings
+        # Memory map backing the columns, if any, kept alive with the store
+        self.mapping: Optional[Any] = None
+        # Postings field -> arrays of the postings stored in a corpus file
+        self.postings: Optional[Dict[str, Dict[str, Any]]] = None
+        self._field_positions = {field: position for position, field in enumerate(TEXT_FIELDS)}
+        self._id_positions: Optional[Dict[str, int]] = None
+
+    def __len__(self) -> int:
+        """Number of chunks."""
+        return (len(self._text_offsets) - 1) // len(TEXT_FIELDS)
+
+    @classmethod
+    def from_records(cls, records: Iterable[Mapping[str, Any]], validate: bool = True) -> "CorpusStore":
+        """
+        Build a store from chunk dictionaries.
+
+        Args:
+            records: Chunks shaped like LegalChunk/JudgmentChunk
+            validate: Whether to validate each record against the schema
+
+        Returns:
+            Corpus store
+        """
+        builder = CorpusStoreBuilder()
+        for record in records:
+            builder.add(validate_record(record) if validate else record)
+        return builder.build()
+
+    # ------------------------------------------------------------------
+    # Column access
+    # ------------------------------------------------------------------
+
+    def get_text(self, doc_id: int, field: str) -> str:
+        """Decode a text field of a chunk."""
+        position = doc_id * len(TEXT_FIELDS) + self._field_positions[field]
+        start = self._text_offsets[position]
+        end = self._text_offsets[position + 1]
+        return str(self._text_buffer[start:end], "utf-8")
+
+    def get_id(self, doc_id: int) -> str:
+        """Get the string id of a chunk."""
+        return self.get_text(doc_id, "id")
+
+    def texts(self, field: str) -> TextColumn:
+        """Get a lazily decoded view over a text field."""
+        return TextColumn(self, field)
+
+    def get_code(self, doc_id: int, column: str) -> int:
+        """Get the interned string code of a metadata value."""
+        return self._string_columns[column][doc_id]
+
+    def get_value(self, doc_id: int, column: str) -> Optional[str]:
+        """Get a string metadata value of a chunk."""
+        return self.strings.lookup(self._string_columns[column][doc_id])
+
+    def code_groups(self, column: str) -> Dict[int, np.ndarray]:
+        """Get the sorted positions of the chunks holding each string code of a column."""
+        codes = np.asarray(self._string_columns[column], dtype=np.int32)
+        order = np.argsort(codes, kind="stable")
+        distinct, starts = np.unique(codes[order], return_index=True)
+        return dict(zip(distinct.tolist(), np.split(order, starts[1:])))
+
+    def get_flag(self, doc_id: int, column: str) -> Optional[bool]:
+        """Get a boolean metadata value of a chunk."""
+        flag = self._flag_columns[column][doc_id]
+        return None if flag == NULL else bool(flag)
+
+    def get_list(self, doc_id: int, column: str) -> Optional[List[str]]:
+        """Get a list metadata value of a chunk."""
+        offsets = self._list_offsets[column]
+        start, end = offsets[doc_id], offsets[doc_id + 1]
+        codes = self._list_codes[column][start:end]
+        # A single NULL code marks a missing list, as opposed to an empty one
+        if len(codes) == 1 and codes[0] == NULL:
+            return None
+        return [self.strings.lookup(code) for code in codes]
+
+    def get_token_count(self, doc_id: int) -> int:
+        """Get the LLM token count of a chunk's raw content, counted on ingest."""
+        return self._token_counts[doc_id]
+
+    def find(self, chunk_id: str) -> Optional[int]:
+        """Get the position of a chunk by its string id."""
+        if self._id_positions is None:
+            self._id_positions = {self.get_id(doc_id): doc_id for doc_id in range(len(self))}
+        return self._id_positions.get(chunk_id)
+
+    # ------------------------------------------------------------------
+    # Materialization
+    # ------------------------------------------------------------------
+
+    def get_metadata(self, doc_id: int) -> Metadata:
+        """Materialize the metadata model of a chunk."""
+        values: Dict[str, Any] = {column: self.get_value(doc_id, column) for column in STRING_COLUMNS}
+        values.update({column: self.get_flag(doc_id, column) for column in FLAG_COLUMNS})
+        values.update({column: self.get_list(doc_id, column) for column in LIST_COLUMNS})
+        # Stored records were validated on ingest
+        return Metadata.model_construct(**values)
+
+    def get_chunk(self, doc_id: int) -> Union[LegalChunk, JudgmentChunk]:
+        """Materialize the full model of a chunk."""
+        metadata = self.get_metadata(doc_id)
+        return _chunk_class(metadata.doc_type).model_construct(
+            id=self.get_id(doc_id),
+            text_for_embedding=self.get_text(doc_id, "text_for_embedding"),
+            raw_content=self.get_text(doc_id, "raw_content"),
+            metadata=metadata
+        )
+
+    def iter_chunks(self) -> Iterator[Union[LegalChunk, JudgmentChunk]]:
+        """Materialize every chunk one at a time."""
+        for doc_id in range(len(self)):
+            yield self.get_chunk(doc_id)
+
+
+class CorpusStoreBuilder:
+    """Append-only builder accumulating chunks into columns."""
+
+    def __init__(self, text_sink: Optional[BinaryIO] = None):
+        """
+        Initialize empty columns.
+
+        Args:
+            text_sink: Binary file receiving the text buffer; in memory by default
+        """
+        self._text_sink = text_sink if text_sink is not None else io.BytesIO()
+        self._text_size = 0
+        self._text_offsets = array("q", [0])
+        self._strings = StringTable()
+        self._string_columns = {column: array("i") for column in STRING_COLUMNS}
+        self._flag_columns = {column: array("b") for column in FLAG_COLUMNS}
+        self._list_offsets = {column: array("q", [0]) for column in LIST_COLUMNS}
+        self._list_codes = {column: array("i") for column in LIST_COLUMNS}
+        self._token_counts = array("i")
+
+    def __len__(self) -> int:
+        """Number of chunks added so far."""
+        return len(self._string_columns["doc_type"])
+
+    def add(self, record: Mapping[str, Any]) -> int:
+        """
+        Append a chunk.
+
+        Args:
+            record: Chunk shaped like LegalChunk/JudgmentChunk
+
+        Returns:
+            Position of the chunk in the store
+        """
+        doc_id = len(self)
+        metadata = record["metadata"]
+
+        for field in TEXT_FIELDS:
+            encoded = record[field].encode("utf-8")
+            self._text_sink.write(encoded)
+            self._text_size += len(encoded)
+            self._text_offsets.append(self._text_size)
+
+        for column in STRING_COLUMNS:
+            self._string_columns[column].append(self._strings.intern(metadata.get(column)))
+
+        for column in FLAG_COLUMNS:
+            value = metadata.get(column)
+            self._flag_columns[column].append(NULL if value is None else int(value))
+
+        for column in LIST_COLUMNS:
+            values = metadata.get(column)
+            codes = [NULL] if values is None else [self._strings.intern(value) for value in values]
+            self._list_codes[column].extend(codes)
+            self._list_offsets[column].append(len(self._list_codes[column]))
+
+        self._token_counts.append(count_tokens(record["raw_content"]))
+        return doc_id
+
+    def build(self) -> CorpusStore:
+        """Freeze the accumulated columns into a store."""
+        return CorpusStore(
+            self._text_sink.getvalue(),
+            self._text_offsets,
+            self._strings,
+            self._string_columns,
+            self._flag_columns,
+            self._list_offsets,
+            self._list_codes,
+            self._token_counts
+        )
+
+
+def validate_record(record: Mapping[str, Any]) -> Dict[str, Any]:
+    """Validate a chunk record against its schema and return it normalized."""
+    return _chunk_class(record["metadata"]["doc_type"])(**record).model_dump()
+
+
+def _chunk_class(doc_type: str):
+    """Get the model class for a document type."""
+    return JudgmentChunk if doc_type == "judgment" else LegalChunk
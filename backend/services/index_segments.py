@@ -0,0 +1,331 @@
+"""Immutable index segments and the snapshots searches run against."""
+from bisect import bisect_right
+from typing import Dict, FrozenSet, Hashable, List, Optional, Sequence, Set, Tuple, Union
+import numpy as np
+from models.schemas import SearchFilters
+from services.bm25 import BM25Scorer
+from services.cache import LRUCache
+from services.corpus_store import CorpusStore
+from services.inverted_index import INDEXED_FIELDS, InvertedIndex
+from services.metadata_index import MetadataIndex, FILTER_FIELDS
+from services.sparse_scoring import LowercasedTexts, SparsePostings, SparseScorer
+from services.vector_index import ExactVectorIndex, HashingEmbedder
+
+# Resolved filters kept per snapshot, each with a mask over the id space
+FILTER_CACHE_SIZE = 32
+
+
+class IndexSegment:
+    """
+    Indexes over one corpus store, never modified after construction.
+
+    Document ids are global: a segment's documents are numbered from its base
+    id, so postings from different segments never collide.
+    """
+
+    def __init__(
+        self,
+        store: CorpusStore,
+        base: int,
+        embedder: HashingEmbedder,
+        vector_index: Optional[ExactVectorIndex] = None,
+        sparse: bool = False
+    ):
+        """
+        Build the indexes of a segment.
+
+        Args:
+            store: Chunks of the segment
+            base: Global id of the segment's first document
+            embedder: Embedder for chunks without stored embeddings
+            vector_index: Empty vector index to build, or None to skip vectors
+            sparse: Whether to also flatten the postings for array scoring
+        """
+        self.store = store
+        self.base = base
+
+        # Metadata posting sets for resolving filters
+        self.metadata_index = MetadataIndex()
+        for field in FILTER_FIELDS:
+            for code, local_ids in store.code_groups(field).items():
+                self.metadata_index.add_documents(field, store.strings.lookup(code), (local_ids + base).tolist())
+
+        # Postings stored in a corpus file are mapped rather than rebuilt
+        indexes: Dict[str, Union[InvertedIndex, SparsePostings]]
+        if store.postings is not None:
+            indexes = {
+                field: SparsePostings(base=base, **store.postings[field])
+                for field in INDEXED_FIELDS
+            }
+        else:
+            indexes = {field: InvertedIndex() for field in INDEXED_FIELDS}
+            for local_id in range(len(store)):
+                doc_id = base + local_id
+                indexes["content"].add_document(doc_id, store.get_text(local_id, "raw_content"))
+                indexes["text_for_embedding"].add_document(doc_id, store.get_text(local_id, "text_for_embedding"))
+                indexes["act_name"].add_document(doc_id, store.get_value(local_id, "act_name") or "")
+                indexes["section_id"].add_document(doc_id, store.get_value(local_id, "section_id") or "")
+        self.content_index = indexes["content"]
+        self.embedding_text_index = indexes["text_for_embedding"]
+        # Act names and section ids, so queries naming them find the sections
+        self.act_name_index = indexes["act_name"]
+        self.section_id_index = indexes["section_id"]
+
+        # Flattened postings and section ids for the NumPy scoring path
+        self.sparse: Optional[Dict[str, SparsePostings]] = None
+        self.texts: Dict[str, LowercasedTexts] = {}
+        self.section_ids: Dict[str, np.ndarray] = {}
+        if sparse:
+            self.sparse = {
+                field: index if isinstance(index, SparsePostings) else SparsePostings.from_index(index, base)
+                for field, index in indexes.items()
+            }
+            self.texts = {
+                field: LowercasedTexts(store, field, base)
+                for field in ("raw_content", "text_for_embedding")
+            }
+            section_ids: Dict[str, List[np.ndarray]] = {}
+            for code, local_ids in store.code_groups("section_id").items():
+                section_id = store.strings.lookup(code)
+                if section_id:
+                    section_ids.setdefault(section_id.lower(), []).append(local_ids + base)
+            self.section_ids = {
+                section_id: np.sort(np.concatenate(doc_ids)).astype(np.int64)
+                for section_id, doc_ids in section_ids.items()
+            }
+
+        # Vector index rows are local ids
+        self.vector_index = vector_index
+        if vector_index is not None:
+            # Reuse embeddings stored in a corpus file instead of recomputing them
+            vectors = store.embeddings
+            if vectors is None or vectors.shape[1] != vector_index.dim:
+                vectors = embedder.embed_batch(store.texts("text_for_embedding"))
+            vector_index.build(vectors)
+
+    def __len__(self) -> int:
+        """Number of documents in the segment, including deleted ones."""
+        return len(self.store)
+
+    @property
+    def end(self) -> int:
+        """Global id following the segment's last document."""
+        return self.base + len(self.store)
+
+    def candidates(self, terms: List[str]) -> Set[int]:
+        """Get ids of documents sharing at least one term with the query."""
+        candidates = self.content_index.candidates(terms)
+        candidates |= self.embedding_text_index.candidates(terms)
+        candidates |= self.act_name_index.candidates(terms)
+        candidates |= self.section_id_index.candidates(terms)
+        return candidates
+
+
+class IndexSnapshot:
+    """
+    Consistent, read-only view of the index: segments plus deleted ids.
+
+    Updates build a new snapshot and swap it in; searches keep using the
+    snapshot they started with, so they never see a half-applied update.
+    """
+
+    def __init__(
+        self,
+        segments: Sequence[IndexSegment],
+        deleted: FrozenSet[int] = frozenset(),
+        generation: int = 0
+    ):
+        """
+        Create a snapshot.
+
+        Args:
+            segments: Segments ordered by base id, the base corpus first
+            deleted: Global ids of deleted or replaced documents
+            generation: Number of updates applied since startup
+        """
+        self.segments: Tuple[IndexSegment, ...] = tuple(segments)
+        self.deleted = deleted
+        self.generation = generation
+        self._bases = [segment.base for segment in self.segments]
+        # filter key -> (allowed ids, mask of allowed live documents)
+        self._filter_cache = LRUCache(max_size=FILTER_CACHE_SIZE, ttl_seconds=float("inf"))
+
+        # BM25 collection statistics span every segment
+        self.bm25 = BM25Scorer()
+        self.bm25.add_field("content", [segment.content_index for segment in self.segments], weight=1.0)
+        self.bm25.add_field("text_for_embedding", [segment.embedding_text_index for segment in self.segments], weight=0.5)
+        self.bm25.add_field("section_id", [segment.section_id_index for segment in self.segments], weight=1.0)
+
+        # Array scoring needs the flattened postings of every segment
+        self.sparse: Optional[SparseScorer] = None
+        if self.segments and all(segment.sparse is not None for segment in self.segments):
+            section_ids: Dict[str, List[np.ndarray]] = {}
+            for segment in self.segments:
+                for section_id, doc_ids in segment.section_ids.items():
+                    section_ids.setdefault(section_id, []).append(doc_ids)
+            self.sparse = SparseScorer(
+                self.bm25,
+                {
+                    field: [segment.sparse[field] for segment in self.segments]
+                    for field in self.segments[0].sparse
+                },
+                {
+                    field: [segment.texts[field] for segment in self.segments]
+                    for field in self.segments[0].texts
+                },
+                {
+                    section_id: np.concatenate(doc_ids)
+                    for section_id, doc_ids in section_ids.items()
+                },
+                self.next_id
+            )
+
+    def __len__(self) -> int:
+        """Number of live documents."""
+        return sum(len(segment) for segment in self.segments) - len(self.deleted)
+
+    @property
+    def next_id(self) -> int:
+        """Global id of the next document to be added."""
+        return self.segments[-1].end if self.segments else 0
+
+    def locate(self, doc_id: int) -> Tuple[IndexSegment, int]:
+        """Get the segment holding a document and its local id there."""
+        segment = self.segments[bisect_right(self._bases, doc_id) - 1]
+        return segment, doc_id - segment.base
+
+    def find(self, chunk_id: str) -> Optional[int]:
+        """Get the global id of a live chunk by its string id."""
+        # Newer segments hold the latest version of a chunk
+        for segment in reversed(self.segments):
+            local_id = segment.store.find(chunk_id)
+            if local_id is not None and segment.base + local_id not in self.deleted:
+                return segment.base + local_id
+        return None
+
+    def candidates(self, terms: List[str]) -> Set[int]:
+        """Get ids of live documents sharing at least one term with the query."""
+        candidates: Set[int] = set()
+        for segment in self.segments:
+            candidates |= segment.candidates(terms)
+        return candidates - self.deleted if self.deleted else candidates
+
+    def resolve(self, filters: Optional[SearchFilters]) -> Optional[FrozenSet[int]]:
+        """Resolve filters to the live documents satisfying all of them."""
+        allowed: Optional[Set[int]] = None
+        for segment in self.segments:
+            matched = segment.metadata_index.resolve(filters)
+            if matched is None:
+                return None
+            allowed = set(matched) if allowed is None else allowed | matched
+        return frozenset((allowed or set()) - self.deleted)
+
+    def resolve_cached(
+        self,
+        filter_key: Hashable,
+        filters: Optional[SearchFilters]
+    ) -> Tuple[Optional[FrozenSet[int]], Optional[np.ndarray]]:
+        """
+        Resolve filters once per snapshot, along with a mask of the live documents they allow.
+
+        Args:
+            filter_key: Normalized, hashable form of the filters
+            filters: Filters to resolve
+
+        Returns:
+            Allowed ids (None for all), and a boolean mask over the id space
+            of the allowed live documents (None when every id is allowed)
+        """
+        cached = self._filter_cache.get(filter_key)
+        if cached is None:
+            allowed = self.resolve(filters)
+            mask = self.mask(allowed)
+            if mask is not None:
+                # Shared by concurrent searches
+                mask.flags.writeable = False
+            cached = (allowed, mask)
+            self._filter_cache.set(filter_key, cached)
+        return cached
+
+    def mask(self, allowed_ids: Optional[FrozenSet[int]]) -> Optional[np.ndarray]:
+        """Build a boolean mask of allowed live documents, or None for all."""
+        if allowed_ids is None and not self.deleted:
+            return None
+        if allowed_ids is None:
+            mask = np.ones(self.next_id, dtype=bool)
+            mask[np.fromiter(self.deleted, dtype=np.int64, count=len(self.deleted))] = False
+        else:
+            mask = np.zeros(self.next_id, dtype=bool)
+            mask[np.fromiter(allowed_ids, dtype=np.int64, count=len(allowed_ids))] = True
+        return mask
+
+    def deleted_in(self, segment: IndexSegment) -> int:
+        """Count deleted documents of a segment."""
+        return sum(1 for doc_id in self.deleted if segment.base <= doc_id < segment.end)
+
+    def vector_search(
+        self,
+        query: np.ndarray,
+        top_k: int,
+        allowed_mask: Optional[np.ndarray] = None
+    ) -> List[Tuple[int, float]]:
+        """
+        Get the nearest live documents across every segment.
+
+        Args:
+            query: L2-normalized query vector
+            top_k: Number of neighbours
+            allowed_mask: Optional mask from mask() to restrict the search to
+
+        Returns:
+            (global id, similarity) pairs, most similar first
+        """
+        return self.vector_search_batch(query[np.newaxis, :], top_k, allowed_mask)[0]
+
+    def vector_search_batch(
+        self,
+        queries: np.ndarray,
+        top_k: int,
+        allowed_mask: Optional[np.ndarray] = None
+    ) -> List[List[Tuple[int, float]]]:
+        """
+        Get the nearest live documents of several queries sharing one filter.
+
+        Each segment is searched once for the whole batch, so exact search
+        is one matrix product per segment.
+
+        Args:
+            queries: L2-normalized query matrix of shape (q, dim)
+            top_k: Number of neighbours per query
+            allowed_mask: Optional mask from mask() to restrict the search to
+
+        Returns:
+            Per query, (global id, similarity) pairs, most similar first
+        """
+        neighbours: List[List[Tuple[int, float]]] = [[] for _ in range(len(queries))]
+
+        for segment in self.segments:
+            if segment.vector_index is None:
+                continue
+
+            if allowed_mask is not None:
+                # A view of the segment's rows, not a copy
+                rows = allowed_mask[segment.base:segment.end]
+                if not rows.any():
+                    continue
+                batch_hits = segment.vector_index.search_batch(queries, top_k, allowed_mask=rows)
+            else:
+                # Over-fetch by the number of deleted rows, then drop them
+                batch_hits = segment.vector_index.search_batch(queries, top_k + self.deleted_in(segment))
+
+            for query_neighbours, hits in zip(neighbours, batch_hits):
+                query_neighbours.extend(
+                    (segment.base + row, similarity)
+                    for row, similarity in hits
+                    if segment.base + row not in self.deleted
+                )
+
+        for query_neighbours in neighbours:
+            query_neighbours.sort(key=lambda item: (-item[1], item[0]))
+            del query_neighbours[top_k:]
+        return neighbours
@@ -0,0 +1,446 @@
+"""Bulk ingestion of statutes and judgments into corpus files."""
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+import numpy as np
+from services.corpus_file import CorpusWriter
+from services.corpus_store import validate_record
+from services.vector_index import HashingEmbedder
+
+logger = logging.getLogger(__name__)
+
+
+# New section: "103. Murder.—Whoever ..." (see DESIGN.md, Chunking Rules)
+SECTION_PATTERN = re.compile(r"^(\d+[A-Z]?)\.\s+(.*)$")
+# Section title, ended by a full stop and/or dash before the body
+SECTION_TITLE_PATTERN = re.compile(r"^(.+?)(?:\.\s*[—–-]+|\.\s+|—)\s*(.*)$")
+CHAPTER_PATTERN = re.compile(r"^CHAPTER\s+([IVXLC]+[A-Z]?)\b[\s.:—–-]*(.*)$", re.IGNORECASE)
+ILLUSTRATION_PATTERN = re.compile(r"\b(?:Illustrations?|Explanation)\b")
+PROVISO_PATTERN = re.compile(r"\bProvided\s+(?:further\s+|also\s+)?that\b", re.IGNORECASE)
+
+PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+")
+
+# Outcome keywords searched in the closing text of a judgment, most specific first
+OUTCOME_PATTERNS: List[Tuple[re.Pattern, str]] = [
+    (re.compile(r"partly allowed|partially allowed|allowed in part", re.IGNORECASE), "Partially Allowed"),
+    (re.compile(r"\bdismissed\b", re.IGNORECASE), "Dismissed"),
+    (re.compile(r"\ballowed\b|\bquashed\b|set aside", re.IGNORECASE), "Allowed"),
+]
+OUTCOME_WINDOW = 500
+
+# Runs of characters replaced by one underscore in chunk id prefixes
+ID_SEPARATOR_PATTERN = re.compile(r"[^A-Za-z0-9]+")
+
+
+def iter_documents(paths: Iterable[str], default_doc_type: str = "statute") -> Iterator[Dict[str, Any]]:
+    """
+    Stream source documents from JSONL and text files.
+
+    JSONL lines are documents; a text file is one document named after the
+    file. Directories are walked recursively in sorted order.
+
+    Args:
+        paths: Files or directories
+        default_doc_type: Document type of text files
+
+    Yields:
+        Source documents with a doc_type
+    """
+    for path in paths:
+        if os.path.isdir(path):
+            children = sorted(
+                os.path.join(root, name)
+                for root, _, names in os.walk(path)
+                for name in names
+                if name.endswith((".jsonl", ".txt"))
+            )
+            yield from iter_documents(children, default_doc_type)
+        elif path.endswith(".jsonl"):
+            with open(path, encoding="utf-8") as source:
+                for line in source:
+                    if line.strip():
+                        document = json.loads(line)
+                        document.setdefault("doc_type", _infer_doc_type(document))
+                        yield document
+        else:
+            with open(path, encoding="utf-8") as source:
+                name = os.path.splitext(os.path.basename(path))[0]
+                name_field = "title" if default_doc_type == "judgment" else "act_name"
+                yield {"doc_type": default_doc_type, name_field: name, "text": source.read()}
+
+
+def chunk_document(
+    document: Dict[str, Any],
+    chunk_size: int = 1000,
+    chunk_overlap: int = 200
+) -> List[Dict[str, Any]]:
+    """
+    Chunk a source document into LegalChunk/JudgmentChunk records.
+
+    Args:
+        document: Statute or judgment with its full text
+        chunk_size: Maximum judgment chunk size in characters
+        chunk_overlap: Characters repeated between judgment chunks
+
+    Returns:
+        Chunk records
+    """
+    if document["doc_type"] == "judgment":
+        return chunk_judgment(document, chunk_size, chunk_overlap)
+    return chunk_statute(document)
+
+
+def chunk_statute(document: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Split an act into one chunk per section.
+
+    Lines before the first section are skipped; Illustrations, Explanations
+    and provisos stay attached to the section they follow.
+
+    Args:
+        document: Act with act_name, text and optional short_name, category, doc_url
+
+    Returns:
+        Chunk records
+    """
+    act_name = document["act_name"]
+    short_name = document.get("short_name") or _short_name(act_name)
+    chapter_id: Optional[str] = None
+    chapter: Optional[str] = None
+    awaiting_chapter_title = False
+
+    records = []
+    section_lines: List[str] = []
+
+    def flush_section() -> None:
+        if section_lines:
+            records.append(_section_record(document, act_name, short_name, chapter_id, chapter, section_lines))
+            section_lines.clear()
+
+    for line in document["text"].splitlines():
+        line = line.strip()
+        if not line:
+            continue
+
+        chapter_match = CHAPTER_PATTERN.match(line)
+        if chapter_match:
+            flush_section()
+            chapter_id = chapter_match.group(1).upper()
+            title = chapter_match.group(2)
+            chapter = f"{chapter_id} - {_title_case(title)}" if title else chapter_id
+            awaiting_chapter_title = not title
+            continue
+
+        # Chapter titles are often printed on the line after "CHAPTER VI"
+        if awaiting_chapter_title and not SECTION_PATTERN.match(line):
+            chapter = f"{chapter_id} - {_title_case(line)}"
+            awaiting_chapter_title = False
+            continue
+        awaiting_chapter_title = False
+
+        if SECTION_PATTERN.match(line):
+            flush_section()
+            section_lines.append(line)
+        elif section_lines:
+            section_lines.append(line)
+
+    flush_section()
+    return records
+
+
+def chunk_judgment(
+    document: Dict[str, Any],
+    chunk_size: int = 1000,
+    chunk_overlap: int = 200
+) -> List[Dict[str, Any]]:
+    """
+    Split a judgment into overlapping paragraph-aligned chunks.
+
+    Args:
+        document: Judgment with title, text and optional id, court, case_type,
+            outcome, acts_cited, doc_url
+        chunk_size: Maximum chunk size in characters
+        chunk_overlap: Characters repeated at the start of the next chunk
+
+    Returns:
+        Chunk records
+    """
+    text = document["text"]
+    title = document["title"]
+    base_id = document.get("id") or "judgment_" + hashlib.sha1(
+        f"{title}|{document.get('doc_url', '')}".encode("utf-8")
+    ).hexdigest()[:12]
+
+    metadata = {
+        "doc_type": "judgment",
+        "title": title,
+        "court": document.get("court"),
+        "case_type": document.get("case_type"),
+        "category": document.get("category"),
+        "outcome": document.get("outcome") or extract_outcome(text),
+        "acts_cited": document.get("acts_cited"),
+        "doc_url": document.get("doc_url"),
+    }
+
+    return [
+        {
+            "id": f"{base_id}_p{position}",
+            "text_for_embedding": f"{title} - {chunk}",
+            "raw_content": chunk,
+            "metadata": dict(metadata),
+        }
+        for position, chunk in enumerate(split_text(text, chunk_size, chunk_overlap), start=1)
+    ]
+
+
+def split_text(text: str, chunk_size: int = 1000, chunk_overlap: int = 200) -> List[str]:
+    """
+    Split text on paragraphs, then sentences, then characters, and merge the
+    pieces into chunks of at most chunk_size characters.
+
+    Args:
+        text: Text to split
+        chunk_size: Maximum chunk size in characters
+        chunk_overlap: Characters repeated at the start of the next chunk
+
+    Returns:
+        Chunks with normalized whitespace
+    """
+    pieces = []
+    for paragraph in PARAGRAPH_BREAK.split(text):
+        paragraph = " ".join(paragraph.split())
+        if len(paragraph) <= chunk_size:
+            if paragraph:
+                pieces.append(paragraph)
+            continue
+        for sentence in SENTENCE_BOUNDARY.split(paragraph):
+            while len(sentence) > chunk_size:
+                pieces.append(sentence[:chunk_size])
+                sentence = sentence[chunk_size:]
+            if sentence:
+                pieces.append(sentence)
+
+    chunks = []
+    current = ""
+    for piece in pieces:
+        if current and len(current) + 1 + len(piece) > chunk_size:
+            chunks.append(current)
+            # Repeat the end of the previous chunk, starting on a word boundary
+            overlap_size = min(chunk_overlap, chunk_size - len(piece) - 1)
+            overlap = current[-overlap_size:] if overlap_size > 0 else ""
+            if " " in overlap:
+                overlap = overlap[overlap.index(" ") + 1:]
+            current = f"{overlap} {piece}" if overlap else piece
+        else:
+            current = f"{current} {piece}" if current else piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def extract_outcome(text: str) -> Optional[str]:
+    """Guess a judgment's outcome from keywords in its closing text."""
+    closing = text[-OUTCOME_WINDOW:]
+    for pattern, outcome in OUTCOME_PATTERNS:
+        if pattern.search(closing):
+            return outcome
+    return None
+
+
+def statute_id_prefix(act_name: str) -> str:
+    """
+    Build the chunk id prefix of an act from its full name.
+
+    Short names collide ("Code of Criminal Procedure, 1973" and "Code of
+    Civil Procedure, 1908" are both CCP), so ids keep the whole name and year.
+    """
+    return ID_SEPARATOR_PATTERN.sub("_", act_name).strip("_")
+
+
+def ingest(
+    paths: Iterable[str],
+    output: str,
+    workers: int = 0,
+    batch_size: int = 64,
+    chunk_size: int = 1000,
+    chunk_overlap: int = 200,
+    embedding_dim: int = 512,
+    default_doc_type: str = "statute"
+) -> Dict[str, Any]:
+    """
+    Stream documents through chunking and embedding into a corpus file.
+
+    Batches of documents are chunked, validated and embedded in a process
+    pool while the parent appends results to the corpus writer in input
+    order. At most two batches per worker are in flight, so the documents
+    and chunks awaiting the writer are bounded. The writer spools texts and
+    embeddings to disk, but its metadata columns and postings, and the ids
+    checked for duplicates, stay in memory and grow with the corpus.
+
+    Args:
+        paths: Source files or directories
+        output: Destination corpus file
+        workers: Worker processes; 0 uses every CPU, 1 runs in-process
+        batch_size: Documents per worker task
+        chunk_size: Maximum judgment chunk size in characters
+        chunk_overlap: Characters repeated between judgment chunks
+        embedding_dim: Dimension of stored embeddings; 0 stores none
+        default_doc_type: Document type of text files
+
+    Returns:
+        Ingestion statistics
+
+    Raises:
+        ValueError: If two source documents produce the same chunk id
+    """
+    start_time = time.time()
+    workers = workers or os.cpu_count() or 1
+    writer = CorpusWriter(output, embedding_dim=embedding_dim)
+    stats = {"documents": 0, "chunks": 0, "duplicates": 0}
+    # chunk id -> number of the source document it came from
+    seen_ids: Dict[str, int] = {}
+
+    def write_batch(result: Tuple[int, List[Dict[str, Any]], List[int], Optional[np.ndarray]]) -> None:
+        document_count, records, sources, vectors = result
+        for position, record in enumerate(records):
+            document_number = stats["documents"] + sources[position]
+            first_number = seen_ids.get(record["id"])
+            if first_number is not None:
+                if first_number != document_number:
+                    raise ValueError(
+                        f"Chunk id {record['id']!r} of source document {document_number + 1} "
+                        f"was already produced by source document {first_number + 1}"
+                    )
+                # A document repeating a section number keeps its first occurrence
+                stats["duplicates"] += 1
+                continue
+            seen_ids[record["id"]] = document_number
+            writer.add(record, None if vectors is None else vectors[position])
+            stats["chunks"] += 1
+        stats["documents"] += document_count
+
+    batches = _batched(iter_documents(paths, default_doc_type), batch_size)
+    task_args = (chunk_size, chunk_overlap, embedding_dim)
+
+    if workers == 1:
+        for batch in batches:
+            write_batch(_process_batch(batch, *task_args))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending: Deque[Future] = deque()
+            for batch in batches:
+                pending.append(executor.submit(_process_batch, batch, *task_args))
+                if len(pending) >= workers * 2:
+                    write_batch(pending.popleft().result())
+            while pending:
+                write_batch(pending.popleft().result())
+
+    writer.write()
+    stats["seconds"] = round(time.time() - start_time, 3)
+    logger.info(
+        f"Ingested {stats['documents']} documents into {stats['chunks']} chunks "
+        f"({stats['duplicates']} repeated sections skipped) in {stats['seconds']}s"
+    )
+    return stats
+
+
+def _process_batch(
+    documents: List[Dict[str, Any]],
+    chunk_size: int,
+    chunk_overlap: int,
+    embedding_dim: int
+) -> Tuple[int, List[Dict[str, Any]], List[int], Optional[np.ndarray]]:
+    """
+    Chunk, validate and embed a batch of documents in a worker process.
+
+    Returns:
+        Document count, chunk records, the position in the batch of each
+        record's source document, and the embeddings
+    """
+    records = []
+    sources = []
+    for position, document in enumerate(documents):
+        for record in chunk_document(document, chunk_size, chunk_overlap):
+            records.append(validate_record(record))
+            sources.append(position)
+    vectors = None
+    if embedding_dim:
+        vectors = HashingEmbedder(dim=embedding_dim).embed_batch(
+            [record["text_for_embedding"] for record in records]
+        )
+    return len(documents), records, sources, vectors
+
+
+def _batched(items: Iterator[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    """Group an iterator into lists of up to size items."""
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _section_record(
+    document: Dict[str, Any],
+    act_name: str,
+    short_name: str,
+    chapter_id: Optional[str],
+    chapter: Optional[str],
+    lines: List[str]
+) -> Dict[str, Any]:
+    """Build the chunk record of one section."""
+    raw_content = " ".join(lines)
+    section_id, rest = SECTION_PATTERN.match(lines[0]).groups()
+    title_match = SECTION_TITLE_PATTERN.match(rest)
+    title, body = title_match.groups() if title_match else (rest, "")
+    body = " ".join([body] + lines[1:]).strip()
+
+    # [Act] > [Chapter] > [Section ID + Title] : [Content]
+    breadcrumb = [f"[{short_name}]"]
+    if chapter_id:
+        breadcrumb.append(f"Chapter {chapter_id}")
+    breadcrumb.append(f"Section {section_id} - {title.strip()}")
+
+    return {
+        "id": f"{statute_id_prefix(act_name)}_Sec_{section_id}",
+        "text_for_embedding": f"{' > '.join(breadcrumb)} : {body}",
+        "raw_content": raw_content,
+        "metadata": {
+            "doc_type": "statute",
+            "act_name": act_name,
+            "category": document.get("category"),
+            "chapter": chapter,
+            "section_id": section_id,
+            "chunk_type": "Section",
+            "has_illustration": bool(ILLUSTRATION_PATTERN.search(raw_content)),
+            "has_proviso": bool(PROVISO_PATTERN.search(raw_content)),
+            "doc_url": document.get("doc_url"),
+        },
+    }
+
+
+def _infer_doc_type(document: Dict[str, Any]) -> str:
+    """Treat documents naming an act as statutes and everything else as judgments."""
+    return "statute" if "act_name" in document else "judgment"
+
+
+def _short_name(act_name: str) -> str:
+    """Abbreviate an act name to the initials of its capitalized words."""
+    name = act_name.split(",")[0]
+    initials = "".join(word[0] for word in name.split() if word[:1].isupper())
+    return initials or name
+
+
+def _title_case(title: str) -> str:
+    """Title-case chapter headings printed in capitals."""
+    return title.title() if title.isupper() else title
@@ -0,0 +1,82 @@
+"""Tokenized inverted index for lexical retrieval."""
+from typing import Dict, Iterable, List, Set
+import re
+
+
+# Legal text tokens are words and section numbers (e.g. "138", "482")
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Postings fields of every chunk -> text field or metadata column they index
+INDEXED_FIELDS: Dict[str, str] = {
+    "content": "raw_content",
+    "text_for_embedding": "text_for_embedding",
+    "act_name": "act_name",
+    "section_id": "section_id",
+}
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase text and split it into alphanumeric tokens."""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class InvertedIndex:
+    """Postings lists mapping each term to the documents that contain it."""
+
+    def __init__(self):
+        """Initialize an empty index."""
+        # term -> {doc_id: term frequency}
+        self.postings: Dict[str, Dict[int, int]] = {}
+        # doc_id -> number of tokens in the document
+        self.doc_lengths: Dict[int, int] = {}
+        self.total_length = 0
+
+    @property
+    def doc_count(self) -> int:
+        """Number of indexed documents."""
+        return len(self.doc_lengths)
+
+    def add_document(self, doc_id: int, text: str) -> None:
+        """
+        Tokenize a document and add it to the postings lists.
+
+        Args:
+            doc_id: Integer document identifier
+            text: Document text
+        """
+        tokens = tokenize(text)
+        self.doc_lengths[doc_id] = len(tokens)
+        self.total_length += len(tokens)
+
+        for token in tokens:
+            doc_freqs = self.postings.setdefault(token, {})
+            doc_freqs[doc_id] = doc_freqs.get(doc_id, 0) + 1
+
+    def get_postings(self, term: str) -> Dict[int, int]:
+        """Get the postings list of a term (empty if unknown)."""
+        return self.postings.get(term, {})
+
+    def doc_freq(self, term: str) -> int:
+        """Get the number of documents containing a term."""
+        return len(self.postings.get(term, {}))
+
+    def contains(self, doc_id: int, term: str) -> bool:
+        """Check whether a document contains a term."""
+        return doc_id in self.postings.get(term, {})
+
+    def candidates(self, terms: Iterable[str]) -> Set[int]:
+        """
+        Collect documents sharing at least one term with the query.
+
+        Args:
+            terms: Query terms
+
+        Returns:
+            Set of matching document ids
+        """
+        matched: Set[int] = set()
+        for term in terms:
+            doc_freqs = self.postings.get(term)
+            if doc_freqs:
+                matched.update(doc_freqs)
+        return matched
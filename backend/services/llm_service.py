@@ -0,0 +1,120 @@
+"""Async LLM service interface."""
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, List
+import asyncio
+import functools
+from models.schemas import SourceReference
+from services.context_builder import PromptContext
+
+
+class LLMService(ABC):
+    """Interface for chat generation backends awaited from async routes."""
+
+    @abstractmethod
+    async def generate(
+        self,
+        query: str,
+        session_id: str,
+        context: PromptContext,
+        use_cache: bool = True
+    ) -> tuple[str, List[SourceReference]]:
+        """
+        Generate a chat response without blocking the event loop.
+
+        Args:
+            query: User query
+            session_id: Session identifier
+            context: Passages selected for the prompt
+            use_cache: Whether a cached answer may be returned
+
+        Returns:
+            Tuple of (answer, sources)
+        """
+
+    async def stream(
+        self,
+        query: str,
+        session_id: str,
+        context: PromptContext,
+        use_cache: bool = True
+    ) -> AsyncIterator[str]:
+        """
+        Stream a chat response incrementally.
+
+        Backends without native streaming yield the full answer at once.
+
+        Args:
+            query: User query
+            session_id: Session identifier
+            context: Passages selected for the prompt
+            use_cache: Whether a cached answer may be returned
+
+        Yields:
+            Answer text fragments
+        """
+        answer, _ = await self.generate(query, session_id, context, use_cache)
+        yield answer
+
+    @abstractmethod
+    def create_sources(self, context: PromptContext) -> List[SourceReference]:
+        """Create source references for the passages of a prompt."""
+
+    async def close(self) -> None:
+        """Release resources held by the service."""
+
+
+class SyncLLMService(LLMService):
+    """
+    Adapter offloading a blocking backend to a bounded thread pool.
+
+    Backends built on a blocking client SDK subclass it and implement
+    generate_chat_response; size the pool to the concurrency the provider
+    allows.
+    """
+
+    def __init__(self, max_workers: int = 4):
+        """
+        Initialize the thread pool.
+
+        Args:
+            max_workers: Maximum number of concurrent blocking generations
+        """
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="llm"
+        )
+
+    @abstractmethod
+    def generate_chat_response(
+        self,
+        query: str,
+        session_id: str,
+        context: PromptContext,
+        use_cache: bool = True
+    ) -> tuple[str, List[SourceReference]]:
+        """Generate a chat response, blocking the calling thread."""
+
+    async def generate(
+        self,
+        query: str,
+        session_id: str,
+        context: PromptContext,
+        use_cache: bool = True
+    ) -> tuple[str, List[SourceReference]]:
+        """Run the blocking backend in the thread pool and await it."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor,
+            functools.partial(
+                self.generate_chat_response,
+                query=query,
+                session_id=session_id,
+                context=context,
+                use_cache=use_cache
+            )
+        )
+
+    async def close(self) -> None:
+        """Shut down the thread pool."""
+        self._executor.shutdown(wait=False)
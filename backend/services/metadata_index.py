@@ -0,0 +1,91 @@
+"""Precomputed metadata posting sets for resolving search filters."""
+from typing import Dict, FrozenSet, Iterable, List, Mapping, Optional, Set
+from models.schemas import SearchFilters
+
+
+# Metadata fields that SearchFilters can restrict on
+FILTER_FIELDS = ("doc_type", "act_name", "category", "court", "case_type")
+
+
+class MetadataIndex:
+    """Per-field posting sets mapping metadata values to document ids."""
+
+    def __init__(self):
+        """Initialize empty posting sets for every filterable field."""
+        # field -> lowercased value -> doc ids
+        self.postings: Dict[str, Dict[str, Set[int]]] = {
+            field: {} for field in FILTER_FIELDS
+        }
+
+    def add_document(self, doc_id: int, values: Mapping[str, Optional[str]]) -> None:
+        """
+        Add a document's metadata values to the posting sets.
+
+        Args:
+            doc_id: Integer document identifier
+            values: Metadata value of each filterable field
+        """
+        for field in FILTER_FIELDS:
+            value = values.get(field)
+            if value:
+                self.postings[field].setdefault(value.lower(), set()).add(doc_id)
+
+    def add_documents(self, field: str, value: Optional[str], doc_ids: Iterable[int]) -> None:
+        """
+        Add documents sharing one metadata value to the posting sets.
+
+        Args:
+            field: Filterable field
+            value: Metadata value of the documents
+            doc_ids: Integer document identifiers
+        """
+        if value:
+            self.postings[field].setdefault(value.lower(), set()).update(doc_ids)
+
+    def _match_field(self, field: str, needle: str) -> Set[int]:
+        """Union the postings of all values of a field matching the filter."""
+        values = self.postings[field]
+        needle = needle.lower()
+
+        # doc_type is an enum and matches exactly
+        if field == "doc_type":
+            return values.get(needle, set())
+
+        # Other fields match by case-insensitive substring, resolved against
+        # the distinct values rather than every document
+        matched: Set[int] = set()
+        for value, doc_ids in values.items():
+            if needle in value:
+                matched |= doc_ids
+        return matched
+
+    def resolve(self, filters: Optional[SearchFilters]) -> Optional[FrozenSet[int]]:
+        """
+        Resolve filters to the set of documents satisfying all of them.
+
+        Args:
+            filters: Optional search filters
+
+        Returns:
+            Frozen set of matching document ids, or None when nothing is filtered
+        """
+        if not filters:
+            return None
+
+        matches: List[Set[int]] = []
+        for field in FILTER_FIELDS:
+            needle = getattr(filters, field)
+            if needle:
+                matches.append(self._match_field(field, needle))
+
+        if not matches:
+            return None
+
+        # Intersect starting from the most selective field
+        matches.sort(key=len)
+        allowed = set(matches[0])
+        for doc_ids in matches[1:]:
+            if not allowed:
+                break
+            allowed &= doc_ids
+        return frozenset(allowed)
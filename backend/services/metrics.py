@@ -0,0 +1,138 @@
+"""Latency histograms rendered in the Prometheus text exposition format."""
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Sequence, Tuple
+import bisect
+import threading
+import time
+from config import settings
+
+
+# Upper bounds in seconds, from sub-millisecond stages to slow LLM calls
+DEFAULT_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+    0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+# Pipeline stage timings, labelled by stage
+STAGE_METRIC = "legal_assistant_stage_duration_seconds"
+# End-to-end request timings, labelled by method, route template and status
+REQUEST_METRIC = "legal_assistant_http_request_duration_seconds"
+
+HELP = {
+    STAGE_METRIC: "Time spent in each pipeline stage.",
+    REQUEST_METRIC: "Time from receiving a request to sending the last response byte.",
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """
+        Initialize an empty histogram.
+
+        Args:
+            buckets: Sorted bucket upper bounds in seconds
+        """
+        self.buckets = tuple(buckets)
+        # Per bucket, observations in (previous bound, bound]; the last one is unbounded
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, seconds: float) -> None:
+        """Record one observation."""
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.total += seconds
+        self.count += 1
+
+
+class MetricsRegistry:
+    """Thread-safe set of labelled histograms."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS, enabled: bool = True):
+        """
+        Initialize the registry.
+
+        Args:
+            buckets: Bucket upper bounds in seconds shared by every histogram
+            enabled: Whether observations are recorded
+        """
+        self.buckets = tuple(buckets)
+        self.enabled = enabled
+        # metric name -> labels -> histogram
+        self._histograms: Dict[str, Dict[Labels, Histogram]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name: str, seconds: float, **labels: str) -> None:
+        """
+        Record a duration.
+
+        Args:
+            name: Metric name
+            seconds: Observed duration
+            **labels: Label values identifying the series
+        """
+        if not self.enabled:
+            return
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    @contextmanager
+    def span(self, stage: str) -> Iterator[None]:
+        """Time the enclosed block as a pipeline stage."""
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.observe(STAGE_METRIC, (time.perf_counter_ns() - start) / 1e9, stage=stage)
+
+    def clear(self) -> None:
+        """Drop every recorded series."""
+        with self._lock:
+            self._histograms.clear()
+
+    def render(self) -> str:
+        """Render every series in the Prometheus text exposition format."""
+        lines: List[str] = []
+        with self._lock:
+            for name in sorted(self._histograms):
+                lines.append(f"# HELP {name} {HELP.get(name, name)}")
+                lines.append(f"# TYPE {name} histogram")
+                for labels, histogram in sorted(self._histograms[name].items()):
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets + (float("inf"),), histogram.counts):
+                        cumulative += count
+                        bucket_labels = labels + (("le", _format_bound(bound)),)
+                        lines.append(f"{name}_bucket{_format_labels(bucket_labels)} {cumulative}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {histogram.total!r}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+def _format_bound(bound: float) -> str:
+    """Format a bucket bound as Prometheus expects."""
+    return "+Inf" if bound == float("inf") else repr(bound)
+
+
+def _format_labels(labels: Labels) -> str:
+    """Format labels as {name="value",...}."""
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels) + "}"
+
+
+def _escape(value: str) -> str:
+    """Escape a label value."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# Global metrics registry
+metrics = MetricsRegistry(enabled=settings.metrics_enabled)
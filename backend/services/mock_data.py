@@ -1,6 +1,9 @@
 """Mock data store for testing Legal Assistant API."""
 from typing import List, Dict
+from config import settings
 from models.schemas import LegalChunk, JudgmentChunk, Metadata
+from services.corpus_store import CorpusStore
+from services.corpus_file import open_corpus
 
 
 # ============================================================================
@@ -232,3 +235,10 @@ def get_all_judgment_chunks() -> List[JudgmentChunk]:
 def get_all_chunks() -> List[LegalChunk | JudgmentChunk]:
     """Get all chunks (legal + judgments)."""
     return get_all_legal_chunks() + get_all_judgment_chunks()
+
+
+def get_corpus_store() -> CorpusStore:
+    """Get the configured corpus file, or all mock chunks, as a columnar store."""
+    if settings.corpus_path:
+        return open_corpus(settings.corpus_path)
+    return CorpusStore.from_records(MOCK_LEGAL_CHUNKS + MOCK_JUDGMENT_CHUNKS)
@@ -1,63 +1,203 @@
 """Mock LLM service returning predefined responses."""
-from typing import List, Dict, Optional
-import time
-from models.schemas import SourceReference
+from typing import AsyncIterator, List, Optional, Tuple
+import asyncio
+import hashlib
+import json
+import re
+from config import settings
+from models.schemas import SearchResult, SourceReference
+from services.cache import LRUCache
+from services.context_builder import PromptContext
+from services.llm_service import LLMService
+from services.metrics import metrics
+from services.session_store import SessionStore, create_session_store
+from services.single_flight import SingleFlight
 
 
-class MockLLM:
+# Words with their trailing whitespace, so joined tokens rebuild the answer
+TOKEN_PATTERN = re.compile(r"\S+\s*")
+
+# Fraction of the simulated latency spent before the first token
+FIRST_TOKEN_LATENCY_SHARE = 0.2
+
+
+class MockLLM(LLMService):
     """Mock LLM service for testing."""
     
     def __init__(self):
         """Initialize mock LLM with chat memory."""
-        self.chat_memory: Dict[str, List[Dict[str, str]]] = {}
+        self.sessions: SessionStore = create_session_store(
+            settings.session_store_backend,
+            settings.session_store_path,
+            max_sessions=settings.session_max_sessions,
+            ttl_seconds=settings.session_ttl_seconds,
+            max_bytes_per_session=settings.session_max_bytes,
+            max_history=settings.chatbot_max_history,
+            flush_interval_ms=settings.session_flush_interval_ms,
+            flush_batch_size=settings.session_flush_batch_size
+        )
+        self.response_cache = LRUCache(
+            max_size=settings.llm_cache_size,
+            ttl_seconds=settings.llm_cache_ttl_seconds
+        )
+        # Identical prompts generated at the same time share one generation
+        self.in_flight = SingleFlight()
+        self.latency_seconds = settings.llm_mock_latency_ms / 1000
     
-    def generate_chat_response(
+    async def generate(
         self,
         query: str,
         session_id: str,
-        retrieved_chunks: List[Dict]
+        context: PromptContext,
+        use_cache: bool = True
     ) -> tuple[str, List[SourceReference]]:
         """
-        Generate mock chat response.
+        Generate mock chat response without blocking the event loop.
         
         Args:
             query: User query
             session_id: Session identifier
-            retrieved_chunks: Retrieved context chunks
+            context: Passages selected for the prompt
+            use_cache: Whether a cached answer may be returned
             
         Returns:
             Tuple of (answer, sources)
         """
-        # Simulate LLM latency
-        time.sleep(0.15)
+        cache_key, answer = await self._cached_answer(query, session_id, context, use_cache)
+        
+        if answer is None:
+            if use_cache:
+                # Concurrent requests for the same prompt await the generation already in flight
+                answer = await self.in_flight.do(cache_key, lambda: self._generate(query, context, cache_key))
+            else:
+                answer = await self._generate(query, context, cache_key)
+        
+        return self._respond(query, session_id, context, answer)
+    
+    async def _generate(self, query: str, context: PromptContext, cache_key: tuple) -> str:
+        """Generate and cache an answer, simulating LLM latency."""
+        with metrics.span("llm"):
+            # Simulate LLM latency while other requests keep running
+            await asyncio.sleep(self.latency_seconds)
+            return self._complete(query, context, cache_key)
+    
+    async def stream(
+        self,
+        query: str,
+        session_id: str,
+        context: PromptContext,
+        use_cache: bool = True
+    ) -> AsyncIterator[str]:
+        """
+        Stream mock chat response token by token.
         
-        # Store in memory
-        if session_id not in self.chat_memory:
-            self.chat_memory[session_id] = []
+        The simulated latency is split into a time-to-first-token delay and
+        per-token delays; cached answers are streamed without delay. Chat
+        memory is only updated once the full answer has been streamed.
+        
+        Args:
+            query: User query
+            session_id: Session identifier
+            context: Passages selected for the prompt
+            use_cache: Whether a cached answer may be returned
+            
+        Yields:
+            Answer tokens including trailing whitespace
+        """
+        cache_key, answer = await self._cached_answer(query, session_id, context, use_cache)
+        latency_seconds = 0.0 if answer is not None else self.latency_seconds
+        if answer is None:
+            answer = self._generate_answer(query, context.passages)
+        tokens = TOKEN_PATTERN.findall(answer)
         
-        self.chat_memory[session_id].append({
-            "role": "user",
-            "content": query
-        })
+        # Simulate prompt processing before the first token
+        with metrics.span("llm_first_token"):
+            await asyncio.sleep(latency_seconds * FIRST_TOKEN_LATENCY_SHARE)
+        token_delay = latency_seconds * (1 - FIRST_TOKEN_LATENCY_SHARE) / max(len(tokens), 1)
         
-        # Generate response based on query patterns
-        answer = self._generate_answer(query, retrieved_chunks)
+        for position, token in enumerate(tokens):
+            if position > 0:
+                await asyncio.sleep(token_delay)
+            yield token
         
-        self.chat_memory[session_id].append({
-            "role": "assistant",
-            "content": answer
-        })
+        self.response_cache.set(cache_key, answer)
+        self._remember(session_id, query, answer)
+    
+    async def close(self) -> None:
+        """Persist and release chat memory."""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.sessions.close)
+    
+    async def _cached_answer(
+        self,
+        query: str,
+        session_id: str,
+        context: PromptContext,
+        use_cache: bool
+    ) -> Tuple[tuple, Optional[str]]:
+        """Get the response cache key of a prompt and its cached answer, if any."""
+        cache_key = await self._response_cache_key(query, session_id, context)
+        return cache_key, self.response_cache.get(cache_key) if use_cache else None
+    
+    def _complete(self, query: str, context: PromptContext, cache_key: tuple) -> str:
+        """Generate an answer from the prompt passages and cache it."""
+        answer = self._generate_answer(query, context.passages)
+        self.response_cache.set(cache_key, answer)
+        return answer
+    
+    async def _response_cache_key(
+        self,
+        query: str,
+        session_id: str,
+        context: PromptContext
+    ) -> tuple:
+        """
+        Build the response cache key.
         
-        # Keep only last 10 messages
-        if len(self.chat_memory[session_id]) > 10:
-            self.chat_memory[session_id] = self.chat_memory[session_id][-10:]
+        The same question over the same retrieved chunks gets the same
+        answer, so the key is the normalized query plus the chunk ids, and
+        optionally a digest of the session history. A digest of the passage
+        texts keeps answers over a chunk replaced under the same id, or
+        trimmed differently, from being served again. The history is read
+        in a worker thread, since a shared store may wait on its database.
+        """
+        chunk_ids = tuple(passage.id for passage in context.passages)
+        content = hashlib.sha1()
+        for passage in context.passages:
+            content.update(passage.content.encode("utf-8"))
+            content.update(b"\0")
+        history_digest = None
+        if settings.llm_cache_include_history:
+            loop = asyncio.get_running_loop()
+            history = await loop.run_in_executor(None, self.sessions.get_history, session_id)
+            history_digest = hashlib.sha1(
+                json.dumps(history, sort_keys=True).encode("utf-8")
+            ).hexdigest()
+        return (" ".join(query.lower().split()), chunk_ids, content.hexdigest(), history_digest)
+    
+    def _respond(
+        self,
+        query: str,
+        session_id: str,
+        context: PromptContext,
+        answer: str
+    ) -> tuple[str, List[SourceReference]]:
+        """Update chat memory and attach sources to an answer."""
+        self._remember(session_id, query, answer)
         
         # Create source references
-        sources = self._create_sources(retrieved_chunks)
+        sources = self.create_sources(context)
         
         return answer, sources
     
-    def _generate_answer(self, query: str, chunks: List[Dict]) -> str:
+    def _remember(self, session_id: str, query: str, answer: str) -> None:
+        """Store a question and answer in chat memory."""
+        self.sessions.append(session_id, [
+            {"role": "user", "content": query},
+            {"role": "assistant", "content": answer}
+        ])
+    
+    def _generate_answer(self, query: str, passages: List[SearchResult]) -> str:
         """Generate answer based on query patterns."""
         query_lower = query.lower()
         
@@ -80,37 +220,35 @@ class MockLLM:
         elif "culpable homicide" in query_lower or ("murder" in query_lower and "304" in query_lower):
             return "Based on the judgment in State vs Sonu, if the accused inflicted only a solitary blow without clear intention to kill, the offence may be classified as culpable homicide not amounting to murder under Section 304 IPC instead of murder under Section 302 IPC. The court considers factors like whether it was a single blow, lack of premeditation, and absence of repeated attacks."
         
-        # Generic response using first chunk
-        elif chunks:
-            first_chunk = chunks[0]
-            content = first_chunk.get("content", "")
-            metadata = first_chunk.get("metadata", {})
+        # Generic response using the best passage
+        elif passages:
+            content = passages[0].content
+            metadata = passages[0].metadata
             
-            if metadata.get("doc_type") == "statute":
-                act_name = metadata.get("act_name", "the Act")
-                section_id = metadata.get("section_id", "")
+            if metadata.doc_type == "statute":
+                act_name = metadata.act_name or "the Act"
+                section_id = metadata.section_id or ""
                 return f"According to Section {section_id} of {act_name}, {content[:200]}..."
             else:
-                title = metadata.get("title", "the judgment")
+                title = metadata.title or "the judgment"
                 return f"Based on {title}, {content[:200]}..."
         
         return "I don't have sufficient information in my knowledge base to answer this question accurately. Please try rephrasing your query or provide more specific details."
     
-    def _create_sources(self, chunks: List[Dict]) -> List[SourceReference]:
-        """Create source references from chunks."""
+    def create_sources(self, context: PromptContext) -> List[SourceReference]:
+        """Create source references from the prompt passages."""
         sources = []
         
-        for chunk in chunks[:3]:  # Top 3 sources
-            metadata = chunk.get("metadata", {})
-            score = chunk.get("score", 0.8)
+        for passage in context.passages[:3]:  # Top 3 sources
+            metadata = passage.metadata
             
             source = SourceReference(
-                section_id=metadata.get("section_id"),
-                act_name=metadata.get("act_name"),
-                chapter=metadata.get("chapter"),
-                title=metadata.get("title"),
-                court=metadata.get("court"),
-                relevance_score=score
+                section_id=metadata.section_id,
+                act_name=metadata.act_name,
+                chapter=metadata.chapter,
+                title=metadata.title,
+                court=metadata.court,
+                relevance_score=passage.score
             )
             sources.append(source)
         
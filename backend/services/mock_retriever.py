@@ -1,22 +1,194 @@
 """Mock retrieval service simulating hybrid search."""
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, FrozenSet, Sequence, Tuple
+import asyncio
+import functools
+import heapq
+import threading
 import time
-from models.schemas import SearchResult, SearchFilters, Metadata
-from services.mock_data import get_all_chunks
+import numpy as np
+from models.schemas import SearchResult, SearchFilters
+from config import settings
+from services.mock_data import get_corpus_store
+from services.corpus_store import CorpusStore, validate_record
+from services.index_segments import IndexSegment, IndexSnapshot
+from services.inverted_index import tokenize
+from services.bm25 import top_scores
+from services.vector_index import HashingEmbedder, create_vector_index
+from services.metadata_index import FILTER_FIELDS
+from services.sparse_scoring import uses_sparse_postings
+from services.cache import LRUCache
+from services.reranker import create_rerank_stage
+from services.metrics import metrics
+from services.single_flight import SingleFlight
 
 
 class MockRetriever:
     """Mock retrieval service for testing."""
     
-    def __init__(self):
-        """Initialize mock retriever."""
-        self.all_chunks = get_all_chunks()
+    def __init__(self, store: Optional[CorpusStore] = None):
+        """
+        Initialize mock retriever.
+        
+        Args:
+            store: Corpus to index; the configured corpus when omitted
+        """
+        self.result_cache = LRUCache(
+            max_size=settings.search_cache_size,
+            ttl_seconds=settings.search_cache_ttl_seconds
+        )
+        # Identical searches running at the same time share one computation
+        self.in_flight = SingleFlight()
+        self.embedder = HashingEmbedder(dim=settings.embedding_dim)
+        # Optional second stage over the first-stage results
+        self.rerank_stage = create_rerank_stage(
+            settings.rerank_mode,
+            batch_size=settings.rerank_batch_size,
+            budget_ms=settings.rerank_budget_ms,
+            cache_size=settings.rerank_cache_size,
+            cache_ttl_seconds=settings.rerank_cache_ttl_seconds
+        )
+        # Serializes index updates; searches never take it
+        self._update_lock = threading.Lock()
+        self.snapshot = IndexSnapshot([self._build_segment(store if store is not None else get_corpus_store(), 0)])
+    
+    def reload(self) -> None:
+        """Reload the corpus, rebuild indexes and invalidate cached results."""
+        with self._update_lock:
+            segment = self._build_segment(get_corpus_store(), 0)
+            self._swap(IndexSnapshot([segment], generation=self.snapshot.generation + 1))
+    
+    def upsert_chunks(self, chunks: List[Dict[str, Any]]) -> int:
+        """
+        Add chunks, replacing live chunks with the same id.
+        
+        The chunks form a new segment; replaced chunks are marked deleted.
+        In-flight searches keep their snapshot until the swap.
+        
+        Args:
+            chunks: Records shaped like LegalChunk/JudgmentChunk
+            
+        Returns:
+            Number of chunks indexed
+        """
+        # Later duplicates within a batch win
+        records = list({record["id"]: validate_record(record) for record in chunks}.values())
+        if not records:
+            return 0
+        
+        with self._update_lock:
+            snapshot = self.snapshot
+            replaced = {snapshot.find(record["id"]) for record in records} - {None}
+            segment = self._build_segment(
+                CorpusStore.from_records(records, validate=False),
+                snapshot.next_id
+            )
+            self._swap(self._merge_segments(IndexSnapshot(
+                snapshot.segments + (segment,),
+                snapshot.deleted | replaced,
+                snapshot.generation + 1
+            )))
+        return len(records)
+    
+    def delete_chunks(self, chunk_ids: List[str]) -> int:
+        """
+        Delete chunks by id.
+        
+        Args:
+            chunk_ids: Ids of the chunks to delete
+            
+        Returns:
+            Number of live chunks deleted
+        """
+        with self._update_lock:
+            snapshot = self.snapshot
+            deleted = {snapshot.find(chunk_id) for chunk_id in chunk_ids} - {None}
+            if deleted:
+                self._swap(self._merge_segments(IndexSnapshot(
+                    snapshot.segments,
+                    snapshot.deleted | deleted,
+                    snapshot.generation + 1
+                )))
+        return len(deleted)
+    
+    def index_stats(self) -> Dict[str, int]:
+        """Get document, segment and update counters of the live snapshot."""
+        snapshot = self.snapshot
+        return {
+            "documents": len(snapshot),
+            "deleted": len(snapshot.deleted),
+            "segments": len(snapshot.segments),
+            "generation": snapshot.generation,
+        }
+    
+    def _build_segment(self, store: CorpusStore, base: int) -> IndexSegment:
+        """Build a segment with the configured vector index."""
+        return IndexSegment(
+            store,
+            base,
+            self.embedder,
+            create_vector_index(
+                settings.vector_index_mode,
+                settings.embedding_dim,
+                nlist=settings.ivf_nlist,
+                nprobe=settings.ivf_nprobe
+            ),
+            sparse=uses_sparse_postings(settings.scoring_mode)
+        )
+    
+    def _merge_segments(self, snapshot: IndexSnapshot) -> IndexSnapshot:
+        """
+        Merge the newest incremental segments once there are too many of them.
+        
+        Merges are size-tiered: the last two segments are merged along with
+        every earlier segment holding no more live chunks than those merged
+        so far, so large segments are rewritten rarely. The merged segment
+        reuses the id range of the segments it replaces and their deletions
+        are dropped, so the id space only grows with live chunks. Stored
+        vectors are carried over instead of re-embedding the chunks. The
+        base corpus segment is never merged.
+        """
+        if len(snapshot.segments) <= settings.index_max_segments:
+            return snapshot
+        
+        segments = snapshot.segments
+        live = [len(segment) - snapshot.deleted_in(segment) for segment in segments]
+        first = len(segments) - 2
+        while first > 1 and live[first - 1] <= sum(live[first:]):
+            first -= 1
+        first = max(first, 1)
+        base = segments[first].base
+        
+        records = []
+        vectors = []
+        for segment in segments[first:]:
+            local_ids = [
+                local_id for local_id in range(len(segment))
+                if segment.base + local_id not in snapshot.deleted
+            ]
+            records.extend(segment.store.get_chunk(local_id).model_dump() for local_id in local_ids)
+            if segment.vector_index is not None:
+                vectors.append(segment.vector_index.vectors[local_ids])
+        
+        kept = segments[:first]
+        if records:
+            store = CorpusStore.from_records(records, validate=False)
+            if vectors and len(vectors) == len(segments) - first:
+                store.embeddings = np.concatenate(vectors)
+            kept += (self._build_segment(store, base),)
+        deleted = frozenset(doc_id for doc_id in snapshot.deleted if doc_id < base)
+        return IndexSnapshot(kept, deleted, snapshot.generation)
+    
+    def _swap(self, snapshot: IndexSnapshot) -> None:
+        """Atomically publish a new snapshot and drop results of older ones."""
+        self.snapshot = snapshot
+        self.result_cache.clear()
     
     def search(
         self,
         query: str,
         filters: Optional[SearchFilters] = None,
-        top_k: int = 5
+        top_k: int = 5,
+        rerank: bool = False
     ) -> tuple[List[SearchResult], int]:
         """
         Perform mock hybrid search.
@@ -25,122 +197,364 @@ class MockRetriever:
             query: Search query
             filters: Optional filters
             top_k: Number of results to return
+            rerank: Whether to rerank the first-stage results
+            
+        Returns:
+            Tuple of (results, query_time_ms)
+        """
+        return self.search_many([(query, filters, top_k)], rerank=[rerank])[0]
+    
+    async def search_async(
+        self,
+        query: str,
+        filters: Optional[SearchFilters] = None,
+        top_k: int = 5,
+        rerank: bool = False
+    ) -> tuple[List[SearchResult], int]:
+        """
+        Perform mock hybrid search in a worker thread, keeping the event loop free.
+        
+        Concurrent searches with the same normalized query, filters, top_k
+        and rerank flag against the same index generation await one search
+        instead of each running their own.
+        
+        Args:
+            query: Search query
+            filters: Optional filters
+            top_k: Number of results to return
+            rerank: Whether to rerank the first-stage results
             
         Returns:
             Tuple of (results, query_time_ms)
         """
-        start_time = time.time()
+        query_lower = " ".join(query.lower().split())
+        key = (self._cache_key(self.snapshot, query_lower, filters, top_k), rerank)
+        loop = asyncio.get_running_loop()
+        results, query_time = await self.in_flight.do(
+            key,
+            lambda: loop.run_in_executor(None, functools.partial(self.search, query, filters, top_k, rerank))
+        )
+        # Callers share the computation, not the list
+        return list(results), query_time
+    
+    def search_many(
+        self,
+        queries: Sequence[Tuple[str, Optional[SearchFilters], int]],
+        rerank: Optional[Sequence[bool]] = None
+    ) -> List[tuple[List[SearchResult], int]]:
+        """
+        Perform mock hybrid search for several queries in one pass.
         
-        # Filter chunks based on filters
-        filtered_chunks = self._apply_filters(self.all_chunks, filters)
+        Repeated queries are scored once, each distinct filter is resolved
+        once, postings of terms shared between queries are scored once, and
+        the vector ranker embeds and searches all queries with the same
+        filter in one batch.
         
-        # Simple keyword matching for mock search
-        scored_chunks = []
-        query_lower = query.lower()
+        Queries to rerank retrieve RERANK_CANDIDATES first-stage results,
+        which the rerank stage reorders and cuts to top_k.
         
-        for chunk in filtered_chunks:
-            score = self._calculate_mock_score(chunk, query_lower)
-            if score > 0:
-                scored_chunks.append((chunk, score))
+        Args:
+            queries: (query, filters, top_k) tuples
+            rerank: Per query, whether to rerank the first-stage results
+            
+        Returns:
+            Per query, tuple of (results, query_time_ms)
+        """
+        start_time = time.perf_counter_ns()
+        # Every step reads this snapshot, even if an update swaps in another
+        snapshot = self.snapshot
         
-        # Sort by score descending
-        scored_chunks.sort(key=lambda x: x[1], reverse=True)
+        responses: List[Optional[List[SearchResult]]] = [None] * len(queries)
+        # cache key -> positions of the queries it answers
+        pending: Dict[tuple, List[int]] = {}
+        jobs: List[Tuple[str, Optional[SearchFilters], int]] = []
         
-        # Take top_k
-        top_chunks = scored_chunks[:top_k]
+        query_lowers: List[str] = []
+        reranked: List[bool] = []
         
-        # Convert to SearchResult
-        results = [
-            SearchResult(
-                id=chunk.id,
-                content=chunk.raw_content,
-                metadata=chunk.metadata,
-                score=round(score, 2)
-            )
-            for chunk, score in top_chunks
-        ]
+        for position, (query, filters, top_k) in enumerate(queries):
+            # Case and whitespace do not change results, so they share a cache entry
+            query_lower = " ".join(query.lower().split())
+            query_lowers.append(query_lower)
+            
+            # Reranked queries widen the first stage to the rerank candidates
+            reranked.append(self.rerank_stage is not None and rerank is not None and rerank[position])
+            if reranked[-1]:
+                top_k = max(top_k, settings.rerank_candidates)
+            
+            cache_key = self._cache_key(snapshot, query_lower, filters, top_k)
+            if cache_key in pending:
+                pending[cache_key].append(position)
+                continue
+            cached = self.result_cache.get(cache_key)
+            if cached is not None:
+                responses[position] = list(cached)
+                continue
+            pending[cache_key] = [position]
+            jobs.append((query_lower, filters, top_k))
+        
+        if jobs:
+            for (cache_key, positions), results in zip(pending.items(), self._run_jobs(snapshot, jobs)):
+                self.result_cache.set(cache_key, results)
+                for position in positions:
+                    responses[position] = list(results)
+        
+        for position, (_, _, top_k) in enumerate(queries):
+            if reranked[position]:
+                with metrics.span("rerank"):
+                    responses[position] = self.rerank_stage.rerank(
+                        query_lowers[position],
+                        responses[position],
+                        top_k,
+                        snapshot.generation
+                    )
         
-        query_time = int((time.time() - start_time) * 1000)
+        query_time = round((time.perf_counter_ns() - start_time) / 1e6)
         
-        return results, query_time
+        return [(results, query_time) for results in responses]
     
-    def _apply_filters(
+    def _run_jobs(
         self,
-        chunks: List[Any],
-        filters: Optional[SearchFilters]
-    ) -> List[Any]:
-        """Apply filters to chunks."""
-        if not filters:
-            return chunks
-        
-        filtered = chunks
-        
-        if filters.doc_type:
-            filtered = [
-                c for c in filtered
-                if c.metadata.doc_type == filters.doc_type
-            ]
+        snapshot: IndexSnapshot,
+        jobs: List[Tuple[str, Optional[SearchFilters], int]]
+    ) -> List[List[SearchResult]]:
+        """Rank and materialize distinct normalized queries against a snapshot."""
+        # Resolve each distinct filter to the allowed documents before scoring;
+        # the snapshot keeps them, with their masks, for later searches
+        with metrics.span("filter"):
+            allowed_by_filter: Dict[tuple, Optional[FrozenSet[int]]] = {}
+            masks_by_filter: Dict[tuple, Optional[np.ndarray]] = {}
+            filter_keys = []
+            for _, filters, _ in jobs:
+                filter_key = self._filter_key(filters)
+                if filter_key not in allowed_by_filter:
+                    allowed_by_filter[filter_key], masks_by_filter[filter_key] = snapshot.resolve_cached(filter_key, filters)
+                filter_keys.append(filter_key)
+            allowed_ids = [allowed_by_filter[filter_key] for filter_key in filter_keys]
         
-        if filters.act_name:
-            filtered = [
-                c for c in filtered
-                if c.metadata.act_name and filters.act_name.lower() in c.metadata.act_name.lower()
-            ]
+        with metrics.span("score"):
+            query_terms = [tokenize(query_lower) for query_lower, _, _ in jobs]
+            
+            if snapshot.sparse is not None:
+                masks = [masks_by_filter[filter_key] for filter_key in filter_keys]
+                bm25_scores, keyword_scores = self._score_arrays(snapshot, jobs, query_terms, masks)
+            else:
+                bm25_scores, keyword_scores = self._score_candidates(snapshot, jobs, query_terms, allowed_ids)
         
-        if filters.category:
-            filtered = [
-                c for c in filtered
-                if c.metadata.category and filters.category.lower() in c.metadata.category.lower()
+        if settings.vector_index_mode != "off":
+            with metrics.span("vector"):
+                vector_scores = self._vector_search_many(
+                    snapshot,
+                    [query_lower for query_lower, _, _ in jobs],
+                    filter_keys,
+                    masks_by_filter
+                )
+        else:
+            # Keyword matching stands in for the vector ranker
+            vector_scores = keyword_scores
+        
+        # Fuse both rankers and keep the top_k by score descending
+        with metrics.span("sort"):
+            ranked = [
+                heapq.nsmallest(
+                    top_k,
+                    self._fuse_scores(job_vector_scores, job_bm25_scores).items(),
+                    key=lambda x: (-x[1], x[0])
+                )
+                for (_, _, top_k), job_vector_scores, job_bm25_scores in zip(jobs, vector_scores, bm25_scores)
             ]
         
-        if filters.court:
-            filtered = [
-                c for c in filtered
-                if c.metadata.court and filters.court.lower() in c.metadata.court.lower()
+        # Convert to SearchResult, materializing only the returned chunks
+        with metrics.span("materialize"):
+            return [
+                [self._materialize(snapshot, doc_id, score) for doc_id, score in top_chunks]
+                for top_chunks in ranked
             ]
+    
+    def _score_arrays(
+        self,
+        snapshot: IndexSnapshot,
+        jobs: List[Tuple[str, Optional[SearchFilters], int]],
+        query_terms: List[List[str]],
+        masks: List[Optional[np.ndarray]]
+    ) -> Tuple[List[Dict[int, float]], List[Dict[int, float]]]:
+        """Get the top BM25 and keyword scores of each job with NumPy array operations."""
+        bm25_scores = snapshot.sparse.bm25_top_k(query_terms, masks, settings.bm25_top_k)
         
-        if filters.case_type:
-            filtered = [
-                c for c in filtered
-                if c.metadata.case_type and filters.case_type.lower() in c.metadata.case_type.lower()
+        keyword_scores: List[Dict[int, float]] = []
+        if settings.vector_index_mode == "off":
+            keyword_scores = [
+                snapshot.sparse.keyword_top_k(query_lower, terms, mask, settings.vector_search_top_k)
+                for (query_lower, _, _), terms, mask in zip(jobs, query_terms, masks)
             ]
+        return bm25_scores, keyword_scores
+    
+    def _score_candidates(
+        self,
+        snapshot: IndexSnapshot,
+        jobs: List[Tuple[str, Optional[SearchFilters], int]],
+        query_terms: List[List[str]],
+        allowed_ids: List[Optional[FrozenSet[int]]]
+    ) -> Tuple[List[Dict[int, float]], List[Dict[int, float]]]:
+        """Get the top BM25 and keyword scores of each job by looping over candidates."""
+        # Only documents sharing a term with the query can score
+        candidate_ids = []
+        for terms, allowed in zip(query_terms, allowed_ids):
+            candidates = snapshot.candidates(terms)
+            if allowed is not None:
+                candidates &= allowed
+            candidate_ids.append(candidates)
         
-        return filtered
+        # BM25 ranking over the precomputed field statistics
+        bm25_scores = [
+            snapshot.bm25.top_k(terms, settings.bm25_top_k, candidates)
+            for terms, candidates in zip(query_terms, candidate_ids)
+        ]
+        
+        keyword_scores: List[Dict[int, float]] = []
+        if settings.vector_index_mode == "off":
+            for (query_lower, _, _), terms, candidates in zip(jobs, query_terms, candidate_ids):
+                scores = {}
+                for doc_id in sorted(candidates):
+                    score = self._calculate_mock_score(snapshot, doc_id, query_lower, terms)
+                    if score > 0:
+                        scores[doc_id] = score
+                keyword_scores.append(top_scores(scores, settings.vector_search_top_k))
+        return bm25_scores, keyword_scores
+    
+    def _materialize(self, snapshot: IndexSnapshot, doc_id: int, score: float) -> SearchResult:
+        """Build a SearchResult from the corpus store columns."""
+        segment, local_id = snapshot.locate(doc_id)
+        return SearchResult(
+            id=segment.store.get_id(local_id),
+            content=segment.store.get_text(local_id, "raw_content"),
+            metadata=segment.store.get_metadata(local_id),
+            score=round(score, 2),
+            token_count=segment.store.get_token_count(local_id)
+        )
     
-    def _calculate_mock_score(self, chunk: Any, query_lower: str) -> float:
+    def _cache_key(
+        self,
+        snapshot: IndexSnapshot,
+        query_lower: str,
+        filters: Optional[SearchFilters],
+        top_k: int
+    ) -> tuple:
+        """Build the result cache key from the snapshot, normalized query and filters."""
+        # Searches finishing after a swap must not cache results of the old snapshot
+        return (snapshot.generation, query_lower, self._filter_key(filters), top_k)
+    
+    def _filter_key(self, filters: Optional[SearchFilters]) -> tuple:
+        """Normalize filters into a hashable key."""
+        return tuple(
+            (getattr(filters, field) or "").lower() if filters else ""
+            for field in FILTER_FIELDS
+        )
+    
+    def _vector_search_many(
+        self,
+        snapshot: IndexSnapshot,
+        queries: List[str],
+        filter_keys: List[tuple],
+        masks_by_filter: Dict[tuple, Optional[np.ndarray]]
+    ) -> List[Dict[int, float]]:
+        """Get the nearest chunks of each query by embedding similarity."""
+        query_vectors = self.embedder.embed_batch(queries)
+        
+        # Queries with the same filter are searched as one batch
+        groups: Dict[tuple, List[int]] = {}
+        for position, filter_key in enumerate(filter_keys):
+            groups.setdefault(filter_key, []).append(position)
+        
+        vector_scores: List[Dict[int, float]] = [{} for _ in queries]
+        for filter_key, positions in groups.items():
+            # Dense retrieval covers every allowed chunk, not only lexical candidates
+            batch_neighbours = snapshot.vector_search_batch(
+                query_vectors[positions],
+                settings.vector_search_top_k,
+                allowed_mask=masks_by_filter[filter_key]
+            )
+            for position, neighbours in zip(positions, batch_neighbours):
+                vector_scores[position] = {
+                    doc_id: similarity
+                    for doc_id, similarity in neighbours
+                    if similarity >= settings.vector_min_similarity
+                }
+        return vector_scores
+    
+    def _fuse_scores(
+        self,
+        vector_scores: Dict[int, float],
+        bm25_scores: Dict[int, float]
+    ) -> Dict[int, float]:
+        """
+        Combine ranker scores using the configured hybrid weights.
+        
+        BM25 scores are unbounded, so they are normalized by the best score
+        of the query before weighting. The weights are normalized so that
+        fused scores stay within [0, 1].
+        
+        Args:
+            vector_scores: Scores in [0, 1] from the vector-side ranker
+            bm25_scores: Raw BM25 scores
+            
+        Returns:
+            Mapping of document id to fused score
+        """
+        total_weight = settings.hybrid_vector_weight + settings.hybrid_bm25_weight
+        if total_weight <= 0:
+            total_weight = 1.0
+        vector_weight = settings.hybrid_vector_weight / total_weight
+        bm25_weight = settings.hybrid_bm25_weight / total_weight
+        
+        max_bm25 = max(bm25_scores.values(), default=0.0)
+        
+        fused: Dict[int, float] = {}
+        for doc_id in vector_scores.keys() | bm25_scores.keys():
+            bm25_norm = bm25_scores.get(doc_id, 0.0) / max_bm25 if max_bm25 > 0 else 0.0
+            fused[doc_id] = min(
+                vector_weight * vector_scores.get(doc_id, 0.0) + bm25_weight * bm25_norm,
+                1.0
+            )
+        return fused
+    
+    def _calculate_mock_score(
+        self,
+        snapshot: IndexSnapshot,
+        doc_id: int,
+        query_lower: str,
+        query_terms: List[str]
+    ) -> float:
         """Calculate mock relevance score based on keyword matching."""
         score = 0.0
-        
-        # Check in raw content
-        content_lower = chunk.raw_content.lower()
-        text_for_embedding_lower = chunk.text_for_embedding.lower()
+        segment, local_id = snapshot.locate(doc_id)
         
         # Exact phrase match gets highest score
-        if query_lower in content_lower:
+        if query_lower in segment.store.get_text(local_id, "raw_content").lower():
             score += 0.9
-        elif query_lower in text_for_embedding_lower:
+        elif query_lower in segment.store.get_text(local_id, "text_for_embedding").lower():
             score += 0.8
-        else:
-            # Check individual words
-            query_words = query_lower.split()
-            matches = sum(1 for word in query_words if word in content_lower)
+        elif query_terms:
+            # Check individual words against the postings lists
+            matches = sum(
+                1 for term in query_terms
+                if segment.content_index.contains(doc_id, term)
+            )
             if matches > 0:
-                score += 0.3 + (matches / len(query_words)) * 0.5
+                score += 0.3 + (matches / len(query_terms)) * 0.5
         
         # Boost for section ID match
-        if chunk.metadata.section_id:
-            section_id_lower = chunk.metadata.section_id.lower()
+        section_id = segment.store.get_value(local_id, "section_id")
+        if section_id:
+            section_id_lower = section_id.lower()
             if section_id_lower in query_lower:
                 score += 0.2
         
         # Boost for act name match
-        if chunk.metadata.act_name:
-            act_name_lower = chunk.metadata.act_name.lower()
-            query_words = query_lower.split()
-            for word in query_words:
-                if word in act_name_lower:
-                    score += 0.1
-                    break
+        if any(
+            segment.act_name_index.contains(doc_id, term) for term in query_terms
+        ):
+            score += 0.1
         
         # Cap at 1.0
         return min(score, 1.0)
@@ -0,0 +1,223 @@
+"""Second-stage reranking of first-stage search results."""
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+import time
+from models.schemas import SearchResult
+from services.cache import LRUCache
+from services.inverted_index import tokenize
+
+# Question words and connectives that carry no relevance signal on their own
+STOPWORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "by", "can", "do", "does", "for",
+    "from", "how", "i", "in", "is", "it", "my", "of", "on", "or", "the", "this",
+    "that", "to", "under", "was", "what", "when", "which", "who", "with",
+})
+
+
+class LocalReranker:
+    """
+    Deterministic offline stand-in for a cross-encoder reranker.
+
+    Like a cross-encoder, it reads the query and the passage together and
+    scores the pair, rewarding query terms that occur in the passage, in
+    the query's word order and close to each other.
+    """
+
+    # Weights of the pair features, summing to 1
+    COVERAGE_WEIGHT = 0.4
+    BIGRAM_WEIGHT = 0.2
+    PROXIMITY_WEIGHT = 0.2
+    PHRASE_WEIGHT = 0.2
+
+    def score_batch(self, query: str, passages: Sequence[str]) -> List[float]:
+        """
+        Score (query, passage) pairs.
+
+        Args:
+            query: Normalized query
+            passages: Passages to score against the query
+
+        Returns:
+            Relevance score in [0, 1] per passage
+        """
+        query_terms = [term for term in tokenize(query) if term not in STOPWORDS] or tokenize(query)
+        unique_terms = set(query_terms)
+        bigrams = set(zip(query_terms, query_terms[1:]))
+        return [self._score(query, unique_terms, bigrams, passage) for passage in passages]
+
+    def _score(
+        self,
+        query: str,
+        unique_terms: Set[str],
+        bigrams: Set[Tuple[str, str]],
+        passage: str
+    ) -> float:
+        """Score one pair from term coverage, bigram overlap, proximity and phrase matches."""
+        if not unique_terms:
+            return 0.0
+
+        words = tokenize(passage)
+        # Positions of query terms in the passage, in passage order
+        hits = [(position, word) for position, word in enumerate(words) if word in unique_terms]
+        found = {word for _, word in hits}
+
+        coverage = len(found) / len(unique_terms)
+        if bigrams:
+            bigram = len(bigrams & set(zip(words, words[1:]))) / len(bigrams)
+        else:
+            bigram = coverage
+        proximity = len(found) / _shortest_window(hits, len(found)) if found else 0.0
+        phrase = 1.0 if query in passage.lower() else 0.0
+
+        return (
+            self.COVERAGE_WEIGHT * coverage
+            + self.BIGRAM_WEIGHT * bigram
+            + self.PROXIMITY_WEIGHT * proximity
+            + self.PHRASE_WEIGHT * phrase
+        )
+
+
+class RerankStage:
+    """
+    Reranks the head of a first-stage result list within a latency budget.
+
+    Candidates are scored in batches, best first-stage results first. Pair
+    scores are cached per (index generation, query, chunk), so repeated
+    queries only pay for chunks they have not seen. Once the budget is
+    spent no further batches are started, and the unscored tail keeps its
+    first-stage order after the reranked head, with its scores scaled
+    down so that no tail result scores above the lowest reranked one.
+    """
+
+    def __init__(
+        self,
+        reranker: LocalReranker,
+        batch_size: int = 16,
+        budget_ms: float = 50,
+        cache_size: int = 4096,
+        cache_ttl_seconds: float = 600
+    ):
+        """
+        Initialize the stage.
+
+        Args:
+            reranker: Pair scorer
+            batch_size: Pairs scored per reranker call
+            budget_ms: Time after which no further batches are started
+            cache_size: Maximum number of cached pair scores; 0 disables caching
+            cache_ttl_seconds: Time after which a cached pair score expires
+        """
+        self.reranker = reranker
+        self.batch_size = max(1, batch_size)
+        self.budget_ms = budget_ms
+        self.score_cache = LRUCache(max_size=cache_size, ttl_seconds=cache_ttl_seconds)
+
+    def rerank(
+        self,
+        query_lower: str,
+        results: List[SearchResult],
+        top_k: int,
+        generation: int = 0
+    ) -> List[SearchResult]:
+        """
+        Rerank first-stage results.
+
+        Args:
+            query_lower: Normalized query
+            results: First-stage results, best first
+            top_k: Number of results to return
+            generation: Index generation the results were retrieved from
+
+        Returns:
+            Top results; reranked ones carry the reranker score
+        """
+        deadline = time.perf_counter() + self.budget_ms / 1000
+        scores: List[float] = []
+
+        for start in range(0, len(results), self.batch_size):
+            if time.perf_counter() >= deadline:
+                break
+            batch = results[start:start + self.batch_size]
+            keys = [(generation, query_lower, result.id) for result in batch]
+            batch_scores: List[Optional[float]] = [self.score_cache.get(key) for key in keys]
+
+            missing = [position for position, score in enumerate(batch_scores) if score is None]
+            if missing:
+                computed = self.reranker.score_batch(query_lower, [_passage(batch[position]) for position in missing])
+                for position, score in zip(missing, computed):
+                    batch_scores[position] = score
+                    self.score_cache.set(keys[position], score)
+            scores.extend(batch_scores)
+
+        # Sort the scored head, keeping first-stage order among equal scores
+        head = sorted(range(len(scores)), key=lambda position: -scores[position])
+        reranked = [
+            results[position].model_copy(update={"score": round(min(scores[position], 1.0), 2)})
+            for position in head
+        ]
+        tail = results[len(scores):top_k]
+        if reranked and tail and tail[0].score > reranked[-1].score:
+            scale = max(reranked[-1].score, 0.0) / tail[0].score
+            tail = [result.model_copy(update={"score": round(result.score * scale, 2)}) for result in tail]
+        return (reranked + tail)[:top_k]
+
+
+def create_rerank_stage(
+    mode: str,
+    batch_size: int = 16,
+    budget_ms: float = 50,
+    cache_size: int = 4096,
+    cache_ttl_seconds: float = 600
+) -> Optional[RerankStage]:
+    """
+    Create the rerank stage for the configured mode.
+
+    Args:
+        mode: "local" or "off"
+        batch_size: Pairs scored per reranker call
+        budget_ms: Time after which no further batches are started
+        cache_size: Maximum number of cached pair scores
+        cache_ttl_seconds: Time after which a cached pair score expires
+
+    Returns:
+        Rerank stage, or None when reranking is disabled
+    """
+    if mode == "off":
+        return None
+    if mode == "local":
+        return RerankStage(
+            LocalReranker(),
+            batch_size=batch_size,
+            budget_ms=budget_ms,
+            cache_size=cache_size,
+            cache_ttl_seconds=cache_ttl_seconds
+        )
+    raise ValueError(f"Unknown rerank mode: {mode}")
+
+
+def _passage(result: SearchResult) -> str:
+    """Text a result is reranked on: its act, section and title, then its content."""
+    metadata = result.metadata
+    heading = [
+        metadata.act_name,
+        f"Section {metadata.section_id}" if metadata.section_id else None,
+        metadata.title,
+    ]
+    return " ".join([part for part in heading if part] + [result.content])
+
+
+def _shortest_window(hits: List[Tuple[int, str]], distinct: int) -> int:
+    """Length of the shortest run of passage words containing every distinct hit term."""
+    counts: Dict[str, int] = {}
+    best = None
+    left = 0
+    for position, word in hits:
+        counts[word] = counts.get(word, 0) + 1
+        while len(counts) == distinct:
+            left_position, left_word = hits[left]
+            window = position - left_position + 1
+            best = window if best is None else min(best, window)
+            counts[left_word] -= 1
+            if not counts[left_word]:
+                del counts[left_word]
+            left += 1
+    return best or 1
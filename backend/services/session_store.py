@@ -0,0 +1,488 @@
+"""Bounded chat session stores with LRU and idle TTL eviction."""
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from typing import Deque, Dict, List, Tuple
+import logging
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+# A stored message as (role, content)
+Message = Tuple[str, str]
+
+
+class SessionStore(ABC):
+    """Interface for chat history storage keyed by session id."""
+
+    @abstractmethod
+    def append(self, session_id: str, messages: List[Dict[str, str]]) -> None:
+        """
+        Append messages to a session's history.
+
+        Args:
+            session_id: Session identifier
+            messages: Messages with "role" and "content" keys
+        """
+
+    @abstractmethod
+    def get_history(self, session_id: str) -> List[Dict[str, str]]:
+        """Get a session's history, oldest message first."""
+
+    @abstractmethod
+    def delete(self, session_id: str) -> None:
+        """Forget a session."""
+
+    @abstractmethod
+    def stats(self) -> Dict[str, int]:
+        """Get memory usage and eviction counters."""
+
+    def close(self) -> None:
+        """Persist pending writes and release resources."""
+
+
+class _Session:
+    """History of one session as a fixed-size ring buffer."""
+
+    __slots__ = ("messages", "size_bytes", "last_access")
+
+    def __init__(self, max_history: int):
+        """Initialize an empty session."""
+        self.messages: Deque[Message] = deque(maxlen=max_history)
+        self.size_bytes = 0
+        self.last_access = time.monotonic()
+
+
+def _message_size(message: Message) -> int:
+    """Approximate the stored size of a message in bytes."""
+    return len(message[0]) + len(message[1].encode("utf-8"))
+
+
+class InMemorySessionStore(SessionStore):
+    """
+    Process-local session store bounded in sessions, age and bytes.
+
+    Sessions are kept in least-recently-used order, so idle sessions are
+    always at the front and expire without scanning the whole store.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = 10000,
+        ttl_seconds: float = 3600,
+        max_bytes_per_session: int = 65536,
+        max_history: int = 10
+    ):
+        """
+        Initialize the store.
+
+        Args:
+            max_sessions: Sessions kept before evicting the least recently used
+            ttl_seconds: Idle time after which a session expires
+            max_bytes_per_session: Byte cap on a session's stored messages
+            max_history: Messages kept per session
+        """
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes_per_session = max_bytes_per_session
+        self.max_history = max_history
+
+        self._sessions: "OrderedDict[str, _Session]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._total_bytes = 0
+        self._lru_evictions = 0
+        self._ttl_evictions = 0
+        self._trimmed_messages = 0
+
+    def __len__(self) -> int:
+        """Number of live sessions."""
+        return len(self._sessions)
+
+    def append(self, session_id: str, messages: List[Dict[str, str]]) -> None:
+        """Append messages, trimming history and evicting sessions as needed."""
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+
+            session = self._sessions.get(session_id)
+            if session is None:
+                session = _Session(self.max_history)
+                self._sessions[session_id] = session
+            else:
+                self._sessions.move_to_end(session_id)
+            session.last_access = now
+
+            for message in messages:
+                self._push(session, (message["role"], message["content"]))
+
+            # Drop the oldest messages beyond the byte cap, keeping the newest
+            while session.size_bytes > self.max_bytes_per_session and len(session.messages) > 1:
+                self._drop_oldest(session)
+
+            while len(self._sessions) > self.max_sessions:
+                self._evict_oldest()
+                self._lru_evictions += 1
+
+    def get_history(self, session_id: str) -> List[Dict[str, str]]:
+        """Get a session's history and mark it as recently used."""
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            session = self._sessions.get(session_id)
+            if session is None:
+                return []
+            self._sessions.move_to_end(session_id)
+            session.last_access = now
+            return [{"role": role, "content": content} for role, content in session.messages]
+
+    def delete(self, session_id: str) -> None:
+        """Forget a session."""
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+            if session is not None:
+                self._total_bytes -= session.size_bytes
+
+    def stats(self) -> Dict[str, int]:
+        """Get memory usage and eviction counters."""
+        with self._lock:
+            self._expire(time.monotonic())
+            return {
+                "sessions": len(self._sessions),
+                "messages": sum(len(session.messages) for session in self._sessions.values()),
+                "bytes": self._total_bytes,
+                "lru_evictions": self._lru_evictions,
+                "ttl_evictions": self._ttl_evictions,
+                "trimmed_messages": self._trimmed_messages,
+            }
+
+    def _push(self, session: _Session, message: Message) -> None:
+        """Append to the ring buffer, accounting for the message it displaces."""
+        if len(session.messages) == session.messages.maxlen:
+            self._drop_oldest(session)
+        session.messages.append(message)
+        size = _message_size(message)
+        session.size_bytes += size
+        self._total_bytes += size
+
+    def _drop_oldest(self, session: _Session) -> None:
+        """Remove the oldest message of a session."""
+        size = _message_size(session.messages.popleft())
+        session.size_bytes -= size
+        self._total_bytes -= size
+        self._trimmed_messages += 1
+
+    def _evict_oldest(self) -> None:
+        """Remove the least recently used session."""
+        _, session = self._sessions.popitem(last=False)
+        self._total_bytes -= session.size_bytes
+
+    def _expire(self, now: float) -> None:
+        """Remove idle sessions from the least recently used end."""
+        while self._sessions:
+            oldest = next(iter(self._sessions.values()))
+            if now - oldest.last_access < self.ttl_seconds:
+                break
+            self._evict_oldest()
+            self._ttl_evictions += 1
+
+
+
+class SqliteSessionStore(SessionStore):
+    """
+    Session store in a SQLite file shared by every worker process.
+
+    Appends are buffered and written by a background thread in one
+    transaction per batch, either when the buffer reaches the batch size or
+    on the flush interval. Reads flush the local buffer first, so a worker always sees
+    its own writes; other workers see them after the next flush.
+
+    The buffer lock is only held to swap buffers, never during SQLite I/O,
+    so appends from the event loop do not wait for a transaction that is
+    itself waiting for another worker's write lock.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_sessions: int = 10000,
+        ttl_seconds: float = 3600,
+        max_bytes_per_session: int = 65536,
+        max_history: int = 10,
+        flush_interval_ms: int = 50,
+        flush_batch_size: int = 64
+    ):
+        """
+        Open the database and start the background flusher.
+
+        Args:
+            path: SQLite database file
+            max_sessions: Sessions kept before evicting the least recently used
+            ttl_seconds: Idle time after which a session expires
+            max_bytes_per_session: Byte cap on a session's stored messages
+            max_history: Messages kept per session
+            flush_interval_ms: Maximum delay before buffered writes are flushed
+            flush_batch_size: Buffered messages that trigger an immediate flush
+        """
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes_per_session = max_bytes_per_session
+        self.max_history = max_history
+        self.flush_batch_size = flush_batch_size
+
+        # Guards the buffers and counters
+        self._lock = threading.Lock()
+        # Serializes use of the connection; taken before the buffer lock
+        self._db_lock = threading.Lock()
+        self._pending: List[Tuple[str, str, str, int]] = []
+        # session_id -> last access time (wall clock, shared across processes)
+        self._touched: Dict[str, float] = {}
+        self._lru_evictions = 0
+        self._ttl_evictions = 0
+        self._trimmed_messages = 0
+
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        # WAL lets readers in other workers proceed while one worker writes
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS sessions (
+                session_id TEXT PRIMARY KEY,
+                last_access REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS sessions_last_access ON sessions (last_access);
+            CREATE TABLE IF NOT EXISTS messages (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                session_id TEXT NOT NULL,
+                role TEXT NOT NULL,
+                content TEXT NOT NULL,
+                size INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS messages_session ON messages (session_id, seq);
+            """
+        )
+
+        self._stop = threading.Event()
+        self._wakeup = threading.Event()
+        self._flusher = threading.Thread(
+            target=self._flush_periodically,
+            args=(flush_interval_ms / 1000,),
+            name="session-flush",
+            daemon=True
+        )
+        self._flusher.start()
+
+    def append(self, session_id: str, messages: List[Dict[str, str]]) -> None:
+        """Buffer messages for the next batched write."""
+        with self._lock:
+            for message in messages:
+                entry = (message["role"], message["content"])
+                self._pending.append((session_id, entry[0], entry[1], _message_size(entry)))
+            self._touched[session_id] = time.time()
+            if len(self._pending) >= self.flush_batch_size:
+                # Write in the flusher thread, not on the caller's event loop
+                self._wakeup.set()
+
+    def get_history(self, session_id: str) -> List[Dict[str, str]]:
+        """Get a session's history and mark it as recently used."""
+        with self._lock:
+            self._touched[session_id] = time.time()
+        with self._db_lock:
+            self._flush()
+            rows = self._conn.execute(
+                "SELECT role, content FROM messages WHERE session_id = ? ORDER BY seq",
+                (session_id,)
+            ).fetchall()
+        return [{"role": role, "content": content} for role, content in rows]
+
+    def delete(self, session_id: str) -> None:
+        """Forget a session in every worker."""
+        with self._db_lock:
+            self._flush()
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._delete_sessions([session_id])
+            self._conn.execute("COMMIT")
+
+    def stats(self) -> Dict[str, int]:
+        """Get shared usage figures and this worker's eviction counters."""
+        with self._db_lock:
+            self._flush()
+            sessions = self._conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+            messages, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM messages"
+            ).fetchone()
+        with self._lock:
+            return {
+                "sessions": sessions,
+                "messages": messages,
+                "bytes": size,
+                "lru_evictions": self._lru_evictions,
+                "ttl_evictions": self._ttl_evictions,
+                "trimmed_messages": self._trimmed_messages,
+            }
+
+    def close(self) -> None:
+        """Flush buffered writes and close the database."""
+        self._stop.set()
+        self._wakeup.set()
+        self._flusher.join()
+        with self._db_lock:
+            try:
+                self._flush()
+            finally:
+                self._conn.close()
+
+    def _flush_periodically(self, interval: float) -> None:
+        """Flush buffered writes until the store is closed."""
+        while not self._stop.is_set():
+            self._wakeup.wait(interval)
+            self._wakeup.clear()
+            with self._db_lock:
+                if self._stop.is_set():
+                    break
+                try:
+                    self._flush()
+                except Exception:
+                    # The batch is back in the buffer; retry on the next interval
+                    logger.exception("Failed to flush chat sessions")
+
+    def _flush(self) -> None:
+        """
+        Write buffered messages and enforce limits in one transaction.
+
+        Callers hold the database lock. If the transaction fails, the batch
+        is put back in front of the buffer and the error is raised.
+        """
+        with self._lock:
+            if not self._pending and not self._touched:
+                return
+            pending, self._pending = self._pending, []
+            touched, self._touched = self._touched, {}
+
+        try:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    "INSERT INTO sessions (session_id, last_access) VALUES (?, ?) "
+                    "ON CONFLICT (session_id) DO UPDATE SET last_access = excluded.last_access",
+                    touched.items()
+                )
+                self._conn.executemany(
+                    "INSERT INTO messages (session_id, role, content, size) VALUES (?, ?, ?, ?)",
+                    pending
+                )
+                trimmed = sum(self._trim_session(session_id) for session_id in {entry[0] for entry in pending})
+                expired, evicted = self._evict(time.time())
+                self._conn.execute("COMMIT")
+            except Exception:
+                if self._conn.in_transaction:
+                    self._conn.execute("ROLLBACK")
+                raise
+        except Exception:
+            with self._lock:
+                self._pending[:0] = pending
+                for session_id, last_access in touched.items():
+                    self._touched[session_id] = max(last_access, self._touched.get(session_id, 0.0))
+            raise
+
+        with self._lock:
+            self._trimmed_messages += trimmed
+            self._ttl_evictions += expired
+            self._lru_evictions += evicted
+
+    def _trim_session(self, session_id: str) -> int:
+        """Drop messages beyond the history length or byte cap and count them."""
+        rows = self._conn.execute(
+            "SELECT seq, size FROM messages WHERE session_id = ? ORDER BY seq DESC",
+            (session_id,)
+        ).fetchall()
+
+        # Keep the newest messages that fit, always keeping the latest one
+        kept_bytes = 0
+        for position, (seq, size) in enumerate(rows):
+            kept_bytes += size
+            if position > 0 and (position >= self.max_history or kept_bytes > self.max_bytes_per_session):
+                self._conn.execute(
+                    "DELETE FROM messages WHERE session_id = ? AND seq <= ?",
+                    (session_id, seq)
+                )
+                return len(rows) - position
+        return 0
+
+    def _evict(self, now: float) -> Tuple[int, int]:
+        """Expire idle sessions and evict the least recently used overflow, returning both counts."""
+        expired = [
+            row[0] for row in self._conn.execute(
+                "SELECT session_id FROM sessions WHERE last_access < ?",
+                (now - self.ttl_seconds,)
+            )
+        ]
+        self._delete_sessions(expired)
+
+        evicted: List[str] = []
+        overflow = self._conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0] - self.max_sessions
+        if overflow > 0:
+            evicted = [
+                row[0] for row in self._conn.execute(
+                    "SELECT session_id FROM sessions ORDER BY last_access LIMIT ?",
+                    (overflow,)
+                )
+            ]
+            self._delete_sessions(evicted)
+        return len(expired), len(evicted)
+
+    def _delete_sessions(self, session_ids: List[str]) -> None:
+        """Delete sessions and their messages."""
+        if not session_ids:
+            return
+        params = [(session_id,) for session_id in session_ids]
+        self._conn.executemany("DELETE FROM messages WHERE session_id = ?", params)
+        self._conn.executemany("DELETE FROM sessions WHERE session_id = ?", params)
+
+
+def create_session_store(
+    backend: str,
+    path: str,
+    max_sessions: int,
+    ttl_seconds: float,
+    max_bytes_per_session: int,
+    max_history: int,
+    flush_interval_ms: int = 50,
+    flush_batch_size: int = 64
+) -> SessionStore:
+    """
+    Create the configured session store.
+
+    Args:
+        backend: "memory" for a process-local store, "sqlite" for a shared file
+        path: SQLite database file (sqlite backend only)
+        max_sessions: Sessions kept before evicting the least recently used
+        ttl_seconds: Idle time after which a session expires
+        max_bytes_per_session: Byte cap on a session's stored messages
+        max_history: Messages kept per session
+        flush_interval_ms: Maximum delay before buffered writes are flushed
+        flush_batch_size: Buffered messages that trigger an immediate flush
+
+    Returns:
+        Session store instance
+    """
+    if backend == "memory":
+        return InMemorySessionStore(
+            max_sessions=max_sessions,
+            ttl_seconds=ttl_seconds,
+            max_bytes_per_session=max_bytes_per_session,
+            max_history=max_history
+        )
+    if backend == "sqlite":
+        return SqliteSessionStore(
+            path,
+            max_sessions=max_sessions,
+            ttl_seconds=ttl_seconds,
+            max_bytes_per_session=max_bytes_per_session,
+            max_history=max_history,
+            flush_interval_ms=flush_interval_ms,
+            flush_batch_size=flush_batch_size
+        )
+    raise ValueError(f"Unknown session store backend: {backend}")
@@ -0,0 +1,66 @@
+"""Coalescing of concurrent identical computations (single-flight)."""
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+import asyncio
+import functools
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Runs at most one computation per key at a time and shares its outcome.
+
+    Callers arriving while a computation for their key is in flight await
+    that computation instead of starting their own. Nothing is kept once it
+    completes, so unlike a cache no result outlives the burst it served.
+
+    The computation runs as its own task, so a cancelled caller (such as a
+    disconnected client) does not cancel it for the others. Instances must
+    only be used from one event loop thread.
+    """
+
+    def __init__(self):
+        """Initialize with nothing in flight."""
+        # key -> task computing it
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+        self._started = 0
+        self._coalesced = 0
+
+    async def do(self, key: Hashable, function: Callable[[], Awaitable[T]]) -> T:
+        """
+        Await the computation of a key, starting it unless already in flight.
+
+        Args:
+            key: Identity of the computation
+            function: Coroutine function computing the result
+
+        Returns:
+            Result of the shared computation; its exception is raised to every caller
+        """
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(function())
+            self._calls[key] = task
+            task.add_done_callback(functools.partial(self._finish, key))
+            self._started += 1
+        else:
+            self._coalesced += 1
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Future) -> None:
+        """Forget a completed computation."""
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Every caller may have been cancelled; do not report the error as unretrieved
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get in-flight and coalescing counters."""
+        calls = self._started + self._coalesced
+        return {
+            "in_flight": len(self._calls),
+            "started": self._started,
+            "coalesced": self._coalesced,
+            "coalesced_rate": self._coalesced / calls if calls else 0.0,
+        }
@@ -0,0 +1,494 @@
+"""Vectorized NumPy scoring over flattened postings arrays."""
+from bisect import bisect_right
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+import threading
+import numpy as np
+from services.bm25 import BM25Scorer
+from services.corpus_store import CorpusStore
+from services.inverted_index import InvertedIndex, TOKEN_PATTERN
+
+# (doc ids, contributions) of one term
+TermScores = Tuple[np.ndarray, np.ndarray]
+
+# Above this share of a segment's documents, one scan of the whole segment
+# is cheaper than checking the documents one by one
+PHRASE_SCAN_SHARE = 0.25
+
+# Postings field holding the tokens of each text field
+TEXT_POSTINGS = {"raw_content": "content", "text_for_embedding": "text_for_embedding"}
+
+
+class SparsePostings:
+    """
+    Postings of an inverted index as flat arrays, one contiguous run per term.
+
+    This is the term-major (CSR) layout of the sparse term-document matrix:
+    a term's row holds its local document ids and term frequencies, and the
+    length of every document is kept alongside. The arrays are either
+    flattened from an InvertedIndex or mapped from a corpus file, and they
+    answer the same read calls as an InvertedIndex, so BM25 and keyword
+    scoring run on either.
+    """
+
+    def __init__(
+        self,
+        terms: Mapping[str, int],
+        offsets: np.ndarray,
+        doc_ids: np.ndarray,
+        tfs: np.ndarray,
+        lengths: np.ndarray,
+        base: int = 0
+    ):
+        """
+        Wrap postings arrays.
+
+        Args:
+            terms: Term -> position of its run
+            offsets: Start of every run plus the final end
+            doc_ids: Local document id of each posting, sorted within runs
+            tfs: Term frequency of each posting
+            lengths: Number of tokens of each document
+            base: Global id of the first document
+        """
+        self.terms = terms
+        self.offsets = offsets
+        self.doc_ids = doc_ids
+        self.tfs = tfs
+        self.lengths = lengths
+        self.base = base
+        self.total_length = int(lengths.sum())
+        self._doc_lengths: Optional[Dict[int, int]] = None
+
+    @classmethod
+    def from_index(cls, index: InvertedIndex, base: int) -> "SparsePostings":
+        """
+        Flatten an inverted index.
+
+        Args:
+            index: Inverted index whose documents were added in id order from base
+            base: Global id of the index's first document
+
+        Returns:
+            Flattened postings
+        """
+        total = sum(len(doc_freqs) for doc_freqs in index.postings.values())
+        offsets = np.zeros(len(index.postings) + 1, dtype=np.int64)
+        doc_ids = np.empty(total, dtype=np.int32)
+        tfs = np.empty(total, dtype=np.int32)
+        terms: Dict[str, int] = {}
+
+        position = 0
+        for term, doc_freqs in index.postings.items():
+            count = len(doc_freqs)
+            doc_ids[position:position + count] = np.fromiter(doc_freqs.keys(), dtype=np.int64, count=count) - base
+            tfs[position:position + count] = np.fromiter(doc_freqs.values(), dtype=np.int32, count=count)
+            terms[term] = len(terms)
+            position += count
+            offsets[len(terms)] = position
+
+        lengths = np.fromiter(index.doc_lengths.values(), dtype=np.int32, count=len(index.doc_lengths))
+        return cls(terms, offsets, doc_ids, tfs, lengths, base)
+
+    @property
+    def doc_count(self) -> int:
+        """Number of indexed documents."""
+        return len(self.lengths)
+
+    @property
+    def doc_lengths(self) -> Dict[int, int]:
+        """Global doc id -> number of tokens in the document, built on first use."""
+        if self._doc_lengths is None:
+            self._doc_lengths = dict(zip(range(self.base, self.base + len(self.lengths)), self.lengths.tolist()))
+        return self._doc_lengths
+
+    def get(self, term: str) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """Get the (global doc ids, term frequencies, document lengths) run of a term."""
+        run = self._run(term)
+        if run is None:
+            return None
+        start, end = run
+        local_ids = self.doc_ids[start:end]
+        return (
+            local_ids.astype(np.int64) + self.base,
+            self.tfs[start:end].astype(np.float64),
+            self.lengths[local_ids].astype(np.float64)
+        )
+
+    def get_doc_ids(self, term: str) -> Optional[np.ndarray]:
+        """Get the global ids of the documents containing a term."""
+        run = self._run(term)
+        if run is None:
+            return None
+        start, end = run
+        return self.doc_ids[start:end].astype(np.int64) + self.base
+
+    def get_postings(self, term: str) -> Dict[int, int]:
+        """Get the postings list of a term as global doc id -> term frequency."""
+        run = self._run(term)
+        if run is None:
+            return {}
+        start, end = run
+        doc_ids = (self.doc_ids[start:end].astype(np.int64) + self.base).tolist()
+        return dict(zip(doc_ids, self.tfs[start:end].tolist()))
+
+    def doc_freq(self, term: str) -> int:
+        """Get the number of documents containing a term."""
+        run = self._run(term)
+        return 0 if run is None else run[1] - run[0]
+
+    def contains(self, doc_id: int, term: str) -> bool:
+        """Check whether a document contains a term."""
+        run = self._run(term)
+        if run is None:
+            return False
+        start, end = run
+        local_id = doc_id - self.base
+        position = start + int(np.searchsorted(self.doc_ids[start:end], local_id))
+        return position < end and self.doc_ids[position] == local_id
+
+    def candidates(self, terms: Iterable[str]) -> Set[int]:
+        """Collect the global ids of documents sharing at least one term with the query."""
+        matched: Set[int] = set()
+        for term in terms:
+            doc_ids = self.get_doc_ids(term)
+            if doc_ids is not None:
+                matched.update(doc_ids.tolist())
+        return matched
+
+    def _run(self, term: str) -> Optional[Tuple[int, int]]:
+        """Get the (start, end) of a term's run."""
+        position = self.terms.get(term)
+        if position is None:
+            return None
+        return int(self.offsets[position]), int(self.offsets[position + 1])
+
+
+class LowercasedTexts:
+    """
+    Lowercased copy of one text column for exact phrase search.
+
+    Texts are lowercased one by one and concatenated as UTF-8, so candidate
+    texts are searched with bytes.find without lowercasing them per query.
+    The copy is built on first use.
+    """
+
+    def __init__(self, store: CorpusStore, field: str, base: int):
+        """
+        Initialize the column.
+
+        Args:
+            store: Corpus store holding the texts
+            field: Text field to search
+            base: Global id of the store's first document
+        """
+        self.store = store
+        self.field = field
+        self.base = base
+        self._data: Optional[bytes] = None
+        self._offsets: List[int] = []
+        self._lock = threading.Lock()
+
+    def find(self, phrase: str, doc_ids: np.ndarray) -> np.ndarray:
+        """
+        Get the global ids of candidate documents whose lowercased text contains a phrase.
+
+        Args:
+            phrase: Lowercased phrase
+            doc_ids: Sorted global ids of the candidates in this segment
+
+        Returns:
+            Sorted document ids
+        """
+        if not phrase or not len(doc_ids):
+            return np.zeros(0, dtype=np.int64)
+        data, offsets = self._load()
+        needle = phrase.encode("utf-8")
+
+        if len(doc_ids) <= PHRASE_SCAN_SHARE * (len(offsets) - 1):
+            found = [
+                doc_id for doc_id in doc_ids.tolist()
+                if data.find(needle, offsets[doc_id - self.base], offsets[doc_id - self.base + 1]) != -1
+            ]
+            return np.asarray(found, dtype=np.int64)
+
+        found = []
+        position = data.find(needle)
+        while position != -1:
+            local_id = bisect_right(offsets, position) - 1
+            end = offsets[local_id + 1]
+            if position + len(needle) <= end:
+                found.append(local_id)
+                position = data.find(needle, end)
+            else:
+                # The occurrence spans two documents
+                position = data.find(needle, position + 1)
+        return np.intersect1d(np.asarray(found, dtype=np.int64) + self.base, doc_ids, assume_unique=True)
+
+    def _load(self) -> Tuple[bytes, List[int]]:
+        """Build the lowercased column once."""
+        with self._lock:
+            if self._data is None:
+                encoded = [text.lower().encode("utf-8") for text in self.store.texts(self.field)]
+                offsets = [0]
+                for text in encoded:
+                    offsets.append(offsets[-1] + len(text))
+                self._offsets = offsets
+                self._data = b"".join(encoded)
+        return self._data, self._offsets
+
+
+class SparseScorer:
+    """
+    Scores every document of a snapshot at once with array operations.
+
+    Scores are accumulated into dense arrays over the global id space with
+    np.bincount, and the best k are selected with np.argpartition.
+    """
+
+    def __init__(
+        self,
+        bm25: BM25Scorer,
+        postings: Dict[str, List[SparsePostings]],
+        texts: Dict[str, List[LowercasedTexts]],
+        section_ids: Dict[str, np.ndarray],
+        size: int
+    ):
+        """
+        Create a scorer.
+
+        Args:
+            bm25: Scorer providing the field weights and collection statistics
+            postings: Field name -> flattened postings, one per segment
+            texts: Text field -> lowercased texts, one per segment
+            section_ids: Lowercased section id -> global ids of its documents
+            size: Size of the global id space
+        """
+        self.bm25 = bm25
+        self.postings = postings
+        self.texts = texts
+        self.section_ids = section_ids
+        self.size = size
+        self._max_section_length = max((len(section_id) for section_id in section_ids), default=0)
+
+    def bm25_top_k(
+        self,
+        queries: Sequence[List[str]],
+        masks: Sequence[Optional[np.ndarray]],
+        top_k: int
+    ) -> List[Dict[int, float]]:
+        """
+        Get the top BM25 scores of each query.
+
+        Term contributions are computed once per distinct term of the batch.
+
+        Args:
+            queries: Tokenized queries
+            masks: Per query, an optional mask of allowed documents
+            top_k: Number of scores to keep per query
+
+        Returns:
+            Mapping of document id to BM25 score, per query
+        """
+        term_scores: Dict[str, TermScores] = {}
+        results = []
+        for terms, mask in zip(queries, masks):
+            parts = []
+            for term in set(terms):
+                if term not in term_scores:
+                    term_scores[term] = self._bm25_term(term)
+                parts.append(term_scores[term])
+            scores, touched = self._accumulate(parts)
+            results.append(top_k_dense(scores, touched if mask is None else touched & mask, top_k))
+        return results
+
+    def keyword_top_k(
+        self,
+        query_lower: str,
+        terms: List[str],
+        mask: Optional[np.ndarray],
+        top_k: int
+    ) -> Dict[int, float]:
+        """
+        Get the top keyword match scores of a query.
+
+        Array version of MockRetriever._calculate_mock_score, returning the
+        same scores.
+
+        Args:
+            query_lower: Normalized query
+            terms: Tokenized query
+            mask: Optional mask of allowed documents
+            top_k: Number of scores to keep
+
+        Returns:
+            Mapping of document id to score
+        """
+        # Only documents sharing a term with the query can score
+        if not terms:
+            return {}
+        unique_terms = set(terms)
+
+        # Candidates share at least one term with the query in any field
+        candidates = np.zeros(self.size, dtype=bool)
+        for field in ("content", "text_for_embedding", "act_name", "section_id"):
+            for doc_ids in self._term_doc_ids(field, unique_terms):
+                candidates[doc_ids] = True
+        if mask is not None:
+            candidates &= mask
+
+        # Content matches, counting repeated query terms
+        matches = np.zeros(self.size, dtype=np.float64)
+        for term in unique_terms:
+            for doc_ids in self._term_doc_ids("content", [term]):
+                matches[doc_ids] += terms.count(term)
+        scores = np.zeros(self.size, dtype=np.float64)
+        if terms:
+            scores = np.where(matches > 0, 0.3 + (matches / len(terms)) * 0.5, 0.0)
+
+        # Exact phrase matches replace the word match score, raw content first
+        for doc_ids in self._phrase_doc_ids("text_for_embedding", query_lower, candidates):
+            scores[doc_ids] = 0.8
+        for doc_ids in self._phrase_doc_ids("raw_content", query_lower, candidates):
+            scores[doc_ids] = 0.9
+
+        # Boost for section ids occurring in the query
+        section_boost = np.zeros(self.size, dtype=bool)
+        for section_id in self._sections_in(query_lower):
+            section_boost[self.section_ids[section_id]] = True
+        scores = np.where(section_boost, scores + 0.2, scores)
+
+        # Boost for act name terms
+        act_boost = np.zeros(self.size, dtype=bool)
+        for doc_ids in self._term_doc_ids("act_name", unique_terms):
+            act_boost[doc_ids] = True
+        scores = np.where(act_boost, scores + 0.1, scores)
+
+        scores = np.minimum(scores, 1.0)
+        return top_k_dense(scores, candidates & (scores > 0), top_k)
+
+    def _bm25_term(self, term: str) -> TermScores:
+        """Compute the BM25 contributions of one term over every field and segment."""
+        doc_id_parts = []
+        score_parts = []
+        for name, field in self.bm25.fields.items():
+            idf = field.idf(term)
+            if idf is None:
+                continue
+            term_weight = field.weight * idf * (field.k1 + 1)
+            k1, b, avg_length = field.k1, field.b, field.avg_length
+            for postings in self.postings[name]:
+                run = postings.get(term)
+                if run is None:
+                    continue
+                doc_ids, tfs, lengths = run
+                length_norms = k1 * (1 - b + b * (lengths / avg_length if avg_length else 0.0))
+                doc_id_parts.append(doc_ids)
+                score_parts.append(term_weight * tfs / (tfs + length_norms))
+        if not doc_id_parts:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float64)
+        return np.concatenate(doc_id_parts), np.concatenate(score_parts)
+
+    def _accumulate(self, parts: List[TermScores]) -> Tuple[np.ndarray, np.ndarray]:
+        """Sum term contributions into a dense score array and a touched mask."""
+        if not parts:
+            return np.zeros(self.size, dtype=np.float64), np.zeros(self.size, dtype=bool)
+        doc_ids = np.concatenate([doc_ids for doc_ids, _ in parts])
+        contributions = np.concatenate([contributions for _, contributions in parts])
+        scores = np.bincount(doc_ids, weights=contributions, minlength=self.size)
+        touched = np.bincount(doc_ids, minlength=self.size) > 0
+        return scores, touched
+
+    def _term_doc_ids(self, field: str, terms: Iterable[str]) -> List[np.ndarray]:
+        """Get the document id runs of terms in a field across segments."""
+        runs = []
+        for postings in self.postings[field]:
+            for term in terms:
+                doc_ids = postings.get_doc_ids(term)
+                if doc_ids is not None:
+                    runs.append(doc_ids)
+        return runs
+
+    def _phrase_doc_ids(self, field: str, phrase: str, candidates: np.ndarray) -> List[np.ndarray]:
+        """
+        Get the ids of candidates whose lowercased text contains a phrase, per segment.
+
+        A text containing the phrase contains every phrase term that has a
+        non-word character on both sides as a whole token, so only
+        candidates whose postings hold all of those terms are searched.
+        The terms at either end may be parts of longer tokens.
+
+        Args:
+            field: Text field to search
+            phrase: Lowercased phrase
+            candidates: Mask of documents worth checking
+
+        Returns:
+            Sorted document ids, per segment
+        """
+        inner_terms = {
+            match.group() for match in TOKEN_PATTERN.finditer(phrase)
+            if match.start() > 0 and match.end() < len(phrase)
+        }
+        checked = candidates
+        for term in inner_terms:
+            has_term = np.zeros(self.size, dtype=bool)
+            for doc_ids in self._term_doc_ids(TEXT_POSTINGS[field], [term]):
+                has_term[doc_ids] = True
+            checked = checked & has_term
+
+        doc_ids = np.flatnonzero(checked)
+        found = []
+        for texts in self.texts[field]:
+            start, end = np.searchsorted(doc_ids, [texts.base, texts.base + len(texts.store)])
+            found.append(texts.find(phrase, doc_ids[start:end]))
+        return found
+
+    def _sections_in(self, query_lower: str) -> List[str]:
+        """Get the section ids that are substrings of the query."""
+        found = set()
+        for start in range(len(query_lower)):
+            for end in range(start + 1, min(start + self._max_section_length, len(query_lower)) + 1):
+                section_id = query_lower[start:end]
+                if section_id in self.section_ids:
+                    found.add(section_id)
+        return list(found)
+
+
+def top_k_dense(scores: np.ndarray, mask: np.ndarray, top_k: int) -> Dict[int, float]:
+    """
+    Keep the top_k highest masked scores, breaking ties by document id.
+
+    Args:
+        scores: Dense scores over the global id space
+        mask: Documents eligible for selection
+        top_k: Number of scores to keep
+
+    Returns:
+        Mapping of document id to score, best first
+    """
+    doc_ids = np.flatnonzero(mask)
+    values = scores[doc_ids]
+    if len(doc_ids) > top_k:
+        # Keep everything tied with the k-th best so ties resolve by id
+        kth_value = values[np.argpartition(-values, top_k - 1)[top_k - 1]]
+        keep = values >= kth_value
+        doc_ids, values = doc_ids[keep], values[keep]
+    order = np.lexsort((doc_ids, -values))[:top_k]
+    return {int(doc_ids[i]): float(values[i]) for i in order}
+
+
+def uses_sparse_postings(mode: str) -> bool:
+    """
+    Check whether a scoring mode needs the flattened postings.
+
+    Args:
+        mode: "numpy" or "python"
+
+    Returns:
+        True for the NumPy scoring path, False for the Python loop
+    """
+    if mode == "numpy":
+        return True
+    if mode == "python":
+        return False
+    raise ValueError(f"Unknown scoring mode: {mode}")
@@ -0,0 +1,36 @@
+"""Approximate LLM token counts for prompt budgeting."""
+import re
+
+
+# Subword pieces: runs of up to four word characters, or one punctuation
+# mark. Byte-pair tokenizers average about four characters of English per
+# token, so this slightly overcounts and budgets hold for real tokenizers.
+TOKEN_PIECE_PATTERN = re.compile(r"\w{1,4}|[^\w\s]")
+
+
+def count_tokens(text: str) -> int:
+    """Estimate the number of LLM tokens in a text."""
+    return len(TOKEN_PIECE_PATTERN.findall(text))
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """
+    Cut a text after its first max_tokens tokens.
+
+    Args:
+        text: Text to cut
+        max_tokens: Number of tokens to keep
+
+    Returns:
+        Longest prefix of the text with at most max_tokens tokens
+    """
+    if max_tokens <= 0:
+        return ""
+    end = 0
+    for position, match in enumerate(TOKEN_PIECE_PATTERN.finditer(text)):
+        if position == max_tokens:
+            break
+        end = match.end()
+    else:
+        return text
+    return text[:end]
@@ -0,0 +1,279 @@
+"""Local dense-vector index with exact and approximate (IVF) search."""
+from typing import List, Optional, Sequence, Tuple
+import zlib
+import numpy as np
+from services.inverted_index import tokenize
+
+
+# Filters allowing at most this share of the rows gather them before scoring;
+# wider filters score every row and mask out the rest
+ROW_GATHER_SHARE = 0.1
+
+# ============================================================================
+# Embeddings
+# ============================================================================
+
+class HashingEmbedder:
+    """Deterministic offline embedder using hashed word and character n-grams."""
+
+    def __init__(self, dim: int = 512, char_ngram: int = 3):
+        """
+        Initialize the embedder.
+
+        Args:
+            dim: Embedding dimension
+            char_ngram: Length of the character n-grams hashed per word
+        """
+        self.dim = dim
+        self.char_ngram = char_ngram
+
+    def _features(self, text: str) -> List[str]:
+        """Extract word unigrams, word bigrams and character n-grams."""
+        words = tokenize(text)
+        features = list(words)
+        features.extend(f"{a} {b}" for a, b in zip(words, words[1:]))
+
+        n = self.char_ngram
+        for word in words:
+            padded = f"#{word}#"
+            features.extend(padded[i:i + n] for i in range(len(padded) - n + 1))
+
+        return features
+
+    def embed(self, text: str) -> np.ndarray:
+        """
+        Embed a single text.
+
+        Args:
+            text: Input text
+
+        Returns:
+            L2-normalized float32 vector of shape (dim,)
+        """
+        vector = np.zeros(self.dim, dtype=np.float32)
+
+        for feature in self._features(text):
+            # crc32 is stable across processes, unlike the builtin hash()
+            hashed = zlib.crc32(feature.encode("utf-8"))
+            sign = 1.0 if hashed & 0x80000000 else -1.0
+            vector[hashed % self.dim] += sign
+
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector /= norm
+        return vector
+
+    def embed_batch(self, texts: Sequence[str]) -> np.ndarray:
+        """Embed texts into a contiguous float32 matrix of shape (n, dim)."""
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            matrix[row] = self.embed(text)
+        return matrix
+
+
+# ============================================================================
+# Indexes
+# ============================================================================
+
+def _top_k_rows(scores: np.ndarray, top_k: int) -> np.ndarray:
+    """Get positions of the top_k scores in descending order."""
+    if top_k <= 0 or scores.size == 0:
+        return np.empty(0, dtype=np.int64)
+    if top_k < scores.size:
+        # argpartition is O(n); only the k survivors get sorted
+        positions = np.argpartition(-scores, top_k - 1)[:top_k]
+    else:
+        positions = np.arange(scores.size)
+    return positions[np.argsort(-scores[positions], kind="stable")]
+
+
+class ExactVectorIndex:
+    """Brute-force cosine similarity over a contiguous float32 matrix."""
+
+    def __init__(self, dim: int):
+        """Initialize an empty index of the given dimension."""
+        self.dim = dim
+        self.vectors = np.zeros((0, dim), dtype=np.float32)
+
+    def __len__(self) -> int:
+        """Number of indexed vectors."""
+        return self.vectors.shape[0]
+
+    def build(self, vectors: np.ndarray) -> None:
+        """
+        Index a matrix of L2-normalized vectors; row i is document id i.
+
+        Args:
+            vectors: Matrix of shape (n, dim)
+        """
+        self.vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+
+    def search(
+        self,
+        query: np.ndarray,
+        top_k: int,
+        allowed_mask: Optional[np.ndarray] = None
+    ) -> List[Tuple[int, float]]:
+        """
+        Find the nearest documents to a query vector.
+
+        Args:
+            query: L2-normalized query vector of shape (dim,)
+            top_k: Number of neighbours to return
+            allowed_mask: Optional boolean mask of the rows to restrict search to
+
+        Returns:
+            List of (doc_id, cosine similarity) in descending order
+        """
+        return self.search_batch(query[np.newaxis, :], top_k, allowed_mask)[0]
+
+    def search_batch(
+        self,
+        queries: np.ndarray,
+        top_k: int,
+        allowed_mask: Optional[np.ndarray] = None
+    ) -> List[List[Tuple[int, float]]]:
+        """
+        Find nearest documents for several queries with one matrix multiply.
+
+        Args:
+            queries: Matrix of L2-normalized query vectors, shape (q, dim)
+            top_k: Number of neighbours per query
+            allowed_mask: Optional boolean mask of the rows to restrict search to
+
+        Returns:
+            Per-query lists of (doc_id, cosine similarity)
+        """
+        row_ids = None
+        if allowed_mask is None:
+            # (q, dim) @ (dim, n) -> (q, n)
+            all_scores = queries @ self.vectors.T
+        else:
+            allowed_count = int(np.count_nonzero(allowed_mask))
+            top_k = min(top_k, allowed_count)
+            if allowed_count <= ROW_GATHER_SHARE * len(self):
+                # Copying a few rows is cheaper than scoring every row
+                row_ids = np.flatnonzero(allowed_mask)
+                all_scores = queries @ self.vectors[row_ids].T
+            else:
+                all_scores = queries @ self.vectors.T
+                all_scores[:, ~allowed_mask] = -np.inf
+
+        results = []
+        for scores in all_scores:
+            positions = _top_k_rows(scores, top_k)
+            doc_ids = positions if row_ids is None else row_ids[positions]
+            results.append([
+                (int(doc_id), float(scores[pos]))
+                for doc_id, pos in zip(doc_ids, positions)
+            ])
+        return results
+
+
+class IVFVectorIndex(ExactVectorIndex):
+    """Approximate search probing the closest k-means clusters (IVF-Flat)."""
+
+    def __init__(self, dim: int, nlist: int = 64, nprobe: int = 8, seed: int = 0):
+        """
+        Initialize an empty index.
+
+        Args:
+            dim: Vector dimension
+            nlist: Number of k-means clusters
+            nprobe: Number of clusters scanned per query
+            seed: Seed for centroid initialization
+        """
+        super().__init__(dim)
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.seed = seed
+        self.centroids = np.zeros((0, dim), dtype=np.float32)
+        self.lists: List[np.ndarray] = []
+
+    def build(self, vectors: np.ndarray, iterations: int = 10) -> None:
+        """
+        Index vectors and cluster them with spherical k-means.
+
+        Args:
+            vectors: Matrix of shape (n, dim)
+            iterations: Number of k-means iterations
+        """
+        super().build(vectors)
+        count = len(self)
+        nlist = max(1, min(self.nlist, count))
+
+        rng = np.random.default_rng(self.seed)
+        # Train centroids on a bounded sample so build time stays flat
+        train_size = min(count, nlist * 256)
+        sample = self.vectors[rng.choice(count, size=train_size, replace=False)] if count else self.vectors
+        centroids = sample[:nlist].copy()
+
+        for _ in range(iterations if count else 0):
+            sample_assignments = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, sample_assignments, sample)
+            norms = np.linalg.norm(sums, axis=1)
+            # Empty clusters keep their previous centroid
+            non_empty = norms > 0
+            centroids[non_empty] = sums[non_empty] / norms[non_empty, np.newaxis]
+
+        assignments = np.argmax(self.vectors @ centroids.T, axis=1) if count else np.zeros(0, dtype=np.int64)
+
+        self.centroids = np.ascontiguousarray(centroids, dtype=np.float32)
+        self.lists = [
+            np.flatnonzero(assignments == cluster)
+            for cluster in range(len(self.centroids))
+        ]
+
+    def search_batch(
+        self,
+        queries: np.ndarray,
+        top_k: int,
+        allowed_mask: Optional[np.ndarray] = None
+    ) -> List[List[Tuple[int, float]]]:
+        """Approximate nearest neighbours, scanning only nprobe clusters per query."""
+        if len(self.centroids) == 0:
+            return [[] for _ in range(len(queries))]
+
+        nprobe = min(self.nprobe, len(self.centroids))
+        probes = np.argsort(-(queries @ self.centroids.T), axis=1)[:, :nprobe]
+
+        results = []
+        for query, clusters in zip(queries, probes):
+            row_ids = np.concatenate([self.lists[cluster] for cluster in clusters])
+            if allowed_mask is not None:
+                row_ids = row_ids[allowed_mask[row_ids]]
+            scores = self.vectors[row_ids] @ query
+            positions = _top_k_rows(scores, top_k)
+            results.append([
+                (int(row_ids[pos]), float(scores[pos]))
+                for pos in positions
+            ])
+        return results
+
+
+def create_vector_index(
+    mode: str,
+    dim: int,
+    nlist: int = 64,
+    nprobe: int = 8
+) -> Optional[ExactVectorIndex]:
+    """
+    Create a vector index for the configured mode.
+
+    Args:
+        mode: "exact", "ivf" or "off"
+        dim: Vector dimension
+        nlist: Number of IVF clusters
+        nprobe: Number of IVF clusters scanned per query
+
+    Returns:
+        Vector index, or None when vector search is disabled
+    """
+    if mode == "off":
+        return None
+    if mode == "exact":
+        return ExactVectorIndex(dim)
+    if mode == "ivf":
+        return IVFVectorIndex(dim, nlist=nlist, nprobe=nprobe)
+    raise ValueError(f"Unknown vector index mode: {mode}")